@@ -1,4 +1,5 @@
 from .account import Account
+from .async_account import AsyncAccount
 from .updater.runner import Runner
 from .updater import events
 from .common import exceptions, utils, enums
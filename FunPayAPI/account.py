@@ -12,6 +12,7 @@ from requests_toolbelt import MultipartEncoder
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 import requests
+import threading
 import logging
 import random
 import string
@@ -23,9 +24,13 @@ from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from . import types
 from .common import exceptions, utils, enums
+from .common import parser as html_parser
+from .common.rate_limiter import RateLimiter
+from .common.scheduler import RequestScheduler
 
 logger = logging.getLogger("FunPayAPI.account")
 PRIVATE_CHAT_ID_RE = re.compile(r"users-\d+-\d+$")
+FLOOD_PAUSE = 3  # Пауза (сек) для отправки сообщений после ошибки флуда.
 
 
 class Account:
@@ -46,11 +51,18 @@ class Account:
 
     :param locale: текущий язык аккаунта, опционально.
     :type locale: :obj:`Literal["ru", "en", "uk"]` or :obj:`None`
+
+    :param pool_size: максимальное кол-во keep-alive соединений с FunPay, которые могут использоваться одновременно.
+    :type pool_size: :obj:`int`, опционально
+
+    :param rate_limiter: общий ограничитель частоты запросов. Если не передан, создается с лимитами по умолчанию.
+    :type rate_limiter: :class:`FunPayAPI.common.rate_limiter.RateLimiter` or :obj:`None`, опционально
     """
 
     def __init__(self, golden_key: str, user_agent: str | None = None,
                  requests_timeout: int | float = 10, proxy: Optional[dict] = None,
-                 locale: Literal["ru", "en", "uk"] | None = None):
+                 locale: Literal["ru", "en", "uk"] | None = None, pool_size: int = 10,
+                 rate_limiter: RateLimiter | None = None):
         self.golden_key: str = golden_key
         """Токен (golden_key) аккаунта."""
         self.user_agent: str | None = user_agent
@@ -59,6 +71,12 @@ class Account:
         """Тайм-аут ожидания ответа на запросы."""
         self.proxy = proxy
         """Прокси"""
+        self.pool_size: int = max(1, pool_size)
+        """Размер пула keep-alive соединений."""
+        self.rate_limiter: RateLimiter = rate_limiter or RateLimiter()
+        """Общий ограничитель частоты запросов к FunPay."""
+        self.scheduler: RequestScheduler = RequestScheduler(self.pool_size, self.rate_limiter)
+        """Планировщик запросов: очереди по приоритету, отмена, метрики."""
         self.html: str | None = None
         """HTML основной страницы FunPay."""
         self.app_data: dict | None = None
@@ -95,6 +113,8 @@ class Account:
         """Язык по для получения названий разделов."""
         self.__set_locale: Literal["ru", "en", "uk"] | None = None
         """Язык, на который будет переведем аккаунт при следующем GET-запросе."""
+        self.__locale_lock = threading.Lock()
+        """Блокировка чтения / изменения языка аккаунта (запросы могут выполняться из разных потоков)."""
         self.currency: FunPayAPI.types.Currency = FunPayAPI.types.Currency.UNKNOWN
         """Валюта аккаунта"""
         self.total_balance: int | None = None
@@ -137,14 +157,19 @@ class Account:
             status_forcelist=[500, 502, 503, 504],
             allowed_methods={"GET", "POST"}
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # pool_block=True: при исчерпании пула поток ждет свободное соединение, а не открывает новое.
+        adapter = HTTPAdapter(max_retries=retry_strategy, pool_connections=1, pool_maxsize=self.pool_size,
+                              pool_block=True)
         self.session.mount("https://", adapter)
 
     def method(self, request_method: Literal["post", "get"], api_method: str, headers: dict, payload: Any,
                exclude_phpsessid: bool = False, raise_not_200: bool = False,
-               locale: Literal["ru", "en", "uk"] | None = None) -> requests.Response:
+               locale: Literal["ru", "en", "uk"] | None = None,
+               priority: enums.RequestPriorities | None = None) -> requests.Response:
         """
         Отправляет запрос к FunPay. Добавляет в заголовки запроса user_agent и куки.
+        Ожидает свободный слот в очереди :py:obj:`.Account.scheduler` и перед каждым запросом - разрешения
+        от :py:obj:`.Account.rate_limiter`.
 
         :param request_method: метод запроса ("get" / "post").
         :type request_method: :obj:`str` `post` or `get`
@@ -164,6 +189,10 @@ class Account:
         :param raise_not_200: возбуждать ли исключение, если статус код ответа != 200?
         :type raise_not_200: :obj:`bool`
 
+        :param priority: приоритет запроса. Если не указан - используется приоритет текущего потока
+            (см. :meth:`FunPayAPI.common.scheduler.RequestScheduler.lane`) или приоритет по умолчанию.
+        :type priority: :class:`FunPayAPI.common.enums.RequestPriorities` or :obj:`None`, опционально
+
         :return: объект ответа.
         :rtype: :class:`requests.Response`
         """
@@ -181,12 +210,13 @@ class Account:
             return url
 
         def update_locale(redirect_url: str):
-            for locale in ("en", "uk"):
-                if redirect_url.startswith(f"https://funpay.com/{locale}/"):
-                    self.__locale = locale
-                    return
-            if redirect_url.startswith(f"https://funpay.com"):
-                self.__locale = "ru"
+            with self.__locale_lock:
+                for locale in ("en", "uk"):
+                    if redirect_url.startswith(f"https://funpay.com/{locale}/"):
+                        self.__locale = locale
+                        return
+                if redirect_url.startswith(f"https://funpay.com"):
+                    self.__locale = "ru"
 
         headers["cookie"] = f"golden_key={self.golden_key}; cookie_prefs=1"
         headers["cookie"] += f"; PHPSESSID={self.phpsessid}" if self.phpsessid and not exclude_phpsessid else ""
@@ -196,29 +226,36 @@ class Account:
             link = normalize_url(api_method, locale)
         else:
             link = normalize_url(api_method)
-        locale = locale or self.__set_locale
-        if request_method == "get" and locale and locale != self.locale:
-            link += f'{"&" if "?" in link else "?"}setlocale={locale}'
+        with self.__locale_lock:
+            locale = locale or self.__set_locale
+            if request_method == "get" and locale and locale != self.__locale:
+                link += f'{"&" if "?" in link else "?"}setlocale={locale}'
         kwargs = {"method": request_method,
                   "headers": headers,
                   "timeout": self.requests_timeout,
                   "proxies": self.proxy or {}}
+        endpoint = self.rate_limiter.classify(request_method, link, payload)
+        priority = priority or self.rate_limiter.current_priority or self.rate_limiter.default_priority(endpoint)
         i = 0
         response = None
-        while i < 10 or response.status_code == 429:
-            i += 1
-            response = self.session.request(url=link, data=payload, allow_redirects=False, **kwargs)
-            if response.status_code == 429:
-                self.last_429_err_time = time.time()
-                time.sleep(min(2 ** i, 30))
-                continue
-            elif not (300 <= response.status_code < 400) or 'Location' not in response.headers:
-                break
-            link = response.headers['Location']
-            update_locale(link)
+        with self.scheduler.slot(priority):
+            while i < 10 or response.status_code == 429:
+                i += 1
+                self.scheduler.check_cancelled()
+                self.rate_limiter.acquire(endpoint, priority)
+                response = self.session.request(url=link, data=payload, allow_redirects=False, **kwargs)
+                if response.status_code == 429:
+                    self.last_429_err_time = time.time()
+                    self.rate_limiter.penalize(endpoint, min(2 ** i, 30))
+                    continue
+                elif not (300 <= response.status_code < 400) or 'Location' not in response.headers:
+                    break
+                link = response.headers['Location']
+                update_locale(link)
 
-        else:
-            response = self.session.request(url=link, data=payload, allow_redirects=True, **kwargs)
+            else:
+                self.rate_limiter.acquire(endpoint, priority)
+                response = self.session.request(url=link, data=payload, allow_redirects=True, **kwargs)
 
         if response.status_code == 403:
             raise exceptions.UnauthorizedError(response)
@@ -300,7 +337,7 @@ class Account:
         if locale:
             self.locale = self.__default_locale
         html_response = response.content.decode()
-        parser = BeautifulSoup(html_response, "lxml")
+        parser = html_parser.make_soup(html_response)
 
         username = parser.find("div", {"class": "user-link-name"})
         if not username:
@@ -366,7 +403,7 @@ class Account:
 
             lot_obj = types.LotShortcut(offer_id, server, side, description, amount, price, currency, subcategory_obj,
                                         seller,
-                                        auto, promo, attributes, str(offer))
+                                        auto, promo, attributes, html_parser.html_of(offer))
             result.append(lot_obj)
         return result
 
@@ -422,7 +459,7 @@ class Account:
             amount = int(amount) if amount and amount.isdigit() else None
             active = "warning" not in offer.get("class", [])
             lot_obj = types.MyLotShortcut(offer_id, server, side, description, amount, price, currency, subcategory_obj,
-                                          auto, active, str(offer))
+                                          auto, active, html_parser.html_of(offer))
             result.append(lot_obj)
         return result
 
@@ -507,7 +544,7 @@ class Account:
         if locale:
             self.locale = self.__default_locale
         html_response = response.content.decode()
-        parser = BeautifulSoup(html_response, "lxml")
+        parser = html_parser.make_soup(html_response)
         username = parser.find("div", {"class": "user-link-name"})
         if not username:
             raise exceptions.UnauthorizedError(response)
@@ -667,7 +704,8 @@ class Account:
         return self.__parse_messages(json_response["chat"]["messages"], chat_id, interlocutor_id,
                                      interlocutor_username, from_id)
 
-    def get_chats_histories(self, chats_data: dict[int | str, str | None]) -> dict[int, list[types.Message]]:
+    def get_chats_histories(self, chats_data: dict[int | str, str | None],
+                            last_messages: dict[int | str, int] | None = None) -> dict[int, list[types.Message]]:
         """
         Получает историю сообщений сразу нескольких чатов
         (до 50 сообщений на личный чат, до 25 сообщений на публичный чат).
@@ -676,6 +714,10 @@ class Account:
             Например: {48392847: "SLLMK", 58392098: "Amongus", 38948728: None}
         :type chats_data: :obj:`dict` {:obj:`int` or :obj:`str`: :obj:`str` or :obj:`None`}
 
+        :param last_messages: ID последних известных сообщений чатов ({ID чата: ID сообщения}).
+            Если для чата указан ID, FunPay вернет только сообщения, отправленные после него.
+        :type last_messages: :obj:`dict` {:obj:`int` or :obj:`str`: :obj:`int`} or :obj:`None`, опционально
+
         :return: словарь с историями чатов в формате {ID чата: [список сообщений]}
         :rtype: :obj:`dict` {:obj:`int`: :obj:`list` of :class:`FunPayAPI.types.Message`}
         """
@@ -684,8 +726,9 @@ class Account:
             "content-type": "application/x-www-form-urlencoded; charset=UTF-8",
             "x-requested-with": "XMLHttpRequest"
         }
+        last_messages = last_messages or {}
         chats = [{"type": "chat_node", "id": i, "tag": "00000000",
-                  "data": {"node": i, "last_message": -1, "content": ""}} for i in chats_data]
+                  "data": {"node": i, "last_message": last_messages.get(i, -1), "content": ""}} for i in chats_data]
         payload = {
             "objects": json.dumps(chats),
             "request": False,
@@ -844,10 +887,12 @@ class Account:
                               "You cannot send messages too frequently.",
                               "Не можна надсилати повідомлення занадто часто."):
                 self.last_flood_err_time = time.time()
+                self.rate_limiter.penalize(enums.EndpointTypes.CHAT, FLOOD_PAUSE)
             elif error_text in ("Нельзя слишком часто отправлять сообщения разным пользователям.",
                                 "Не можна надто часто надсилати повідомлення різним користувачам.",
                                 "You cannot message multiple users too frequently."):
                 self.last_multiuser_flood_err_time = time.time()
+                self.rate_limiter.penalize(enums.EndpointTypes.CHAT, FLOOD_PAUSE)
             raise exceptions.MessageNotDeliveredError(response, error_text, chat_id)
         if leave_as_unread:
             message_text = text
@@ -865,7 +910,7 @@ class Account:
                                         None)
         else:
             mes = json_response["objects"][0]["data"]["messages"][-1]
-            parser = BeautifulSoup(mes["html"].replace("<br>", "\n"), "lxml")
+            parser = html_parser.make_soup(mes["html"].replace("<br>", "\n"))
             image_name = None
             image_link = None
             message_text = None
@@ -1527,7 +1572,7 @@ class Account:
             self.locale = self.__default_locale
         html_response = response.content.decode()
 
-        parser = BeautifulSoup(html_response, "lxml")
+        parser = html_parser.make_soup(html_response)
 
         if not start_from:
             username = parser.find("div", {"class": "user-link-name"})
@@ -1588,6 +1633,8 @@ class Account:
             buyer_div = div.find("div", {"class": "media-user-name"}).find("span")
             buyer_username = buyer_div.text
             buyer_id = int(buyer_div.get("data-href")[:-1].split("/users/")[1])
+            id1, id2 = sorted([buyer_id, self.id])
+            chat_id = f"users-{id1}-{id2}"
             subcategory_name = div.find("div", {"class": "text-muted"}).text
             subcategory = None
             if subcategories:
@@ -1614,10 +1661,8 @@ class Account:
                 day, month, year = int(day), utils.MONTHS[month], int(year)
                 h, m = split[1].split(":")
                 order_date = datetime(year, month, day, int(h), int(m))
-            id1, id2 = sorted([buyer_id, self.id])
-            chat_id = f"users-{id1}-{id2}"
             order_obj = types.OrderShortcut(order_id, description, price, currency, buyer_username, buyer_id, chat_id,
-                                            order_status, order_date, subcategory_name, subcategory, str(div))
+                                            order_status, order_date, subcategory_name, subcategory, html_parser.html_of(div))
             sales.append(order_obj)
 
         return next_order_id, sales, locale, subcategories
@@ -1678,7 +1723,7 @@ class Account:
         if not msgs:
             return []
 
-        parser = BeautifulSoup(msgs, "lxml")
+        parser = html_parser.make_soup(msgs)
         chats = parser.find_all("a", {"class": "contact-item"})
         chats_objs = []
 
@@ -1698,7 +1743,8 @@ class Account:
             elif last_msg_text.startswith(self.old_bot_character):
                 last_msg_text = last_msg_text[1:]
                 by_vertex = True
-            chat_obj = types.ChatShortcut(chat_id, chat_with, last_msg_text, node_msg_id, user_msg_id, unread, str(msg))
+            chat_obj = types.ChatShortcut(chat_id, chat_with, last_msg_text, node_msg_id, user_msg_id, unread,
+                                          html_parser.html_of(msg))
             if not is_image:
                 chat_obj.last_by_bot = by_bot
                 chat_obj.last_by_vertex = by_vertex
@@ -2135,15 +2181,18 @@ class Account:
         if None not in (interlocutor_id, interlocutor_username):
             ids[interlocutor_id] = interlocutor_username
 
-        for i in json_messages:
-            if i["id"] < from_id:
-                continue
+        json_messages = [i for i in json_messages if i["id"] >= from_id]
+        # Все сообщения ответа парсятся за один вызов (бэкендом lxml - одним документом).
+        parsers = html_parser.make_soups([i["html"].replace("<br>", "\n") for i in json_messages])
+        author_divs = []
+
+        for i, parser in zip(json_messages, parsers):
             author_id = i["author"]
-            parser = BeautifulSoup(i["html"].replace("<br>", "\n"), "lxml")
+            author_div = parser.find("div", {"class": "media-user-name"})
+            author_divs.append(author_div)
 
             # Если ник или бейдж написавшего неизвестен, но есть блок с данными об авторе сообщения
-            if None in [ids.get(author_id), badges.get(author_id)] and (
-                    author_div := parser.find("div", {"class": "media-user-name"})):
+            if None in [ids.get(author_id), badges.get(author_id)] and author_div:
                 if badges.get(author_id) is None:
                     badge = author_div.find("span", {"class": "chat-msg-author-label label label-success"})
                     badges[author_id] = badge.text if badge else 0
@@ -2186,19 +2235,19 @@ class Account:
                 #     by_vertex = True
 
             message_obj = types.Message(i["id"], message_text, chat_id, interlocutor_username, interlocutor_id,
-                                        None, author_id, i["html"], image_link, image_name, determine_msg_type=False)
+                                        None, author_id, html_parser.html_of(i["html"]), image_link, image_name,
+                                        determine_msg_type=False)
             message_obj.by_bot = by_bot
             message_obj.by_vertex = by_vertex
             message_obj.type = types.MessageTypes.NON_SYSTEM if author_id != 0 else message_obj.get_message_type()
 
             messages.append(message_obj)
 
-        for i in messages:
+        for i, parser, default_label in zip(messages, parsers, author_divs):
             i.author = ids.get(i.author_id)
             i.chat_name = interlocutor_username
             i.interlocutor_id = interlocutor_id
             i.badge = badges.get(i.author_id) if badges.get(i.author_id) != 0 else None
-            parser = BeautifulSoup(i.html, "lxml")
             if i.badge:
                 i.is_employee = True
                 if i.badge in ("поддержка", "підтримка", "support"):
@@ -2207,7 +2256,6 @@ class Account:
                     i.is_moderation = True
                 elif i.badge in ("арбитраж", "арбітраж", "arbitration"):
                     i.is_arbitration = True
-            default_label = parser.find("div", {"class": "media-user-name"})
             default_label = default_label.find("span", {
                 "class": "chat-msg-author-label label label-default"}) if default_label else None
             if default_label:
@@ -2299,5 +2347,6 @@ class Account:
 
     @locale.setter
     def locale(self, new_locale: Literal["ru", "en", "uk"]):
-        if self.__locale != new_locale and new_locale in ("ru", "en", "uk"):
-            self.__set_locale = new_locale
+        with self.__locale_lock:
+            if self.__locale != new_locale and new_locale in ("ru", "en", "uk"):
+                self.__set_locale = new_locale
@@ -0,0 +1,170 @@
+"""
+В данном модуле описан асинхронный интерфейс к :class:`FunPayAPI.account.Account`.
+"""
+from __future__ import annotations
+from typing import TYPE_CHECKING, Literal, Any, Callable
+
+if TYPE_CHECKING:
+    from .account import Account
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import functools
+import threading
+import inspect
+import asyncio
+import logging
+
+import requests
+
+from .common.enums import RequestPriorities
+
+logger = logging.getLogger("FunPayAPI.async_account")
+
+
+class _LocaleGuard:
+    """
+    Блокировка чтения / записи для языка аккаунта: обычные запросы выполняются параллельно друг с другом,
+    а методы, которые могут временно переключить язык аккаунта (принимают параметр `locale`), - монопольно,
+    чтобы параллельный запрос не получил страницу на чужом языке.
+    """
+
+    def __init__(self):
+        self.__cond = threading.Condition()
+        self.__shared = 0
+        self.__exclusive = False
+        self.__exclusive_waiting = 0
+
+    @contextmanager
+    def shared(self):
+        with self.__cond:
+            # ожидающие монопольные вызовы пропускаются вперед, чтобы они не ждали бесконечно
+            self.__cond.wait_for(lambda: not self.__exclusive and not self.__exclusive_waiting)
+            self.__shared += 1
+        try:
+            yield
+        finally:
+            with self.__cond:
+                self.__shared -= 1
+                self.__cond.notify_all()
+
+    @contextmanager
+    def exclusive(self):
+        with self.__cond:
+            self.__exclusive_waiting += 1
+            try:
+                self.__cond.wait_for(lambda: not self.__exclusive and not self.__shared)
+            finally:
+                self.__exclusive_waiting -= 1
+            self.__exclusive = True
+        try:
+            yield
+        finally:
+            with self.__cond:
+                self.__exclusive = False
+                self.__cond.notify_all()
+
+
+class AsyncAccount:
+    """
+    Асинхронная обертка над :class:`FunPayAPI.account.Account`.
+
+    Все запросы выполняются через тот же :meth:`FunPayAPI.account.Account.method` (редиректы, язык аккаунта,
+    обработка 429 ошибки), но в ограниченном пуле потоков, размер которого совпадает с размером пула
+    keep-alive соединений аккаунта. Благодаря этому из asyncio-кода можно держать одновременно
+    до :py:obj:`.Account.pool_size` запросов к FunPay, не создавая поток на каждый запрос.
+
+    Любой публичный метод аккаунта доступен как корутина:
+    ``await async_account.get_order("ABCDEFGH")``.
+
+    Язык аккаунта FunPay хранит на своей стороне, поэтому методы, которые могут его временно переключить
+    (принимают параметр `locale`, в т.ч. :meth:`FunPayAPI.async_account.AsyncAccount.method`), выполняются
+    монопольно: остальные вызовы этого объекта ждут их завершения.
+
+    :param account: экземпляр аккаунта.
+    :type account: :class:`FunPayAPI.account.Account`
+
+    :param max_workers: максимальное кол-во одновременных запросов. По умолчанию - :py:obj:`.Account.pool_size`.
+    :type max_workers: :obj:`int` or :obj:`None`, опционально
+    """
+
+    def __init__(self, account: Account, max_workers: int | None = None):
+        self.account: Account = account
+        """Экземпляр аккаунта."""
+        self.max_workers: int = max(1, max_workers or account.pool_size)
+        """Максимальное кол-во одновременных запросов."""
+        self.executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                               thread_name_prefix="FunPayAPI-async")
+        """Пул потоков, в котором выполняются запросы."""
+        self.__locale_guard = _LocaleGuard()
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Выполняет блокирующую функцию в пуле запросов и ожидает ее результат.
+
+        :param func: функция.
+        :type func: :obj:`Callable`
+
+        :return: результат выполнения функции.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    async def method(self, request_method: Literal["post", "get"], api_method: str, headers: dict, payload: Any,
+                     exclude_phpsessid: bool = False, raise_not_200: bool = False,
+                     locale: Literal["ru", "en", "uk"] | None = None,
+                     priority: RequestPriorities | None = None) -> requests.Response:
+        """
+        Асинхронная версия :meth:`FunPayAPI.account.Account.method`.
+
+        :return: объект ответа.
+        :rtype: :class:`requests.Response`
+        """
+        return await self.run(self.__guarded(self.account.method, True), request_method, api_method, headers,
+                              payload, exclude_phpsessid, raise_not_200, locale, priority)
+
+    def __guarded(self, func: Callable, exclusive: bool) -> Callable:
+        """
+        Оборачивает метод аккаунта в блокировку языка аккаунта.
+
+        :param func: метод аккаунта.
+        :param exclusive: выполнять ли метод монопольно.
+        """
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.__locale_guard.exclusive() if exclusive else self.__locale_guard.shared():
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    def __getattr__(self, item: str):
+        attr = getattr(self.account, item)
+        if item.startswith("_") or not callable(attr):
+            return attr
+
+        try:
+            exclusive = "locale" in inspect.signature(attr).parameters
+        except (TypeError, ValueError):
+            exclusive = True
+        guarded = self.__guarded(attr, exclusive)
+
+        @functools.wraps(attr)
+        async def wrapper(*args, **kwargs):
+            return await self.run(guarded, *args, **kwargs)
+
+        return wrapper
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Останавливает пул запросов.
+
+        :param wait: дождаться ли завершения уже отправленных запросов.
+        :type wait: :obj:`bool`, опционально
+        """
+        self.executor.shutdown(wait=wait)
+
+    async def __aenter__(self) -> AsyncAccount:
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
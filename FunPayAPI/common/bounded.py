@@ -0,0 +1,137 @@
+"""
+В данном модуле описан ограниченный по размеру (и, опционально, по времени жизни записей) словарь для состояния
+Runner'а.
+"""
+from __future__ import annotations
+from typing import Any, Hashable, Iterator, MutableMapping
+
+from collections import OrderedDict
+import threading
+import time
+
+
+class BoundedDict(MutableMapping):
+    """
+    Потокобезопасный словарь с вытеснением давно не использовавшихся записей (LRU).
+
+    Чтение (`d[key]`, :meth:`get`, `in` не считается) и запись перемещают запись в конец очереди вытеснения.
+    Если записей больше `maxsize`, вытесняются самые старые; если задан `ttl`, записи, к которым не обращались
+    дольше `ttl` секунд, удаляются при следующей записи.
+
+    Итерация, :meth:`keys`, :meth:`values`, :meth:`items` возвращают снимок содержимого и не влияют на порядок
+    вытеснения.
+
+    :param maxsize: максимальное кол-во записей.
+    :type maxsize: :obj:`int`
+
+    :param ttl: время жизни записи без обращений (сек). `None` - без ограничения.
+    :type ttl: :obj:`float` or :obj:`None`, опционально
+    """
+
+    def __init__(self, maxsize: int, ttl: float | None = None):
+        self.maxsize: int = max(1, maxsize)
+        """Максимальное кол-во записей."""
+        self.ttl: float | None = ttl
+        """Время жизни записи без обращений (сек)."""
+        self.evicted: int = 0
+        """Кол-во записей, вытесненных из-за ограничения размера."""
+        self.expired: int = 0
+        """Кол-во записей, удаленных по истечении времени жизни."""
+        self.__data: OrderedDict[Hashable, list[Any, float]] = OrderedDict()
+        self.__lock = threading.RLock()
+
+    def __getitem__(self, key: Hashable) -> Any:
+        with self.__lock:
+            item = self.__data[key]
+            self.__data.move_to_end(key)
+            item[1] = time.monotonic()
+            return item[0]
+
+    def __setitem__(self, key: Hashable, value: Any):
+        with self.__lock:
+            now = time.monotonic()
+            if key in self.__data:
+                self.__data.move_to_end(key)
+            self.__data[key] = [value, now]
+            self.__evict(now)
+
+    def __delitem__(self, key: Hashable):
+        with self.__lock:
+            del self.__data[key]
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.__data
+
+    def __len__(self) -> int:
+        return len(self.__data)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self.keys())
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.copy()!r})"
+
+    def __evict(self, now: float):
+        while len(self.__data) > self.maxsize:
+            self.__data.popitem(last=False)
+            self.evicted += 1
+        if self.ttl is None:
+            return
+        while self.__data:
+            key, (_, touched) = next(iter(self.__data.items()))
+            if now - touched <= self.ttl:
+                break
+            del self.__data[key]
+            self.expired += 1
+
+    def setdefault(self, key: Hashable, default: Any = None) -> Any:
+        with self.__lock:
+            if key in self.__data:
+                return self[key]
+            self[key] = default
+            return default
+
+    def keys(self) -> list[Hashable]:
+        with self.__lock:
+            return list(self.__data.keys())
+
+    def values(self) -> list[Any]:
+        with self.__lock:
+            return [i[0] for i in self.__data.values()]
+
+    def items(self) -> list[tuple[Hashable, Any]]:
+        with self.__lock:
+            return [(k, v[0]) for k, v in self.__data.items()]
+
+    def clear(self):
+        with self.__lock:
+            self.__data.clear()
+
+    def copy(self) -> dict:
+        """
+        Возвращает содержимое в виде обычного словаря (от старых записей к новым).
+        """
+        with self.__lock:
+            return {k: v[0] for k, v in self.__data.items()}
+
+    def replace_with(self, data: dict):
+        """
+        Заменяет содержимое переданным словарем (например, при восстановлении состояния): в отличие от
+        :meth:`dict.update`, ключи, которых нет в `data`, удаляются.
+
+        :param data: новое содержимое.
+        :type data: :obj:`dict`
+        """
+        with self.__lock:
+            self.__data.clear()
+            for k, v in data.items():
+                self[k] = v
+
+    def stats(self) -> dict[str, int]:
+        """
+        Возвращает метрики словаря.
+
+        :return: {"size": ..., "maxsize": ..., "evicted": ..., "expired": ...}
+        :rtype: :obj:`dict`
+        """
+        return {"size": len(self.__data), "maxsize": self.maxsize, "evicted": self.evicted, "expired": self.expired}
@@ -160,3 +160,31 @@ class Wallet(Enum):
     """WebMoney WMZ."""
     YOUMONEY = 7
     """ЮMoney."""
+
+
+class RequestPriorities(Enum):
+    """
+    В данном классе перечислены приоритеты запросов к FunPay (чем меньше значение, тем выше приоритет).
+    """
+    REALTIME = 0
+    """Запросы Runner'а, отправка сообщений, выдача товаров."""
+    INTERACTIVE = 1
+    """Запросы, инициированные пользователем (например, из Telegram-ПУ)."""
+    BULK = 2
+    """Фоновые массовые запросы (история заказов, статистика, синхронизация)."""
+
+
+class EndpointTypes(Enum):
+    """
+    В данном классе перечислены группы эндпоинтов FunPay, для каждой из которых действует свой лимит запросов.
+    """
+    RUNNER = 0
+    """runner/ (получение обновлений)."""
+    CHAT = 1
+    """Отправка сообщений и изображений, история чатов."""
+    ORDERS = 2
+    """Страницы заказов, отзывы, возвраты."""
+    LOTS = 3
+    """Страницы и сохранение лотов, поднятие лотов."""
+    OTHER = 4
+    """Все остальные запросы."""
@@ -18,6 +18,22 @@ class AccountNotInitiatedError(Exception):
         return "Необходимо получить данные об аккаунте с помощью метода Account.get()"
 
 
+class RequestCancelledError(Exception):
+    """
+    Исключение, которое возбуждается, если запрос был отменен через
+    :meth:`FunPayAPI.common.scheduler.RequestScheduler.cancel` до или во время ожидания очереди.
+    """
+
+    def __init__(self, priority):
+        """
+        :param priority: приоритет (очередь) отмененного запроса.
+        """
+        self.priority = priority
+
+    def __str__(self):
+        return f"Запрос из очереди {self.priority.name} был отменен."
+
+
 class RequestFailedError(Exception):
     """
     Исключение, которое возбуждается, если статус код ответа != 200.
@@ -0,0 +1,332 @@
+"""
+В данном модуле описан подключаемый HTML-парсер для FunPayAPI.
+
+Быстрый бэкенд (`lxml`) строит дерево lxml и ищет элементы прекомпилированными XPath-выражениями, при этом
+предоставляет то же подмножество интерфейса BeautifulSoup, которое используется в FunPayAPI
+(:meth:`find`, :meth:`find_all`, :attr:`text`, :meth:`get_text`, :meth:`get`, `[]`, :attr:`attrs`, `str()`), поэтому
+код парсинга одинаков для обоих бэкендов. Неподдерживаемые аргументы BeautifulSoup (`string`, `text`) вызывают
+:class:`TypeError`, а не воспринимаются как фильтры по атрибутам.
+
+Бэкенд по умолчанию (`bs4`) - обычный :class:`bs4.BeautifulSoup` с парсером `lxml`, как и раньше. `lxml` включается
+явно (htmlParser в [Other]): результаты бэкендов могут отличаться только в `str()` (порядок атрибутов, экранирование)
+и значениями логических атрибутов HTML без значения (`<option selected>`: `lxml` - "selected", `bs4` - ""); FunPayAPI
+проверяет только наличие таких атрибутов. Совпадение результатов на сохраненных страницах FunPay проверяет
+benchmarks/parser_parity.py.
+"""
+from __future__ import annotations
+from typing import Any, Callable, Literal
+
+from contextlib import contextmanager
+import itertools
+import threading
+import re
+
+from bs4 import BeautifulSoup
+from lxml import etree
+import lxml.html
+
+BACKENDS = ("lxml", "bs4")
+_backend: Literal["lxml", "bs4"] = "bs4"
+_keep_html: bool = True
+_html_local = threading.local()
+_xpath_cache: dict[tuple, Any] = {}
+_MULTI_VALUED_ATTRS = ("class", "rel")
+_BATCH_CLASS = "fpapi-batch-item"
+# Текст как в BeautifulSoup.get_text(): без комментариев, а строки внутри script / style / template / rt / rp
+# (ближайшего из них) - только у самого этого элемента
+_STRING_CONTAINERS = ("script", "style", "template", "rt", "rp")
+_CONTAINER_CONDITION = " or ".join(f"self::{i}" for i in _STRING_CONTAINERS)
+_TEXT_XPATH = etree.XPath(f"descendant::text()[not(ancestor::*[{_CONTAINER_CONDITION}])]")
+_CONTAINER_TEXT_XPATHS = {i: etree.XPath(f"descendant::text()[ancestor::*[{_CONTAINER_CONDITION}][1][self::{i}]]")
+                          for i in _STRING_CONTAINERS}
+_UNSUPPORTED_KWARGS = ("string", "text")
+# BeautifulSoup заменяет строки только из пробельных символов ASCII на "\n" / " " (кроме содержимого pre / textarea)
+_ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+_PRESERVE_WHITESPACE_TAGS = ("pre", "textarea")
+
+
+def set_backend(backend: Literal["lxml", "bs4"]):
+    """
+    Устанавливает бэкенд HTML-парсера.
+
+    :param backend: `bs4` (BeautifulSoup, по умолчанию) или `lxml` (быстрый).
+    :type backend: :obj:`str`
+    """
+    global _backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Неизвестный бэкенд парсера: {backend}")
+    _backend = backend
+
+
+def get_backend() -> Literal["lxml", "bs4"]:
+    """
+    Возвращает текущий бэкенд HTML-парсера.
+    """
+    return _backend
+
+
+def set_keep_html(keep: bool):
+    """
+    Устанавливает, сохранять ли HTML-код в объектах FunPayAPI.types (атрибут `html`).
+
+    Если `False`, элементы не сериализуются при парсинге, а `html` объектов равен `None`. Это экономит время
+    парсинга и память, занимаемую сохраненными чатами, заказами и лотами.
+
+    :param keep: сохранять ли HTML-код.
+    :type keep: :obj:`bool`
+    """
+    global _keep_html
+    _keep_html = keep
+
+
+def get_keep_html() -> bool:
+    """
+    Возвращает, сохраняется ли HTML-код в объектах FunPayAPI.types в текущем потоке.
+    """
+    keep = getattr(_html_local, "keep", None)
+    return _keep_html if keep is None else keep
+
+
+@contextmanager
+def keep_html(keep: bool = True):
+    """
+    Устанавливает, сохранять ли HTML-код, для текущего потока внутри блока `with`
+    (например, если дальнейший код парсит `html` полученных объектов).
+
+    :param keep: сохранять ли HTML-код.
+    :type keep: :obj:`bool`, опционально
+    """
+    previous = getattr(_html_local, "keep", None)
+    _html_local.keep = keep
+    try:
+        yield
+    finally:
+        _html_local.keep = previous
+
+
+def html_of(node: BeautifulSoup | Node | str | None) -> str | None:
+    """
+    Возвращает значение атрибута `html` для объекта FunPayAPI.types с учетом
+    :func:`FunPayAPI.common.parser.set_keep_html`.
+
+    :param node: элемент дерева или готовый HTML-код.
+
+    :return: HTML-код или `None`.
+    :rtype: :obj:`str` or :obj:`None`
+    """
+    if node is None or not get_keep_html():
+        return None
+    return node if isinstance(node, str) else str(node)
+
+
+def make_soup(html: str, backend: Literal["lxml", "bs4"] | None = None) -> BeautifulSoup | Node:
+    """
+    Парсит HTML текущим (или переданным) бэкендом.
+
+    :param html: HTML-код.
+    :type html: :obj:`str`
+
+    :param backend: бэкенд. Если не передан - используется установленный через
+        :func:`FunPayAPI.common.parser.set_backend`.
+    :type backend: :obj:`str` or :obj:`None`, опционально
+
+    :return: корень дерева с интерфейсом BeautifulSoup.
+    :rtype: :class:`bs4.BeautifulSoup` or :class:`FunPayAPI.common.parser.Node`
+    """
+    if (backend or _backend) == "bs4":
+        return BeautifulSoup(html, "lxml")
+    if not html or not html.strip():
+        return Node(lxml.html.document_fromstring("<html></html>"), True)
+    return Node(lxml.html.document_fromstring(html), True)
+
+
+def make_soups(htmls: list[str], backend: Literal["lxml", "bs4"] | None = None) -> list[BeautifulSoup | Node]:
+    """
+    Парсит несколько HTML-фрагментов (например, сообщения из одного ответа chat_node).
+
+    Бэкенд `lxml` разбирает их за один проход: фрагменты оборачиваются в отдельные блоки и разбираются как один
+    документ (если какой-либо фрагмент "сломал" разметку соседних, фрагменты парсятся по одному).
+    Бэкенд `bs4` парсит каждый фрагмент отдельно, как и раньше, чтобы результат не отличался от :func:`make_soup`.
+
+    :param htmls: HTML-фрагменты.
+    :type htmls: :obj:`list` of :obj:`str`
+
+    :param backend: бэкенд. Если не передан - используется установленный.
+    :type backend: :obj:`str` or :obj:`None`, опционально
+
+    :return: корни фрагментов в том же порядке.
+    :rtype: :obj:`list` of :class:`bs4.BeautifulSoup` or :class:`FunPayAPI.common.parser.Node`
+    """
+    if not htmls:
+        return []
+    backend = backend or _backend
+    if backend == "lxml":
+        document = "".join(f'<div class="{_BATCH_CLASS}">{html}</div>' for html in htmls)
+        body = lxml.html.document_fromstring(f"<html><body>{document}</body></html>").find("body")
+        items = _compile("descendant", "div", (("class", _BATCH_CLASS),))(body) if body is not None else []
+        if len(items) == len(htmls) and all(item.getparent() is body for item in items):
+            return [Node(item) for item in items]
+    return [make_soup(html, backend) for html in htmls]
+
+
+def _bs4_string(string) -> str:
+    """
+    Приводит строку из дерева lxml к виду, который она имеет в BeautifulSoup.
+    """
+    if not string or string.strip(_ASCII_SPACES):
+        return string
+    element = string.getparent()
+    if string.is_tail:
+        element = element.getparent()
+    while element is not None:
+        if element.tag in _PRESERVE_WHITESPACE_TAGS:
+            return string
+        element = element.getparent()
+    return "\n" if "\n" in string else " "
+
+
+def _literal(value: str) -> str:
+    """
+    Возвращает строковый литерал XPath (в т.ч. для значений с кавычками, например JSON в data-атрибутах).
+    """
+    if '"' not in value:
+        return f'"{value}"'
+    if "'" not in value:
+        return f"'{value}'"
+    return "concat(" + ", '\"', ".join(f'"{i}"' for i in value.split('"')) + ")"
+
+
+def _class_condition(value: str) -> str:
+    value = " ".join(value.split())
+    if " " in value:
+        return f"normalize-space(@class)={_literal(value)}"
+    return f'contains(concat(" ", normalize-space(@class), " "), {_literal(f" {value} ")})'
+
+
+def _compile(axis: str, name: str | None, attrs: tuple[tuple[str, Any], ...]):
+    key = (axis, name, attrs)
+    if (xpath := _xpath_cache.get(key)) is None:
+        conditions = []
+        for attr, value in attrs:
+            if value is True:
+                conditions.append(f"@{attr}")
+            elif attr == "class":
+                conditions.append(_class_condition(value))
+            else:
+                conditions.append(f"@{attr}={_literal(value)}")
+        expr = f"{axis}::{name or '*'}" + "".join(f"[{c}]" for c in conditions)
+        xpath = _xpath_cache[key] = etree.XPath(expr)
+    return xpath
+
+
+class Node:
+    """
+    Элемент дерева lxml с интерфейсом, совместимым с используемым в FunPayAPI подмножеством BeautifulSoup.
+
+    :param element: элемент lxml.
+    :param root: является ли элемент корнем документа (тогда поиск включает и сам элемент).
+    """
+    __slots__ = ("_el", "_root")
+
+    def __init__(self, element, root: bool = False):
+        self._el = element
+        self._root = root
+
+    @property
+    def name(self) -> str:
+        return self._el.tag
+
+    @property
+    def text(self) -> str:
+        return self.get_text()
+
+    def get_text(self, separator: str = "", strip: bool = False) -> str:
+        strings = _CONTAINER_TEXT_XPATHS.get(self._el.tag, _TEXT_XPATH)(self._el)
+        if strip:
+            strings = [i.strip() for i in strings if i.strip()]
+        else:
+            strings = [_bs4_string(i) for i in strings]
+        return separator.join(strings)
+
+    @property
+    def attrs(self) -> dict[str, str | list[str]]:
+        return {k: v.split() if k in _MULTI_VALUED_ATTRS else v for k, v in self._el.attrib.items()}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self._el.get(key)
+        if value is None:
+            return default
+        return value.split() if key in _MULTI_VALUED_ATTRS else value
+
+    def __getitem__(self, key: str):
+        value = self._el.attrib[key]
+        return value.split() if key in _MULTI_VALUED_ATTRS else value
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._el.attrib
+
+    def __str__(self) -> str:
+        return etree.tostring(self._el, encoding="unicode", method="html", with_tail=False)
+
+    def __repr__(self) -> str:
+        return str(self)
+
+    def __bool__(self) -> bool:
+        return True
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Node) and other._el is self._el
+
+    def __hash__(self) -> int:
+        return hash(self._el)
+
+    def __iter_matches(self, name: str | bool | Callable | None, attrs: dict | None, recursive: bool,
+                       class_: str | None, kwargs: dict):
+        if unsupported := [i for i in _UNSUPPORTED_KWARGS if i in kwargs]:
+            raise TypeError(f"Node.find/find_all не поддерживает аргументы: {', '.join(unsupported)}")
+        attrs = dict(attrs or {})
+        attrs.update(kwargs)
+        if class_ is not None:
+            attrs["class"] = class_
+        simple = tuple((k, v) for k, v in attrs.items() if isinstance(v, str) or v is True)
+        predicates = [(k, v) for k, v in attrs.items() if not (isinstance(v, str) or v is True)]
+        if name is True:
+            name = None
+        if recursive:
+            axis = "descendant-or-self" if self._root else "descendant"
+        else:
+            # Корень документа соответствует объекту BeautifulSoup, дочерний элемент которого - сам <html>
+            axis = "self" if self._root else "child"
+        if callable(name):
+            candidates = (Node(e) for e in _compile(axis, None, simple)(self._el))
+            candidates = (n for n in candidates if name(n))
+        else:
+            candidates = (Node(e) for e in _compile(axis, name, simple)(self._el))
+        for node in candidates:
+            if all(self.__check(node, k, v) for k, v in predicates):
+                yield node
+
+    @staticmethod
+    def __check(node: Node, key: str, value: Any) -> bool:
+        attr = node.get(key)
+        if value is None:
+            return attr is None
+        if value is False:
+            return attr is None
+        if callable(value):
+            return bool(value(attr))
+        if isinstance(value, re.Pattern):
+            return attr is not None and any(value.search(i) for i in (attr if isinstance(attr, list) else [attr]))
+        if isinstance(value, (list, tuple, set)):
+            if isinstance(attr, list):
+                return any(v in attr for v in value)
+            return attr in value
+        return attr == value
+
+    def find(self, name: str | bool | Callable | None = None, attrs: dict | None = None, recursive: bool = True,
+             class_: str | None = None, **kwargs) -> Node | None:
+        return next(self.__iter_matches(name, attrs, recursive, class_, kwargs), None)
+
+    def find_all(self, name: str | bool | Callable | None = None, attrs: dict | None = None, recursive: bool = True,
+                 limit: int | None = None, class_: str | None = None, **kwargs) -> list[Node]:
+        return list(itertools.islice(self.__iter_matches(name, attrs, recursive, class_, kwargs), limit or None))
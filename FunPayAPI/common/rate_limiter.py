@@ -0,0 +1,265 @@
+"""
+В данном модуле описан общий ограничитель частоты запросов к FunPay (token bucket).
+"""
+from __future__ import annotations
+from typing import Any
+
+from contextlib import contextmanager
+import threading
+import itertools
+import heapq
+import time
+
+from .enums import RequestPriorities, EndpointTypes
+
+
+class TokenBucket:
+    """
+    Потокобезопасное "ведро токенов" с очередью ожидания по приоритету.
+
+    Пока в очереди есть запрос с более высоким приоритетом, запросы с более низким приоритетом токен не получат.
+
+    :param rate: кол-во токенов, восполняемых в секунду. Если <= 0 - ограничение отключено.
+    :type rate: :obj:`float`
+
+    :param capacity: максимальное кол-во накопленных токенов (размер "всплеска" запросов).
+    :type capacity: :obj:`float`
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate: float = rate
+        """Кол-во токенов, восполняемых в секунду."""
+        self.capacity: float = max(1.0, capacity)
+        """Максимальное кол-во накопленных токенов."""
+        self.__tokens: float = self.capacity
+        self.__last_refill: float = time.monotonic()
+        self.__paused_until: float = 0
+        self.__waiters: list[tuple[int, int]] = []
+        self.__counter = itertools.count()
+        self.__cond = threading.Condition()
+
+    def __refill(self, now: float):
+        self.__tokens = min(self.capacity, self.__tokens + (now - self.__last_refill) * self.rate)
+        self.__last_refill = now
+
+    def acquire(self, priority: RequestPriorities = RequestPriorities.INTERACTIVE,
+                timeout: float | None = None) -> bool:
+        """
+        Ожидает и забирает 1 токен.
+
+        :param priority: приоритет запроса.
+        :type priority: :class:`FunPayAPI.common.enums.RequestPriorities`, опционально
+
+        :param timeout: максимальное время ожидания (сек). Если `None` - ожидать бесконечно.
+        :type timeout: :obj:`float` or :obj:`None`, опционально
+
+        :return: `True`, если токен получен, `False`, если истекло время ожидания.
+        :rtype: :obj:`bool`
+        """
+        if self.rate <= 0:
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.__cond:
+            ticket = (priority.value, next(self.__counter))
+            heapq.heappush(self.__waiters, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self.__refill(now)
+                    wait = None
+                    if self.__waiters[0] == ticket:
+                        if now >= self.__paused_until and self.__tokens >= 1:
+                            self.__tokens -= 1
+                            return True
+                        wait = max(self.__paused_until - now, (1 - self.__tokens) / self.rate)
+                    if deadline is not None:
+                        if now >= deadline:
+                            return False
+                        wait = deadline - now if wait is None else min(wait, deadline - now)
+                    self.__cond.wait(wait)
+            finally:
+                if self.__waiters[0] == ticket:
+                    heapq.heappop(self.__waiters)
+                else:
+                    self.__waiters.remove(ticket)
+                    heapq.heapify(self.__waiters)
+                self.__cond.notify_all()
+
+    def pause(self, delay: float):
+        """
+        Приостанавливает выдачу токенов на указанное время и обнуляет накопленные токены
+        (например, после 429 ошибки).
+
+        :param delay: время паузы (сек).
+        :type delay: :obj:`float`
+        """
+        with self.__cond:
+            now = time.monotonic()
+            self.__refill(now)
+            self.__tokens = 0
+            self.__paused_until = max(self.__paused_until, now + delay)
+
+    @property
+    def waiting(self) -> int:
+        """
+        Кол-во запросов, ожидающих токен.
+        """
+        return len(self.__waiters)
+
+    @property
+    def paused_for(self) -> float:
+        """
+        Сколько секунд осталось до конца паузы.
+        """
+        return max(0.0, self.__paused_until - time.monotonic())
+
+
+class RateLimiter:
+    """
+    Общий ограничитель частоты запросов к FunPay. Для каждой группы эндпоинтов
+    (:class:`FunPayAPI.common.enums.EndpointTypes`) используется отдельное "ведро токенов".
+
+    :param limits: лимиты для групп эндпоинтов {группа: (запросов в секунду, размер всплеска)}.
+        Не указанные группы получают значения из :py:obj:`.RateLimiter.DEFAULT_LIMITS`.
+    :type limits: :obj:`dict` {:class:`FunPayAPI.common.enums.EndpointTypes`: :obj:`tuple` (:obj:`float`, :obj:`float`)}
+    """
+
+    DEFAULT_LIMITS: dict[EndpointTypes, tuple[float, float]] = {
+        EndpointTypes.RUNNER: (1.0, 3),
+        EndpointTypes.CHAT: (1.0, 3),
+        EndpointTypes.ORDERS: (1.0, 3),
+        EndpointTypes.LOTS: (1.0, 3),
+        EndpointTypes.OTHER: (2.0, 5)
+    }
+    """Лимиты по умолчанию {группа: (запросов в секунду, размер всплеска)}."""
+
+    def __init__(self, limits: dict[EndpointTypes, tuple[float, float]] | None = None):
+        limits = {**self.DEFAULT_LIMITS, **(limits or {})}
+        self.buckets: dict[EndpointTypes, TokenBucket] = {k: TokenBucket(*v) for k, v in limits.items()}
+        """"Ведра токенов" для каждой группы эндпоинтов."""
+        self.__local = threading.local()
+
+    @staticmethod
+    def classify(request_method: str, url: str, payload: Any = None) -> EndpointTypes:
+        """
+        Определяет группу эндпоинта по ссылке запроса.
+
+        :param request_method: метод запроса ("get" / "post").
+        :type request_method: :obj:`str`
+
+        :param url: полная ссылка (без языкового префикса).
+        :type url: :obj:`str`
+
+        :param payload: полезная нагрузка запроса.
+
+        :return: группа эндпоинта.
+        :rtype: :class:`FunPayAPI.common.enums.EndpointTypes`
+        """
+        path = url.split("funpay.com/", 1)[-1]
+        if path.startswith("runner/"):
+            if isinstance(payload, dict) and payload.get("request"):
+                return EndpointTypes.CHAT
+            return EndpointTypes.RUNNER
+        if path.startswith(("chat/", "file/")):
+            return EndpointTypes.CHAT
+        if path.startswith("orders/"):
+            return EndpointTypes.ORDERS
+        if path.startswith(("lots/", "chips/")):
+            return EndpointTypes.LOTS
+        return EndpointTypes.OTHER
+
+    @staticmethod
+    def default_priority(endpoint: EndpointTypes) -> RequestPriorities:
+        """
+        Возвращает приоритет по умолчанию для группы эндпоинтов.
+
+        :param endpoint: группа эндпоинта.
+        :type endpoint: :class:`FunPayAPI.common.enums.EndpointTypes`
+
+        :rtype: :class:`FunPayAPI.common.enums.RequestPriorities`
+        """
+        if endpoint in (EndpointTypes.RUNNER, EndpointTypes.CHAT):
+            return RequestPriorities.REALTIME
+        return RequestPriorities.INTERACTIVE
+
+    @property
+    def current_priority(self) -> RequestPriorities | None:
+        """
+        Приоритет, установленный для текущего потока с помощью :meth:`FunPayAPI.common.rate_limiter.RateLimiter.priority`.
+        """
+        return getattr(self.__local, "priority", None)
+
+    @contextmanager
+    def priority(self, priority: RequestPriorities):
+        """
+        Устанавливает приоритет для всех запросов текущего потока внутри блока `with`.
+
+        :param priority: приоритет.
+        :type priority: :class:`FunPayAPI.common.enums.RequestPriorities`
+        """
+        previous = self.current_priority
+        self.__local.priority = priority
+        try:
+            yield
+        finally:
+            self.__local.priority = previous
+
+    def acquire(self, endpoint: EndpointTypes, priority: RequestPriorities | None = None,
+                timeout: float | None = None) -> bool:
+        """
+        Ожидает разрешения на отправку запроса к группе эндпоинтов.
+
+        :param endpoint: группа эндпоинта.
+        :type endpoint: :class:`FunPayAPI.common.enums.EndpointTypes`
+
+        :param priority: приоритет запроса. Если не указан - берется приоритет текущего потока или приоритет
+            по умолчанию для группы.
+        :type priority: :class:`FunPayAPI.common.enums.RequestPriorities` or :obj:`None`, опционально
+
+        :param timeout: максимальное время ожидания (сек).
+        :type timeout: :obj:`float` or :obj:`None`, опционально
+
+        :rtype: :obj:`bool`
+        """
+        priority = priority or self.current_priority or self.default_priority(endpoint)
+        return self.buckets[endpoint].acquire(priority, timeout)
+
+    def penalize(self, endpoint: EndpointTypes, delay: float):
+        """
+        Приостанавливает запросы к группе эндпоинтов (после 429 ошибки или ошибки флуда).
+
+        :param endpoint: группа эндпоинта.
+        :type endpoint: :class:`FunPayAPI.common.enums.EndpointTypes`
+
+        :param delay: время паузы (сек).
+        :type delay: :obj:`float`
+        """
+        self.buckets[endpoint].pause(delay)
+
+    def set_limit(self, endpoint: EndpointTypes, rate: float, capacity: float | None = None):
+        """
+        Изменяет лимит для группы эндпоинтов.
+
+        :param endpoint: группа эндпоинта.
+        :type endpoint: :class:`FunPayAPI.common.enums.EndpointTypes`
+
+        :param rate: запросов в секунду (<= 0 - без ограничений).
+        :type rate: :obj:`float`
+
+        :param capacity: размер всплеска.
+        :type capacity: :obj:`float` or :obj:`None`, опционально
+        """
+        bucket = self.buckets[endpoint]
+        bucket.rate = rate
+        if capacity is not None:
+            bucket.capacity = max(1.0, capacity)
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """
+        Возвращает текущее состояние лимитов.
+
+        :return: {название группы: {"rate": ..., "waiting": ..., "paused_for": ...}}
+        :rtype: :obj:`dict`
+        """
+        return {k.name: {"rate": v.rate, "waiting": v.waiting, "paused_for": round(v.paused_for, 1)}
+                for k, v in self.buckets.items()}
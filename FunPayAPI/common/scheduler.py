@@ -0,0 +1,229 @@
+"""
+В данном модуле описан планировщик запросов к FunPay с очередями по приоритету.
+"""
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .rate_limiter import RateLimiter
+
+from contextlib import contextmanager
+import threading
+import itertools
+import heapq
+import time
+
+from .enums import RequestPriorities
+from . import exceptions
+
+
+class CancelToken:
+    """
+    Признак отмены для группы запросов, выполняемых внутри :meth:`FunPayAPI.common.scheduler.RequestScheduler.lane`.
+
+    :param priority: очередь, к которой относится токен.
+    :type priority: :class:`FunPayAPI.common.enums.RequestPriorities`
+    """
+
+    def __init__(self, priority: RequestPriorities):
+        self.priority: RequestPriorities = priority
+        """Очередь, к которой относится токен."""
+        self.cancelled: bool = False
+        """Отменены ли запросы."""
+
+    def cancel(self):
+        """
+        Отменяет все последующие и ожидающие запросы этой группы.
+        """
+        self.cancelled = True
+
+
+class RequestScheduler:
+    """
+    Планировщик запросов к FunPay. Ограничивает кол-во одновременно выполняемых запросов и выдает
+    свободные "слоты" в порядке приоритета, при этом фоновые очереди не могут занять все слоты:
+    для каждой очереди задан собственный лимит (:py:obj:`.RequestScheduler.lane_limits`).
+
+    :param max_concurrent: максимальное кол-во одновременно выполняемых запросов.
+    :type max_concurrent: :obj:`int`
+
+    :param rate_limiter: ограничитель частоты запросов, приоритет которого выставляется внутри
+        :meth:`FunPayAPI.common.scheduler.RequestScheduler.lane`.
+    :type rate_limiter: :class:`FunPayAPI.common.rate_limiter.RateLimiter` or :obj:`None`, опционально
+    """
+
+    def __init__(self, max_concurrent: int, rate_limiter: RateLimiter | None = None):
+        self.max_concurrent: int = max(1, max_concurrent)
+        """Максимальное кол-во одновременно выполняемых запросов."""
+        self.lane_limits: dict[RequestPriorities, int] = {
+            RequestPriorities.REALTIME: self.max_concurrent,
+            RequestPriorities.INTERACTIVE: max(1, self.max_concurrent - 1),
+            RequestPriorities.BULK: max(1, self.max_concurrent // 4)
+        }
+        """Максимальное кол-во одновременно выполняемых запросов для каждой очереди."""
+        self.rate_limiter: RateLimiter | None = rate_limiter
+
+        self.__cond = threading.Condition()
+        self.__waiters: list[tuple[int, int]] = []
+        self.__counter = itertools.count()
+        self.__in_flight: dict[RequestPriorities, int] = {p: 0 for p in RequestPriorities}
+        self.__tokens: dict[RequestPriorities, dict[CancelToken, int]] = {p: {} for p in RequestPriorities}
+        self.__local = threading.local()
+        self.__metrics: dict[RequestPriorities, dict[str, float]] = {
+            p: {"completed": 0, "cancelled": 0, "wait_total": 0.0, "wait_max": 0.0} for p in RequestPriorities
+        }
+
+    @property
+    def current_token(self) -> CancelToken | None:
+        """
+        Токен отмены, установленный для текущего потока.
+        """
+        return getattr(self.__local, "token", None)
+
+    @contextmanager
+    def lane(self, priority: RequestPriorities, token: CancelToken | None = None):
+        """
+        Выполняет все запросы текущего потока внутри блока `with` в указанной очереди.
+
+        :param priority: очередь (приоритет).
+        :type priority: :class:`FunPayAPI.common.enums.RequestPriorities`
+
+        :param token: токен отмены. Если не передан - создается новый.
+        :type token: :class:`FunPayAPI.common.scheduler.CancelToken` or :obj:`None`, опционально
+
+        :return: токен отмены, с помощью которого можно отменить запросы этого блока.
+        :rtype: :class:`FunPayAPI.common.scheduler.CancelToken`
+        """
+        token = token or CancelToken(priority)
+        previous = self.current_token
+        self.__local.token = token
+        try:
+            with self.track(token):
+                if self.rate_limiter is not None:
+                    with self.rate_limiter.priority(priority):
+                        yield token
+                else:
+                    yield token
+        finally:
+            self.__local.token = previous
+
+    @contextmanager
+    def track(self, token: CancelToken):
+        """
+        Регистрирует токен на время блока `with`, чтобы его можно было отменить через
+        :meth:`FunPayAPI.common.scheduler.RequestScheduler.cancel` и между запросами (например, на всё время
+        постраничного обхода, состоящего из нескольких блоков :meth:`FunPayAPI.common.scheduler.RequestScheduler.lane`).
+        Очередь текущего потока не меняется.
+
+        :param token: токен отмены.
+        :type token: :class:`FunPayAPI.common.scheduler.CancelToken`
+
+        :return: переданный токен.
+        :rtype: :class:`FunPayAPI.common.scheduler.CancelToken`
+        """
+        tokens = self.__tokens[token.priority]
+        with self.__cond:
+            tokens[token] = tokens.get(token, 0) + 1
+        try:
+            yield token
+        finally:
+            with self.__cond:
+                tokens[token] -= 1
+                if not tokens[token]:
+                    del tokens[token]
+
+    def cancel(self, priority: RequestPriorities) -> int:
+        """
+        Отменяет все активные группы запросов указанной очереди.
+
+        :param priority: очередь.
+        :type priority: :class:`FunPayAPI.common.enums.RequestPriorities`
+
+        :return: кол-во отмененных групп.
+        :rtype: :obj:`int`
+        """
+        with self.__cond:
+            tokens = list(self.__tokens[priority])
+            for token in tokens:
+                token.cancel()
+            self.__cond.notify_all()
+        return len(tokens)
+
+    def check_cancelled(self):
+        """
+        Возбуждает :class:`FunPayAPI.common.exceptions.RequestCancelledError`, если запросы текущего потока отменены.
+        """
+        token = self.current_token
+        if token is not None and token.cancelled:
+            raise exceptions.RequestCancelledError(token.priority)
+
+    def __can_run(self, ticket: tuple[int, int]) -> bool:
+        if sum(self.__in_flight.values()) >= self.max_concurrent:
+            return False
+        # Ожидающие запросы, очередь которых уже исчерпала свой лимит, пропускаются, чтобы они не блокировали
+        # запросы других очередей.
+        for waiter in sorted(self.__waiters):
+            priority = RequestPriorities(waiter[0])
+            if self.__in_flight[priority] < self.lane_limits[priority]:
+                return waiter == ticket
+        return False
+
+    @contextmanager
+    def slot(self, priority: RequestPriorities):
+        """
+        Ожидает свободный слот в очереди и удерживает его до выхода из блока `with`.
+
+        :param priority: очередь (приоритет) запроса.
+        :type priority: :class:`FunPayAPI.common.enums.RequestPriorities`
+        """
+        token = self.current_token
+        start = time.monotonic()
+        with self.__cond:
+            ticket = (priority.value, next(self.__counter))
+            heapq.heappush(self.__waiters, ticket)
+            try:
+                while not self.__can_run(ticket):
+                    if token is not None and token.cancelled:
+                        self.__metrics[priority]["cancelled"] += 1
+                        raise exceptions.RequestCancelledError(priority)
+                    self.__cond.wait()
+                self.__in_flight[priority] += 1
+            finally:
+                if self.__waiters[0] == ticket:
+                    heapq.heappop(self.__waiters)
+                else:
+                    self.__waiters.remove(ticket)
+                    heapq.heapify(self.__waiters)
+                self.__cond.notify_all()
+            waited = time.monotonic() - start
+            metrics = self.__metrics[priority]
+            metrics["wait_total"] += waited
+            metrics["wait_max"] = max(metrics["wait_max"], waited)
+        try:
+            yield
+        finally:
+            with self.__cond:
+                self.__in_flight[priority] -= 1
+                self.__metrics[priority]["completed"] += 1
+                self.__cond.notify_all()
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """
+        Возвращает метрики очередей.
+
+        :return: {название очереди: {"queued": ..., "in_flight": ..., "completed": ..., "cancelled": ...,
+            "avg_wait": ..., "max_wait": ...}}
+        :rtype: :obj:`dict`
+        """
+        with self.__cond:
+            queued = {p: 0 for p in RequestPriorities}
+            for value, _ in self.__waiters:
+                queued[RequestPriorities(value)] += 1
+            result = {}
+            for p in RequestPriorities:
+                m = self.__metrics[p]
+                done = m["completed"] or 1
+                result[p.name] = {"queued": queued[p], "in_flight": self.__in_flight[p],
+                                  "completed": int(m["completed"]), "cancelled": int(m["cancelled"]),
+                                  "avg_wait": round(m["wait_total"] / done, 3), "max_wait": round(m["wait_max"], 3)}
+            return result
@@ -1,11 +1,12 @@
 """
 В данном модуле написаны вспомогательные функции.
 """
+from __future__ import annotations
 
 import string
 import random
 import re
-from .enums import Currency
+from .enums import Currency, MessageTypes
 
 MONTHS = {
     "января": 1,
@@ -95,6 +96,9 @@ class RegularExpressions(object):
         return getattr(cls, "instance")
 
     def __init__(self):
+        # __init__ вызывается при каждом RegularExpressions(), выражения компилируются только один раз
+        if hasattr(self, "ORDER_PURCHASED"):
+            return
         self.ORDER_PURCHASED = \
             re.compile(r"(Покупатель|The buyer) [a-zA-Z0-9]+ (оплатил заказ|has paid for order) #[A-Z0-9]{8}\.")
         """
@@ -226,3 +230,95 @@ class RegularExpressions(object):
         """
         Скомпилированное регулярное выражение, описывающее фразу о смене валюты.
         """
+
+        self.SYS_MSG_DISPATCH: tuple[tuple[tuple[str, ...], tuple[tuple[tuple[str, ...], MessageTypes], ...]], ...] = (
+            (("Покупатель ", "The buyer "), (
+                (("оплатил заказ", "has paid for order"), MessageTypes.ORDER_PURCHASED),
+                (("подтвердил успешное", "has confirmed that order"), MessageTypes.ORDER_CONFIRMED),
+                (("написал отзыв", "has given feedback"), MessageTypes.NEW_FEEDBACK),
+                (("изменил отзыв", "has edited their feedback"), MessageTypes.FEEDBACK_CHANGED),
+                (("удалил отзыв", "has deleted their feedback"), MessageTypes.FEEDBACK_DELETED),
+            )),
+            (("Продавец ", "The seller "), (
+                (("ответил на отзыв", "has replied to their feedback"), MessageTypes.NEW_FEEDBACK_ANSWER),
+                (("вернул деньги", "has refunded the buyer"), MessageTypes.REFUND),
+                (("изменил ответ", "has edited a reply"), MessageTypes.FEEDBACK_ANSWER_CHANGED),
+                (("удалил ответ", "has deleted a reply"), MessageTypes.FEEDBACK_ANSWER_DELETED),
+            )),
+            (("Администратор ", "The administrator "), (
+                (("подтвердил успешное", "has confirmed that order"), MessageTypes.ORDER_CONFIRMED_BY_ADMIN),
+                (("вернул деньги", "has refunded the buyer"), MessageTypes.REFUND_BY_ADMIN),
+            )),
+            (("Заказ #", "Order #"), ((("открыт повторно", "has been reopened"), MessageTypes.ORDER_REOPENED),)),
+            (("Часть средств", "A part of the funds"), ((("возвращена", "has been refunded"),
+                                                         MessageTypes.PARTIAL_REFUND),)),
+        )
+        """
+        Таблица быстрого определения типа системного сообщения: (начала сообщения, ((ключевые фразы, тип), ...)).
+        """
+
+        self.SYS_MSG_TYPES: dict[MessageTypes, re.Pattern] = {
+            MessageTypes.ORDER_CONFIRMED: self.ORDER_CONFIRMED,
+            MessageTypes.NEW_FEEDBACK: self.NEW_FEEDBACK,
+            MessageTypes.NEW_FEEDBACK_ANSWER: self.NEW_FEEDBACK_ANSWER,
+            MessageTypes.FEEDBACK_CHANGED: self.FEEDBACK_CHANGED,
+            MessageTypes.FEEDBACK_DELETED: self.FEEDBACK_DELETED,
+            MessageTypes.REFUND: self.REFUND,
+            MessageTypes.FEEDBACK_ANSWER_CHANGED: self.FEEDBACK_ANSWER_CHANGED,
+            MessageTypes.FEEDBACK_ANSWER_DELETED: self.FEEDBACK_ANSWER_DELETED,
+            MessageTypes.ORDER_CONFIRMED_BY_ADMIN: self.ORDER_CONFIRMED_BY_ADMIN,
+            MessageTypes.PARTIAL_REFUND: self.PARTIAL_REFUND,
+            MessageTypes.ORDER_REOPENED: self.ORDER_REOPENED,
+            MessageTypes.REFUND_BY_ADMIN: self.REFUND_BY_ADMIN
+        }
+        """
+        Регулярные выражения системных сообщений о заказах в порядке от самых часто-используемых к самым
+        редко-используемым.
+        """
+
+    def get_message_type(self, text: str | None) -> MessageTypes:
+        """
+        Определяет тип сообщения по его тексту.
+
+        Сначала отбрасываются сообщения без ключевых фраз / ID заказа, затем по началу сообщения и ключевой фразе
+        выбирается одно регулярное выражение. Если по таблице тип определить не удалось, выражения проверяются
+        по очереди.
+
+        :param text: текст сообщения.
+        :type text: :obj:`str` or :obj:`None`
+
+        :return: тип сообщения.
+        :rtype: :class:`FunPayAPI.common.enums.MessageTypes`
+        """
+        if not text:
+            return MessageTypes.NON_SYSTEM
+        if "Discord" in text and self.DISCORD.search(text):
+            return MessageTypes.DISCORD
+        if ("Уважаемые продавцы" in text or "Dear vendors" in text) and self.DEAR_VENDORS.search(text):
+            return MessageTypes.DEAR_VENDORS
+        # Во всех остальных системных сообщениях есть ID заказа
+        if "#" not in text:
+            return MessageTypes.NON_SYSTEM
+
+        for prefixes, keywords in self.SYS_MSG_DISPATCH:
+            if not text.startswith(prefixes):
+                continue
+            for phrases, msg_type in keywords:
+                if not any(phrase in text for phrase in phrases):
+                    continue
+                if msg_type is MessageTypes.ORDER_PURCHASED:
+                    if self.ORDER_PURCHASED.search(text) and self.ORDER_PURCHASED2.search(text):
+                        return msg_type
+                elif self.SYS_MSG_TYPES[msg_type].search(text):
+                    return msg_type
+                break
+            break
+
+        if self.ORDER_PURCHASED.search(text) and self.ORDER_PURCHASED2.search(text):
+            return MessageTypes.ORDER_PURCHASED
+        if self.ORDER_ID.search(text) is None:
+            return MessageTypes.NON_SYSTEM
+        for msg_type, regex in self.SYS_MSG_TYPES.items():
+            if regex.search(text):
+                return msg_type
+        return MessageTypes.NON_SYSTEM
@@ -1,16 +1,19 @@
 from __future__ import annotations
 
 import re
-from typing import TYPE_CHECKING, Generator
+from typing import TYPE_CHECKING, Generator, Callable
 
 if TYPE_CHECKING:
     from ..account import Account
 
 import json
 import logging
-from bs4 import BeautifulSoup
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from ..common import exceptions
+from ..common import parser as html_parser
+from ..common.bounded import BoundedDict
 from .events import *
 
 logger = logging.getLogger("FunPayAPI.runner")
@@ -39,10 +42,18 @@ class Runner:
         Из событий, связанных с заказами, будет возвращаться только
         :class:`FunPayAPI.updater.events.OrdersListChangedEvent`.
     :type disabled_order_requests: :obj:`bool`, опционально
+
+    :param max_chats: сколько чатов хранить в состоянии Runner'а (ID последних сообщений). Давно не менявшиеся
+        чаты вытесняются и при следующем изменении обрабатываются как новые.
+    :type max_chats: :obj:`int`, опционально
+
+    :param by_bot_ttl: через сколько секунд забывать ID отправленных ботом сообщений, которые так и не появились в
+        истории чата. `None` - не забывать.
+    :type by_bot_ttl: :obj:`float` or :obj:`None`, опционально
     """
 
     def __init__(self, account: Account, disable_message_requests: bool = False,
-                 disabled_order_requests: bool = False):
+                 disabled_order_requests: bool = False, max_chats: int = 5000, by_bot_ttl: float | None = 86400):
         # todo добавить события и исключение событий о новых покупках (не продажах!)
         if not account.is_initiated:
             raise exceptions.AccountNotInitiatedError()
@@ -57,18 +68,19 @@ class Runner:
         self.__first_request = True
         self.__last_msg_event_tag = utils.random_tag()
         self.__last_order_event_tag = utils.random_tag()
+        self.__sales_skipped = False
 
         self.saved_orders: dict[str, types.OrderShortcut] = {}
         """Сохраненные состояния заказов ({ID заказа: экземпляр types.OrderShortcut})."""
 
-        self.runner_last_messages: dict[int, list[int, int, str | None]] = {}
+        self.runner_last_messages: BoundedDict[int, list[int, int, str | None]] = BoundedDict(max_chats)
         """ID последний сообщений {ID чата: [ID последего сообщения чата, ID последнего прочитанного сообщения чата, 
-        текст последнего сообщения или None, если это изображение]}."""
+        текст последнего сообщения или None, если это изображение]} (не более max_chats давно не менявшихся чатов)."""
 
-        self.by_bot_ids: dict[int, list[int]] = {}
-        """ID сообщений, отправленных с помощью self.account.send_message ({ID чата: [ID сообщения, ...]})."""
+        self.by_bot_ids: BoundedDict[int, set[int]] = BoundedDict(max_chats, by_bot_ttl)
+        """ID сообщений, отправленных с помощью self.account.send_message ({ID чата: {ID сообщения, ...}})."""
 
-        self.last_messages_ids: dict[int, int] = {}
+        self.last_messages_ids: BoundedDict[int, int] = BoundedDict(max_chats)
         """ID последних сообщений в чатах ({ID чата: ID последнего сообщения})."""
 
         self.buyers_viewing: dict[int, types.BuyerViewing] = {}
@@ -77,6 +89,23 @@ class Runner:
         self.runner_len: int = 10
         """Количество событий, на которое успешно отвечает funpay.com/runner/"""
 
+        self.skip_unchanged_sales: bool = True
+        """Не запрашивать список продаж, если по счетчикам orders_counters изменились только покупки.
+        Счетчик продаж не меняется, если одновременно появился новый заказ и был подтвержден другой, поэтому после
+        пропуска список продаж все равно запрашивается, как только в чатах появится сообщение с неизвестным ID заказа."""
+
+        self.last_orders_counters: tuple[int, int] | None = None
+        """Последние значения счетчиков заказов (покупки, продажи)."""
+
+        self.incremental_history: bool = True
+        """Запрашивать ли у FunPay только сообщения после последнего известного (а не последние 50 сообщений)?"""
+
+        self.max_parallel_packs: int = 4
+        """Максимальное кол-во пачек чатов, истории которых запрашиваются одновременно."""
+
+        self.current_delay: float | None = None
+        """Текущая задержка между запросами в :meth:`FunPayAPI.updater.runner.Runner.listen`."""
+
         self.account: Account = account
         """Экземпляр аккаунта, к которому привязан Runner."""
         self.account.runner = self
@@ -134,16 +163,35 @@ class Runner:
             :class:`FunPayAPI.updater.events.NewOrderEvent`,
             :class:`FunPayAPI.updater.events.OrderStatusChangedEvent`
         """
-        events = []
+        return list(self.iter_updates(updates))
+
+    def iter_updates(self, updates: dict) -> Generator[InitialChatEvent | ChatsListChangedEvent |
+                                                       LastChatMessageChangedEvent | NewMessageEvent |
+                                                       InitialOrderEvent | OrdersListChangedEvent | NewOrderEvent |
+                                                       OrderStatusChangedEvent]:
+        """
+        То же, что и :meth:`FunPayAPI.updater.runner.Runner.parse_updates`, но возвращает события по мере их
+        получения (события новых сообщений - сразу после получения истории очередной пачки чатов).
+
+        :param updates: результат выполнения :meth:`FunPayAPI.updater.runner.Runner.get_updates`
+        :type updates: :obj:`dict`
+
+        :return: генератор событий.
+        """
         # сортируем в т.ч. для того, корректно реагировало на сообщения покупателей сразу после оплаты (плагины автовыдачи)
+        recheck_sales = False
         for obj in sorted(updates["objects"], key=lambda x: x.get("type") == "orders_counters", reverse=True):
             if obj.get("type") == "chat_bookmarks":
-                events.extend(self.parse_chat_updates(obj))
+                for event in self.iter_chat_updates(obj):
+                    if self.__sales_skipped and not recheck_sales:
+                        recheck_sales = self.__mentions_unknown_order(event)
+                    yield event
             elif obj.get("type") == "orders_counters":
-                events.extend(self.parse_order_updates(obj))
+                yield from self.parse_order_updates(obj)
+        if recheck_sales and self.__sales_skipped and self.make_order_requests:
+            yield from self.__get_order_events()
         if self.__first_request:
             self.__first_request = False
-        return events
 
     def parse_chat_updates(self, obj) -> list[InitialChatEvent | ChatsListChangedEvent | LastChatMessageChangedEvent |
                                               NewMessageEvent]:
@@ -160,9 +208,24 @@ class Runner:
             :class:`FunPayAPI.updater.events.LastChatMessageChangedEvent`,
             :class:`FunPayAPI.updater.events.NewMessageEvent`
         """
+        return list(self.iter_chat_updates(obj))
+
+    def iter_chat_updates(self, obj) -> Generator[InitialChatEvent | ChatsListChangedEvent |
+                                                  LastChatMessageChangedEvent | NewMessageEvent]:
+        """
+        То же, что и :meth:`FunPayAPI.updater.runner.Runner.parse_chat_updates`, но истории пачек чатов
+        запрашиваются параллельно (не более :py:obj:`.Runner.max_parallel_packs` одновременно), а события каждой
+        пачки возвращаются сразу после ее получения.
+
+        :param obj: словарь из результата выполнения :meth:`FunPayAPI.updater.runner.Runner.get_updates`, где
+            "type" == "chat_bookmarks".
+        :type obj: :obj:`dict`
+
+        :return: генератор событий, связанных с чатами.
+        """
         events, lcmc_events = [], []
         self.__last_msg_event_tag = obj.get("tag")
-        parser = BeautifulSoup(obj["data"]["html"], "lxml")
+        parser = html_parser.make_soup(obj["data"]["html"])
         chats = parser.find_all("a", {"class": "contact-item"})
 
         # Получаем все изменившиеся чаты
@@ -185,6 +248,7 @@ class Runner:
                 last_msg_text = last_msg_text[1:]
                 by_vertex = True
             # если сообщение отправлено непрочитанным и вкл старый режим, то [0, 0, None] или [0, 0, "text"]
+            # get() обновляет чат в очереди вытеснения: чаты из текущего списка не вытесняются
             prev_node_msg_id, prev_user_msg_id, prev_text = self.runner_last_messages.get(chat_id) or [-1, -1, None]
             last_msg_text_or_none = None if last_msg_text in ("Изображение", "Зображення", "Image") else last_msg_text
             if node_msg_id <= prev_node_msg_id:
@@ -197,7 +261,7 @@ class Runner:
 
             chat_with = chat.find("div", {"class": "media-user-name"}).text
             chat_obj = types.ChatShortcut(chat_id, chat_with, last_msg_text, node_msg_id,
-                                          user_msg_id, unread, str(chat))
+                                          user_msg_id, unread, html_parser.html_of(chat))
             if last_msg_text_or_none is not None:
                 chat_obj.last_by_bot = by_bot
                 chat_obj.last_by_vertex = by_vertex
@@ -218,7 +282,8 @@ class Runner:
 
         if not self.make_msg_requests:
             events.extend(lcmc_events)
-            return events
+            yield from events
+            return
 
         lcmc_events_without_new_mess = []
         lcmc_events_with_new_mess = []
@@ -228,19 +293,40 @@ class Runner:
             else:
                 lcmc_events_with_new_mess.append(lcmc_event)
         events.extend(lcmc_events_without_new_mess)
-
-        while lcmc_events_with_new_mess:
-            chats_pack = lcmc_events_with_new_mess[:self.runner_len]
-            del lcmc_events_with_new_mess[:self.runner_len]
-
-            chats_data = {i.chat.id: i.chat.name for i in chats_pack}
-            new_msg_events = self.generate_new_message_events(chats_data)
-
-            # [LastChatMessageChanged, NewMSG, NewMSG ..., LastChatMessageChanged, NewMSG, NewMSG ...]
-            for i in chats_pack:
-                events.append(i)
-                if new_msg_events.get(i.chat.id):
-                    events.extend(new_msg_events[i.chat.id])
+        yield from events
+
+        packs = [lcmc_events_with_new_mess[i:i + self.runner_len]
+                 for i in range(0, len(lcmc_events_with_new_mess), self.runner_len)]
+        if not packs:
+            return
+        if len(packs) == 1:
+            chats_data = {i.chat.id: i.chat.name for i in packs[0]}
+            yield from self.__pack_events(packs[0], self.__fetch_chats_histories(chats_data))
+            return
+
+        # Истории получаем параллельно, а состояние Runner'а изменяем только в этом потоке. Блокировки при этом
+        # все равно нужны: потоки пула читают last_messages_ids, а хэндлеры вызывают update_last_message /
+        # mark_as_by_bot, - их обеспечивает BoundedDict.
+        with ThreadPoolExecutor(max_workers=max(1, min(len(packs), self.max_parallel_packs)),
+                                thread_name_prefix="FunPayAPI-runner") as executor:
+            futures = {executor.submit(self.__fetch_chats_histories, {i.chat.id: i.chat.name for i in pack}): pack
+                       for pack in packs}
+            for future in as_completed(futures):
+                yield from self.__pack_events(futures[future], future.result())
+
+    def __pack_events(self, chats_pack: list[LastChatMessageChangedEvent],
+                      chats: dict[int, list[types.Message]] | None) -> list[LastChatMessageChangedEvent |
+                                                                             NewMessageEvent]:
+        """
+        Формирует события пачки чатов в порядке
+        [LastChatMessageChanged, NewMSG, NewMSG ..., LastChatMessageChanged, NewMSG, NewMSG ...].
+        """
+        new_msg_events = self.__process_chats_histories(chats) if chats is not None else {}
+        events = []
+        for i in chats_pack:
+            events.append(i)
+            if new_msg_events.get(i.chat.id):
+                events.extend(new_msg_events[i.chat.id])
         return events
 
     def generate_new_message_events(self, chats_data: dict[int, str]) -> dict[int, list[NewMessageEvent]]:
@@ -255,28 +341,49 @@ class Runner:
         :return: словарь с событиями новых сообщений в формате {ID чата: [список событий]}
         :rtype: :obj:`dict` {:obj:`int`: :obj:`list` of :class:`FunPayAPI.updater.events.NewMessageEvent`}
         """
+        chats = self.__fetch_chats_histories(chats_data)
+        if chats is None:
+            return {}
+        return self.__process_chats_histories(chats)
+
+    def __fetch_chats_histories(self, chats_data: dict[int, str]) -> dict[int, list[types.Message]] | None:
+        """
+        Получает истории переданных чатов (до 3 попыток). Вызывается из нескольких потоков одновременно:
+        состояние Runner'а только читается (self.last_messages_ids), но чтение BoundedDict меняет порядок вытеснения,
+        поэтому безопасно лишь благодаря внутренней блокировке BoundedDict.
+
+        :return: истории чатов или None, если получить их не удалось.
+        """
+        last_messages = None
+        if self.incremental_history:
+            # одно обращение на чат: между двумя обращениями запись могла быть вытеснена другим потоком
+            last_messages = {cid: mid for cid in chats_data if (mid := self.last_messages_ids.get(cid))}
         attempts = 3
         while attempts:
             attempts -= 1
             try:
-                chats = self.account.get_chats_histories(chats_data)
-                break
+                return self.account.get_chats_histories(chats_data, last_messages)
             except exceptions.RequestFailedError as e:
                 logger.error(e)
             except:
                 logger.error(f"Не удалось получить истории чатов {list(chats_data.keys())}.")
                 logger.debug("TRACEBACK", exc_info=True)
-            time.sleep(1)
-        else:
-            logger.error(f"Не удалось получить истории чатов {list(chats_data.keys())}: превышено кол-во попыток.")
-            return {}
+            if attempts:
+                time.sleep(1)
+        logger.error(f"Не удалось получить истории чатов {list(chats_data.keys())}: превышено кол-во попыток.")
+        return None
 
+    def __process_chats_histories(self, chats: dict[int, list[types.Message]]) -> dict[int, list[NewMessageEvent]]:
+        """
+        Отбирает новые сообщения из историй чатов, обновляет сохраненные ID последних сообщений
+        и генерирует события новых сообщений.
+        """
         result = {}
 
         for cid in chats:
             messages = chats[cid]
             result[cid] = []
-            self.by_bot_ids[cid] = self.by_bot_ids.get(cid) or []
+            by_bot_ids = self.by_bot_ids.get(cid)
 
             # Удаляем все сообщения, у которых ID меньше сохраненного последнего сообщения
             if self.last_messages_ids.get(cid):
@@ -285,9 +392,9 @@ class Runner:
                 continue
 
             # Отмечаем все сообщения, отправленные с помощью Account.send_message()
-            if self.by_bot_ids.get(cid):
+            if by_bot_ids:
                 for i in messages:
-                    if not i.by_bot and i.id in self.by_bot_ids[cid]:
+                    if not i.by_bot and i.id in by_bot_ids:
                         i.by_bot = True
 
             stack = MessageEventsStack()
@@ -298,7 +405,11 @@ class Runner:
                             m.id > min(self.last_messages_ids.values(), default=10 ** 20)] or messages[-1:]
 
             self.last_messages_ids[cid] = messages[-1].id  # Перезаписываем ID последнего сообщение
-            self.by_bot_ids[cid] = [i for i in self.by_bot_ids[cid] if i > self.last_messages_ids[cid]]  # чистим память
+            if by_bot_ids:  # чистим память
+                if remaining := {i for i in list(by_bot_ids) if i > messages[-1].id}:
+                    self.by_bot_ids[cid] = remaining
+                else:
+                    self.by_bot_ids.pop(cid, None)
 
             for msg in messages:
                 event = NewMessageEvent(self.__last_msg_event_tag, msg, stack)
@@ -323,17 +434,46 @@ class Runner:
         """
         events = []
         self.__last_order_event_tag = obj.get("tag")
+        counters = (obj["data"]["buyer"], obj["data"]["seller"])
+        prev_counters, self.last_orders_counters = self.last_orders_counters, counters
         if not self.__first_request:
-            events.append(OrdersListChangedEvent(self.__last_order_event_tag,
-                                                 obj["data"]["buyer"], obj["data"]["seller"]))
+            events.append(OrdersListChangedEvent(self.__last_order_event_tag, *counters))
         if not self.make_order_requests:
             return events
 
+        # Изменился только счетчик покупок - список продаж запрашивать незачем (см. Runner.skip_unchanged_sales).
+        if self.skip_unchanged_sales and not self.__first_request and prev_counters is not None \
+                and prev_counters[1] == counters[1] and prev_counters[0] != counters[0]:
+            self.__sales_skipped = True
+            return events
+        return events + self.__get_order_events()
+
+    def __mentions_unknown_order(self, event: BaseEvent) -> bool:
+        """
+        Проверяет, упоминается ли в сообщении события заказ, которого нет в self.saved_orders
+        (сообщения о собственных покупках не учитываются).
+        """
+        if isinstance(event, LastChatMessageChangedEvent):
+            text = event.chat.last_message_text
+        elif isinstance(event, NewMessageEvent):
+            text = event.message.text
+        else:
+            return False
+        if not text or f" {self.account.username} " in text:
+            return False
+        return any(i[1:] not in self.saved_orders for i in utils.RegularExpressions().ORDER_ID.findall(text))
+
+    def __get_order_events(self) -> list[NewOrderEvent | OrderStatusChangedEvent | InitialOrderEvent]:
+        """
+        Запрашивает список продаж и сравнивает его с self.saved_orders.
+        """
+        events = []
         attempts = 3
         while attempts:
             attempts -= 1
             try:
-                orders_list = self.account.get_sales()  # todo добавить возможность реакции на подтверждение очень старых заказов
+                # todo добавить возможность реакции на подтверждение очень старых заказов
+                orders_list = self.account.get_sales()
                 break
             except exceptions.RequestFailedError as e:
                 logger.error(e)
@@ -359,8 +499,92 @@ class Runner:
             elif order.status != self.saved_orders[order.id].status:
                 events.append(OrderStatusChangedEvent(self.__last_order_event_tag, order))
         self.saved_orders = saved_orders
+        self.__sales_skipped = False
         return events
 
+    def get_state(self) -> dict:
+        """
+        Возвращает состояние Runner'а (теги, ID последних сообщений, сохраненные заказы) в виде JSON-совместимого
+        словаря для :meth:`FunPayAPI.updater.runner.Runner.load_state`.
+
+        HTML-код заказов не сохраняется.
+
+        :return: состояние Runner'а.
+        :rtype: :obj:`dict`
+        """
+        orders = [[o.id, o.description, o.price, o.currency.name, o.amount, o.buyer_username, o.buyer_id, o.chat_id,
+                   o.status.name, o.date.isoformat(), o.subcategory_name,
+                   [o.subcategory.type.name, o.subcategory.id] if o.subcategory else None]
+                  for o in list(self.saved_orders.values())]
+        return {
+            "version": 1,
+            "account_id": self.account.id,
+            "time": time.time(),
+            "first_request": self.__first_request,
+            "make_msg_requests": self.make_msg_requests,
+            "msg_tag": self.__last_msg_event_tag,
+            "order_tag": self.__last_order_event_tag,
+            "last_orders_counters": self.last_orders_counters,
+            "runner_last_messages": self.runner_last_messages.copy(),
+            "last_messages_ids": self.last_messages_ids.copy(),
+            "by_bot_ids": {k: list(v) for k, v in self.by_bot_ids.copy().items()},
+            "saved_orders": orders
+        }
+
+    def load_state(self, state: dict) -> bool:
+        """
+        Восстанавливает состояние Runner'а, полученное с помощью :meth:`FunPayAPI.updater.runner.Runner.get_state`.
+
+        После восстановления первый запрос не считается первым: вместо Initial* событий Runner вернет события
+        о сообщениях и заказах, появившихся с момента сохранения состояния.
+
+        :param state: состояние Runner'а.
+        :type state: :obj:`dict`
+
+        :return: `True`, если состояние восстановлено, `False`, если оно не подходит (другой аккаунт, другая
+            версия формата, другой режим получения сообщений или состояние сохранено до первого запроса).
+        :rtype: :obj:`bool`
+        """
+        if state.get("version") != 1 or state.get("account_id") != self.account.id or state.get("first_request") \
+                or state.get("make_msg_requests") != self.make_msg_requests:
+            return False
+
+        saved_orders = {}
+        for (id_, description, price, currency, amount, buyer_username, buyer_id, chat_id, status, date,
+             subcategory_name, subcategory) in state["saved_orders"]:
+            if subcategory:
+                subcategory = self.account.get_subcategory(types.SubCategoryTypes[subcategory[0]], subcategory[1])
+            order = types.OrderShortcut(id_, description, price, types.Currency[currency], buyer_username,
+                                        buyer_id, chat_id, types.OrderStatuses[status],
+                                        datetime.fromisoformat(date), subcategory_name, subcategory, None,
+                                        dont_search_amount=True)
+            order.amount = amount
+            saved_orders[order.id] = order
+
+        self.saved_orders = saved_orders
+        self.runner_last_messages.replace_with({int(k): v for k, v in state["runner_last_messages"].items()})
+        self.last_messages_ids.replace_with({int(k): v for k, v in state["last_messages_ids"].items()})
+        self.by_bot_ids.replace_with({int(k): set(v) for k, v in state["by_bot_ids"].items()})
+        counters = state.get("last_orders_counters")
+        self.last_orders_counters = tuple(counters) if counters else None
+        self.__last_msg_event_tag = state["msg_tag"]
+        self.__last_order_event_tag = state["order_tag"]
+        self.__first_request = False
+        return True
+
+    def memory_stats(self) -> dict[str, dict[str, int]]:
+        """
+        Возвращает размеры хранилищ состояния Runner'а.
+
+        :return: {"runner_last_messages": {...}, "last_messages_ids": {...}, "by_bot_ids": {...},
+            "saved_orders": {"size": ...}}, где {...} - :meth:`FunPayAPI.common.bounded.BoundedDict.stats`.
+        :rtype: :obj:`dict`
+        """
+        return {"runner_last_messages": self.runner_last_messages.stats(),
+                "last_messages_ids": self.last_messages_ids.stats(),
+                "by_bot_ids": self.by_bot_ids.stats(),
+                "saved_orders": {"size": len(self.saved_orders)}}
+
     def update_last_message(self, chat_id: int, message_id: int, message_text: str | None):
         """
         Обновляет сохраненный ID последнего сообщения чата.
@@ -386,13 +610,41 @@ class Runner:
         :param message_id: ID сообщения.
         :type message_id: :obj:`int`
         """
-        if self.by_bot_ids.get(chat_id) is None:
-            self.by_bot_ids[chat_id] = [message_id]
+        self.by_bot_ids.setdefault(chat_id, set()).add(message_id)
+
+    def next_delay(self, requests_delay: int | float, activity: bool, min_delay: int | float,
+                   max_delay: int | float, backoff: float) -> float:
+        """
+        Рассчитывает задержку до следующего запроса в адаптивном режиме:
+        сразу после активности (изменился тег чатов / заказов) - минимальная задержка,
+        при простое задержка постепенно увеличивается, но не больше max_delay.
+        Если недавно была 429 ошибка, задержка не меньше requests_delay.
+
+        :param requests_delay: базовая задержка.
+        :param activity: были ли события в последнем запросе.
+        :param min_delay: минимальная задержка.
+        :param max_delay: максимальная задержка.
+        :param backoff: множитель увеличения задержки при простое.
+
+        :return: задержка (в секундах).
+        :rtype: :obj:`float`
+        """
+        if activity:
+            delay = min_delay
+        elif self.current_delay is None:
+            delay = requests_delay
         else:
-            self.by_bot_ids[chat_id].append(message_id)
+            delay = self.current_delay * backoff
+        delay = max(min_delay, min(delay, max_delay))
+        if time.time() - self.account.last_429_err_time <= 60:
+            delay = max(delay, requests_delay)
+        self.current_delay = delay
+        return delay
 
     def listen(self, requests_delay: int | float = 6.0,
-               ignore_exceptions: bool = True) -> Generator[InitialChatEvent | ChatsListChangedEvent |
+               ignore_exceptions: bool = True, adaptive: bool = False, min_delay: int | float = 1.0,
+               max_delay: int | float = 30.0, backoff: float = 1.5,
+               on_iteration: Callable[[list[BaseEvent]], None] | None = None) -> Generator[InitialChatEvent | ChatsListChangedEvent |
                                                             LastChatMessageChangedEvent | NewMessageEvent |
                                                             InitialOrderEvent | OrdersListChangedEvent | NewOrderEvent |
                                                             OrderStatusChangedEvent]:
@@ -405,6 +657,23 @@ class Runner:
         :param ignore_exceptions: игнорировать ошибки?
         :type ignore_exceptions: :obj:`bool`, опционально
 
+        :param adaptive: адаптивный режим: после активности запросы отправляются чаще (min_delay),
+            при простое задержка постепенно увеличивается до max_delay.
+        :type adaptive: :obj:`bool`, опционально
+
+        :param min_delay: минимальная задержка в адаптивном режиме (в секундах).
+        :type min_delay: :obj:`int` or :obj:`float`, опционально
+
+        :param max_delay: максимальная задержка в адаптивном режиме (в секундах).
+        :type max_delay: :obj:`int` or :obj:`float`, опционально
+
+        :param backoff: множитель увеличения задержки при простое в адаптивном режиме.
+        :type backoff: :obj:`float`, опционально
+
+        :param on_iteration: функция, которая вызывается после каждой итерации (каждого запроса к runner'у) со
+            списком всех событий этой итерации (в т.ч. пустым), после того как все они были возвращены генератором.
+        :type on_iteration: :obj:`Callable` or :obj:`None`, опционально
+
         :return: генератор событий FunPay.
         :rtype: :obj:`Generator` of :class:`FunPayAPI.updater.events.InitialChatEvent`,
             :class:`FunPayAPI.updater.events.ChatsListChangedEvent`,
@@ -417,10 +686,14 @@ class Runner:
 
         while True:
             start_time = time.time()
+            activity = False
+            iteration_events = []
             try:
                 updates = self.get_updates()
-                events = self.parse_updates(updates)
-                for event in events:
+                for event in self.iter_updates(updates):
+                    activity = True
+                    if on_iteration is not None:
+                        iteration_events.append(event)
                     yield event
             except Exception as e:
                 if not ignore_exceptions:
@@ -429,10 +702,20 @@ class Runner:
                     logger.error("Произошла ошибка при получении событий. "
                                  "(ничего страшного, если это сообщение появляется нечасто).")
                     logger.debug("TRACEBACK", exc_info=True)
+            if on_iteration is not None:
+                try:
+                    on_iteration(iteration_events)
+                except Exception as e:
+                    if not ignore_exceptions:
+                        raise e
+                    logger.error("Произошла ошибка при обработке итерации Runner'а.")
+                    logger.debug("TRACEBACK", exc_info=True)
             iteration_time = time.time() - start_time
+            delay = self.next_delay(requests_delay, activity, min_delay, max_delay, backoff) \
+                if adaptive else requests_delay
             if time.time() - self.account.last_429_err_time > 60:
-                rt = requests_delay - iteration_time
+                rt = delay - iteration_time
                 if rt > 0:
                     time.sleep(rt)
             else:
-                time.sleep(requests_delay)
+                time.sleep(delay)
@@ -22,6 +22,7 @@ if not hasattr(socket, '_original_socket'):
 from datetime import datetime
 import Utils.exceptions
 import itertools
+import functools
 import psutil
 import json
 import sys
@@ -394,98 +395,199 @@ def safe_text(text: str):
     return "⁣".join(text)
 
 
-def format_msg_text(text: str, obj: FunPayAPI.types.Message | FunPayAPI.types.ChatShortcut) -> str:
+DATE_VARIABLES = ("$full_date_text", "$date_text", "$date", "$time", "$full_time")
+"""Переменные даты и времени (общие для всех шаблонов)."""
+MSG_VARIABLES = DATE_VARIABLES + ("$username", "$message_text", "$chat_id", "$chat_name")
+"""Переменные, доступные в шаблонах сообщений (:func:`format_msg_text`)."""
+ORDER_VARIABLES = DATE_VARIABLES + ("$username", "$order_desc_and_params", "$order_desc_or_params", "$order_desc",
+                                    "$order_title", "$order_params", "$order_id", "$order_link", "$category_fullname",
+                                    "$category", "$game")
+"""Переменные, доступные в шаблонах заказов (:func:`format_order_text`)."""
+
+
+class MessageTemplate:
     """
-    Форматирует текст, подставляя значения переменных, доступных для MessageEvent.
+    Шаблон текста, разобранный на части: текст между переменными и сами переменные.
 
-    :param text: текст для форматирования.
-    :param obj: экземпляр types.Message или types.ChatShortcut.
+    :param text: текст шаблона.
+    :type text: :obj:`str`
 
-    :return: форматированый текст.
+    :param variables: доступные переменные.
+    :type variables: :obj:`tuple` of :obj:`str`
+    """
+    __slots__ = ("text", "parts", "variables")
+
+    def __init__(self, text: str, variables: tuple[str, ...]):
+        self.text: str = text
+        """Текст шаблона."""
+        # Более длинные переменные проверяются первыми ($date_text раньше $date)
+        pattern = re.compile("|".join(re.escape(i) for i in sorted(variables, key=len, reverse=True)))
+        parts = pattern.split(text)
+        names = pattern.findall(text)
+        self.parts: list[str] = [None] * (len(parts) + len(names))
+        """Части шаблона: на четных позициях - текст, на нечетных - названия переменных."""
+        self.parts[::2] = parts
+        self.parts[1::2] = names
+        self.variables: frozenset[str] = frozenset(names)
+        """Переменные, используемые в шаблоне."""
+
+    def render(self, values: dict[str, str]) -> str:
+        """
+        Подставляет значения переменных.
+
+        :param values: значения переменных, используемых в шаблоне.
+        :type values: :obj:`dict`
+
+        :return: форматированный текст.
+        :rtype: :obj:`str`
+        """
+        if not self.variables:
+            return self.text
+        result = self.parts.copy()
+        result[1::2] = [values[i] for i in self.parts[1::2]]
+        return "".join(result)
+
+
+@functools.lru_cache(maxsize=2048)
+def compile_template(text: str, variables: tuple[str, ...] = MSG_VARIABLES) -> MessageTemplate:
+    """
+    Разбирает шаблон (один раз для каждого текста: результат кэшируется).
+
+    :param text: текст шаблона.
+    :param variables: доступные переменные (MSG_VARIABLES / ORDER_VARIABLES).
+
+    :return: разобранный шаблон.
     """
-    date_obj = datetime.now()
-    month_name = get_month_name(date_obj.month)
-    date = date_obj.strftime("%d.%m.%Y")
-    str_date = f"{date_obj.day} {month_name}"
-    str_full_date = str_date + f" {date_obj.year} года"  # locale
+    return MessageTemplate(text, variables)
 
-    time_ = date_obj.strftime("%H:%M")
-    time_full = date_obj.strftime("%H:%M:%S")
 
-    username = obj.author if isinstance(obj, FunPayAPI.types.Message) else obj.name
-    chat_name = obj.chat_name if isinstance(obj, FunPayAPI.types.Message) else obj.name
-    chat_id = str(obj.chat_id) if isinstance(obj, FunPayAPI.types.Message) else str(obj.id)
+def date_variables(used: frozenset[str]) -> dict[str, str]:
+    """
+    Возвращает значения используемых переменных даты и времени.
 
+    :param used: переменные, используемые в шаблоне.
+
+    :return: {переменная: значение}.
+    """
+    if used.isdisjoint(DATE_VARIABLES):
+        return {}
+    d = datetime.now()
+    # f-строки вместо strftime: strftime в несколько раз медленнее
+    str_date = f"{d.day} {get_month_name(d.month)}"
     variables = {
-        "$full_date_text": str_full_date,
-        "$date_text": str_date,
-        "$date": date,
-        "$time": time_,
-        "$full_time": time_full,
-        "$username": safe_text(username),
-        "$message_text": str(obj),
-        "$chat_id": chat_id,
-        "$chat_name": safe_text(chat_name)
+        "$full_date_text": lambda: f"{str_date} {d.year} года",  # locale
+        "$date_text": lambda: str_date,
+        "$date": lambda: f"{d.day:02}.{d.month:02}.{d.year}",
+        "$time": lambda: f"{d.hour:02}:{d.minute:02}",
+        "$full_time": lambda: f"{d.hour:02}:{d.minute:02}:{d.second:02}"
     }
+    return {k: v() for k, v in variables.items() if k in used}
+
+
+def format_msg_text(text: str, obj: FunPayAPI.types.Message | FunPayAPI.types.ChatShortcut) -> str:
+    """
+    Форматирует текст, подставляя значения переменных, доступных для MessageEvent.
+    Вычисляются только переменные, которые есть в тексте.
 
-    for var in variables:
-        text = text.replace(var, variables[var])
-    return text
+    :param text: текст для форматирования.
+    :param obj: экземпляр types.Message или types.ChatShortcut.
+
+    :return: форматированый текст.
+    """
+    template = compile_template(text, MSG_VARIABLES)
+    used = template.variables
+    if not used:
+        return text
+    is_message = isinstance(obj, FunPayAPI.types.Message)
+    variables = date_variables(used)
+    if "$username" in used:
+        variables["$username"] = safe_text(obj.author if is_message else obj.name)
+    if "$message_text" in used:
+        variables["$message_text"] = str(obj)
+    if "$chat_id" in used:
+        variables["$chat_id"] = str(obj.chat_id) if is_message else str(obj.id)
+    if "$chat_name" in used:
+        variables["$chat_name"] = safe_text(obj.chat_name if is_message else obj.name)
+    return template.render(variables)
 
 
 def format_order_text(text: str, order: FunPayAPI.types.OrderShortcut | FunPayAPI.types.Order) -> str:
     """
     Форматирует текст, подставляя значения переменных, доступных для Order.
+    Вычисляются только переменные, которые есть в тексте.
 
     :param text: текст для форматирования.
     :param order: экземпляр Order.
 
     :return: форматированый текст.
     """
-    date_obj = datetime.now()
-    month_name = get_month_name(date_obj.month)
-    date = date_obj.strftime("%d.%m.%Y")
-    str_date = f"{date_obj.day} {month_name}"
-    str_full_date = str_date + f" {date_obj.year} года"  # locale
-    time_ = date_obj.strftime("%H:%M")
-    time_full = date_obj.strftime("%H:%M:%S")
-    game = subcategory_fullname = subcategory = ""
-    try:
-        if isinstance(order, FunPayAPI.types.OrderShortcut) and not order.subcategory:
-            game, subcategory = order.subcategory_name.rsplit(", ", 1)
-            subcategory_fullname = f"{subcategory} {game}"
-        else:
-            subcategory_fullname = order.subcategory.fullname
-            game = order.subcategory.category.name
-            subcategory = order.subcategory.name
-    except:
-        logger.warning("Произошла ошибка при парсинге игры из заказа")  # locale
-        logger.debug("TRACEBACK", exc_info=True)
-    description = order.description if isinstance(order,
-                                                  FunPayAPI.types.OrderShortcut) else order.short_description if order.short_description else ""
-    params = order.lot_params_text if isinstance(order, FunPayAPI.types.Order) and order.lot_params else ""
-    variables = {
-        "$full_date_text": str_full_date,
-        "$date_text": str_date,
-        "$date": date,
-        "$time": time_,
-        "$full_time": time_full,
-        "$username": safe_text(order.buyer_username),
-        "$order_desc_and_params": f"{description}, {params}" if description and params else f"{description}{params}",
-        "$order_desc_or_params": description if description else params,
-        "$order_desc": description,
-        "$order_title": description,
-        "$order_params": params,
-        "$order_id": order.id,
-        "$order_link": f"https://funpay.com/orders/{order.id}/",
-        "$category_fullname": subcategory_fullname,
-        "$category": subcategory,
-        "$game": game
-    }
-
-    for var in variables:
-        text = text.replace(var, variables[var])
-    return text
+    template = compile_template(text, ORDER_VARIABLES)
+    used = template.variables
+    if not used:
+        return text
+    variables = date_variables(used)
+    if "$username" in used:
+        variables["$username"] = safe_text(order.buyer_username)
+    if "$order_id" in used:
+        variables["$order_id"] = order.id
+    if "$order_link" in used:
+        variables["$order_link"] = f"https://funpay.com/orders/{order.id}/"
+
+    if not used.isdisjoint(("$category_fullname", "$category", "$game")):
+        game = subcategory_fullname = subcategory = ""
+        try:
+            if isinstance(order, FunPayAPI.types.OrderShortcut) and not order.subcategory:
+                game, subcategory = order.subcategory_name.rsplit(", ", 1)
+                subcategory_fullname = f"{subcategory} {game}"
+            else:
+                subcategory_fullname = order.subcategory.fullname
+                game = order.subcategory.category.name
+                subcategory = order.subcategory.name
+        except:
+            logger.warning("Произошла ошибка при парсинге игры из заказа")  # locale
+            logger.debug("TRACEBACK", exc_info=True)
+        variables.update({"$category_fullname": subcategory_fullname, "$category": subcategory, "$game": game})
+
+    if not used.isdisjoint(("$order_desc_and_params", "$order_desc_or_params", "$order_desc", "$order_title",
+                            "$order_params")):
+        description = order.description if isinstance(order, FunPayAPI.types.OrderShortcut) \
+            else order.short_description if order.short_description else ""
+        params = order.lot_params_text if isinstance(order, FunPayAPI.types.Order) and order.lot_params else ""
+        variables.update({
+            "$order_desc_and_params": f"{description}, {params}" if description and params
+            else f"{description}{params}",
+            "$order_desc_or_params": description if description else params,
+            "$order_desc": description,
+            "$order_title": description,
+            "$order_params": params
+        })
+    return template.render(variables)
+
+
+def precompile_templates(c: Cardinal) -> int:
+    """
+    Разбирает шаблоны из конфигов (приветствие, автоответы, автовыдача, ответы на отзывы и т.д.) заранее, чтобы
+    при обработке сообщений и заказов они брались из кэша :func:`compile_template`.
+
+    :param c: объект кардинала.
+
+    :return: кол-во разобранных шаблонов.
+    """
+    templates = [(c.MAIN_CFG["Greetings"].get("greetingsText", ""), MSG_VARIABLES),
+                 (c.MAIN_CFG["OrderConfirm"].get("replyText", ""), ORDER_VARIABLES)]
+    if c.MAIN_CFG.has_section("OrderReminders"):
+        templates.append((c.MAIN_CFG["OrderReminders"].get("template", ""), ORDER_VARIABLES))
+    templates.extend((text, ORDER_VARIABLES) for key, text in c.MAIN_CFG["ReviewReply"].items()
+                     if key.lower().startswith("star") and key.lower().endswith("replytext"))
+    for command in c.AR_CFG.sections():
+        templates.extend((c.AR_CFG[command][key], MSG_VARIABLES) for key in ("response", "notificationText")
+                         if c.AR_CFG[command].get(key))
+    templates.extend((c.AD_CFG[lot]["response"], ORDER_VARIABLES) for lot in c.AD_CFG.sections()
+                     if c.AD_CFG[lot].get("response"))
+    templates = [(text, variables) for text, variables in templates if text]
+    for text, variables in templates:
+        compile_template(text, variables)
+    return len(templates)
 
 
 def restart_program():
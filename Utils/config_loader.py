@@ -278,6 +278,14 @@ def load_main_config(config_path: str):
         "Other": {
             "watermark": "any+empty",
             "requestsDelay": [str(i) for i in range(1, 101)],
+            "adaptivePolling": ["0", "1"],
+            "minRequestsDelay": [str(i) for i in range(1, 101)],
+            "maxRequestsDelay": [str(i) for i in range(1, 301)],
+            "htmlParser": ["lxml", "bs4"],
+            "keepHTML": ["0", "1"],
+            "raiseJitter": [str(i) for i in range(0, 601)],
+            "raiseConcurrency": [str(i) for i in range(1, 9)],
+            "coalesceWindow": [str(i) for i in range(0, 5001)],
             "language": ["ru", "en", "uk"]
         }
     }
@@ -345,6 +353,38 @@ def load_main_config(config_path: str):
                 section_name]:
                 config.set("Greetings", "onlyNewChats", "0")
                 save_config(config, "configs/_main.cfg", encrypt_sensitive=False)
+            elif section_name == "Other" and param_name == "adaptivePolling" and param_name not in config[
+                section_name]:
+                config.set("Other", "adaptivePolling", "0")
+                save_config(config, "configs/_main.cfg", encrypt_sensitive=False)
+            elif section_name == "Other" and param_name == "minRequestsDelay" and param_name not in config[
+                section_name]:
+                config.set("Other", "minRequestsDelay", "1")
+                save_config(config, "configs/_main.cfg", encrypt_sensitive=False)
+            elif section_name == "Other" and param_name == "maxRequestsDelay" and param_name not in config[
+                section_name]:
+                config.set("Other", "maxRequestsDelay", "20")
+                save_config(config, "configs/_main.cfg", encrypt_sensitive=False)
+            elif section_name == "Other" and param_name == "htmlParser" and param_name not in config[
+                section_name]:
+                config.set("Other", "htmlParser", "bs4")
+                save_config(config, "configs/_main.cfg", encrypt_sensitive=False)
+            elif section_name == "Other" and param_name == "keepHTML" and param_name not in config[
+                section_name]:
+                config.set("Other", "keepHTML", "1")
+                save_config(config, "configs/_main.cfg", encrypt_sensitive=False)
+            elif section_name == "Other" and param_name == "raiseJitter" and param_name not in config[
+                section_name]:
+                config.set("Other", "raiseJitter", "10")
+                save_config(config, "configs/_main.cfg", encrypt_sensitive=False)
+            elif section_name == "Other" and param_name == "raiseConcurrency" and param_name not in config[
+                section_name]:
+                config.set("Other", "raiseConcurrency", "1")
+                save_config(config, "configs/_main.cfg", encrypt_sensitive=False)
+            elif section_name == "Other" and param_name == "coalesceWindow" and param_name not in config[
+                section_name]:
+                config.set("Other", "coalesceWindow", "0")
+                save_config(config, "configs/_main.cfg", encrypt_sensitive=False)
 
             # END OF UPDATE
 
@@ -358,6 +398,51 @@ def load_main_config(config_path: str):
             config.set("OrderReminders", "interval", "30")
             save_config(config, "configs/_main.cfg", encrypt_sensitive=False)
 
+        if "RateLimits" not in config.sections():
+            config.add_section("RateLimits")
+            config.set("RateLimits", "runner", "60")
+            config.set("RateLimits", "chat", "60")
+            config.set("RateLimits", "orders", "60")
+            config.set("RateLimits", "lots", "60")
+            config.set("RateLimits", "other", "120")
+            config.set("RateLimits", "burst", "3")
+            save_config(config, "configs/_main.cfg", encrypt_sensitive=False)
+
+        if "EventDispatcher" not in config.sections():
+            config.add_section("EventDispatcher")
+            config.set("EventDispatcher", "enabled", "0")
+            config.set("EventDispatcher", "workers", "4")
+            config.set("EventDispatcher", "queueSize", "100")
+            config.set("EventDispatcher", "handlerTimeout", "60")
+            save_config(config, "configs/_main.cfg", encrypt_sensitive=False)
+
+        if "HandlerStats" not in config.sections():
+            config.add_section("HandlerStats")
+            config.set("HandlerStats", "enabled", "0")
+            config.set("HandlerStats", "logInterval", "60")
+            save_config(config, "configs/_main.cfg", encrypt_sensitive=False)
+
+        if "Executors" not in config.sections():
+            config.add_section("Executors")
+            config.set("Executors", "funpayWorkers", "4")
+            config.set("Executors", "telegramWorkers", "4")
+            config.set("Executors", "sendWorkers", "4")
+            save_config(config, "configs/_main.cfg", encrypt_sensitive=False)
+
+        if "RunnerState" not in config.sections():
+            config.add_section("RunnerState")
+            config.set("RunnerState", "enabled", "0")
+            config.set("RunnerState", "saveInterval", "10")
+            config.set("RunnerState", "maxAge", "24")
+            save_config(config, "configs/_main.cfg", encrypt_sensitive=False)
+
+        if "OrderCache" not in config.sections():
+            config.add_section("OrderCache")
+            config.set("OrderCache", "paidTTL", "30")
+            config.set("OrderCache", "closedTTL", "3600")
+            config.set("OrderCache", "maxSize", "500")
+            save_config(config, "configs/_main.cfg", encrypt_sensitive=False)
+
         # END OF UPDATE
 
             try:
@@ -0,0 +1,238 @@
+"""
+В данном модуле описан пул потоков для обработки событий Runner'а.
+"""
+from __future__ import annotations
+from typing import Callable, Hashable, Any
+
+from collections import deque
+import threading
+import logging
+import time
+
+logger = logging.getLogger("FPS.event_dispatcher")
+
+
+class _WorkerState:
+    """
+    Состояние потока-обработчика (для сторожевого потока).
+    """
+    __slots__ = ("handler", "key", "started", "detached")
+
+    def __init__(self):
+        self.handler: Callable | None = None
+        self.key: Hashable | None = None
+        self.started: float = 0
+        self.detached: bool = False
+
+
+class EventDispatcher:
+    """
+    Пул потоков для выполнения хэндлеров событий.
+
+    События с одинаковым ключом (например, ID чата или заказа) обрабатываются строго по очереди и в порядке
+    поступления, события с разными ключами - параллельно.
+
+    Если в очереди уже `queue_size` событий, :meth:`Utils.event_dispatcher.EventDispatcher.submit` блокируется до
+    освобождения места, поэтому Runner не опрашивает FunPay быстрее, чем успевают обрабатываться события.
+
+    Хэндлер, который выполняется дольше `handler_timeout` секунд, не может быть прерван, но его поток исключается
+    из пула и заменяется новым: остальные ключи продолжают обрабатываться, а события того же ключа ждут завершения
+    хэндлера (порядок не нарушается).
+
+    :param execute: функция, выполняющая один хэндлер: execute(handler, args).
+    :type execute: :obj:`Callable`
+
+    :param workers: кол-во потоков.
+    :type workers: :obj:`int`
+
+    :param queue_size: максимальное кол-во ожидающих событий.
+    :type queue_size: :obj:`int`
+
+    :param handler_timeout: время (сек), после которого хэндлер считается зависшим. 0 - без ограничения.
+    :type handler_timeout: :obj:`float`
+    """
+
+    def __init__(self, execute: Callable[[Callable, tuple], Any], workers: int = 4, queue_size: int = 100,
+                 handler_timeout: float = 60):
+        self.execute: Callable[[Callable, tuple], Any] = execute
+        """Функция, выполняющая один хэндлер."""
+        self.workers: int = max(1, workers)
+        """Кол-во потоков."""
+        self.queue_size: int = max(1, queue_size)
+        """Максимальное кол-во ожидающих событий."""
+        self.handler_timeout: float = handler_timeout
+        """Время (сек), после которого хэндлер считается зависшим."""
+        self.timeouts: int = 0
+        """Кол-во хэндлеров, превысивших handler_timeout."""
+
+        self.__cond = threading.Condition()
+        self.__queues: dict[Hashable, deque[tuple[list[Callable], tuple, int]]] = {}
+        self.__ready: deque[Hashable] = deque()
+        self.__pending = 0
+        self.__submitted = 0
+        self.__unfinished: set[int] = set()
+        self.__states: list[_WorkerState] = []
+        self.__counter = 0
+        self.__running = False
+
+    @property
+    def pending(self) -> int:
+        """
+        Кол-во событий, ожидающих обработки или обрабатываемых в данный момент.
+        """
+        return self.__pending
+
+    @property
+    def submitted(self) -> int:
+        """
+        Порядковый номер последнего принятого события.
+        """
+        return self.__submitted
+
+    @property
+    def processed(self) -> int:
+        """
+        Порядковый номер, до которого (включительно) все принятые события обработаны.
+        События с разными ключами обрабатываются параллельно, поэтому некоторые события с большими номерами
+        также могут быть уже обработаны.
+        """
+        with self.__cond:
+            return min(self.__unfinished) - 1 if self.__unfinished else self.__submitted
+
+    @property
+    def running(self) -> bool:
+        """
+        Запущен ли пул.
+        """
+        return self.__running
+
+    def start(self):
+        """
+        Запускает потоки пула и сторожевой поток.
+        """
+        with self.__cond:
+            if self.__running:
+                return
+            self.__running = True
+            # потоки, оставшиеся от предыдущего запуска, продолжают работать
+            for _ in range(self.workers - sum(1 for s in self.__states if not s.detached)):
+                self.__spawn_worker()
+        if self.handler_timeout > 0:
+            threading.Thread(target=self.__watchdog, daemon=True, name="FPS-events-watchdog").start()
+
+    def stop(self, wait: bool = True, timeout: float | None = None) -> bool:
+        """
+        Останавливает пул. Новые события не принимаются.
+
+        :param wait: дождаться ли обработки уже принятых событий.
+        :type wait: :obj:`bool`, опционально
+
+        :param timeout: максимальное время ожидания (сек).
+        :type timeout: :obj:`float` or :obj:`None`, опционально
+
+        :return: `True`, если все принятые события обработаны.
+        :rtype: :obj:`bool`
+        """
+        with self.__cond:
+            self.__running = False
+            self.__cond.notify_all()
+            if wait:
+                self.__cond.wait_for(lambda: not self.__pending, timeout)
+            return not self.__pending
+
+    def submit(self, key: Hashable, handlers: list[Callable], args: tuple) -> bool:
+        """
+        Ставит событие в очередь его ключа. Блокируется, если очередь переполнена.
+
+        :param key: ключ упорядочивания (события с одним ключом выполняются последовательно).
+        :type key: :obj:`Hashable`
+
+        :param handlers: список хэндлеров.
+        :type handlers: :obj:`list` of :obj:`Callable`
+
+        :param args: аргументы для хэндлеров.
+        :type args: :obj:`tuple`
+
+        :return: `True`, если событие принято, `False`, если пул остановлен.
+        :rtype: :obj:`bool`
+        """
+        with self.__cond:
+            self.__cond.wait_for(lambda: not self.__running or self.__pending < self.queue_size)
+            if not self.__running:
+                return False
+            if key not in self.__queues:
+                self.__queues[key] = deque()
+                self.__ready.append(key)
+            self.__submitted += 1
+            self.__unfinished.add(self.__submitted)
+            self.__queues[key].append((handlers, args, self.__submitted))
+            self.__pending += 1
+            self.__cond.notify_all()
+            return True
+
+    def stats(self) -> dict[str, int]:
+        """
+        Возвращает состояние пула.
+
+        :return: {"pending": ..., "keys": ..., "busy": ..., "workers": ..., "timeouts": ...}
+        :rtype: :obj:`dict`
+        """
+        with self.__cond:
+            return {"pending": self.__pending, "keys": len(self.__queues),
+                    "busy": sum(1 for s in self.__states if s.handler is not None and not s.detached),
+                    "workers": sum(1 for s in self.__states if not s.detached), "timeouts": self.timeouts}
+
+    def __spawn_worker(self):
+        state = _WorkerState()
+        self.__states.append(state)
+        self.__counter += 1
+        threading.Thread(target=self.__worker, args=(state,), daemon=True,
+                         name=f"FPS-events-{self.__counter}").start()
+
+    def __worker(self, state: _WorkerState):
+        while True:
+            with self.__cond:
+                self.__cond.wait_for(lambda: self.__ready or (not self.__running and not self.__pending))
+                if not self.__ready:
+                    self.__states.remove(state)
+                    return
+                key = self.__ready.popleft()
+                handlers, args, number = self.__queues[key].popleft()
+                state.key = key
+
+            for handler in handlers:
+                state.handler, state.started = handler, time.monotonic()
+                try:
+                    self.execute(handler, args)
+                except:
+                    logger.error("Произошла ошибка при выполнении хэндлера.")  # locale
+                    logger.debug("TRACEBACK", exc_info=True)
+            state.handler = None
+
+            with self.__cond:
+                if self.__queues[key]:
+                    self.__ready.append(key)
+                else:
+                    del self.__queues[key]
+                self.__unfinished.discard(number)
+                self.__pending -= 1
+                self.__cond.notify_all()
+                if state.detached:
+                    self.__states.remove(state)
+                    return
+
+    def __watchdog(self):
+        while self.__running or self.__pending:
+            time.sleep(min(1.0, self.handler_timeout))
+            now = time.monotonic()
+            with self.__cond:
+                for state in list(self.__states):
+                    handler = state.handler
+                    if handler is None or state.detached or now - state.started < self.handler_timeout:
+                        continue
+                    state.detached = True
+                    self.timeouts += 1
+                    name = getattr(handler, "__name__", str(handler))
+                    logger.warning(f"Хэндлер {name} выполняется дольше {self.handler_timeout} сек. "
+                                   f"(ключ {state.key}). Поток исключен из пула.")  # locale
+                    self.__spawn_worker()
@@ -0,0 +1,123 @@
+"""
+В данном модуле описан пул потоков для фоновых задач хэндлеров (отправка сообщений на FunPay, уведомлений в Telegram).
+"""
+from __future__ import annotations
+from typing import Callable
+
+from concurrent.futures import ThreadPoolExecutor, Future, wait
+import threading
+import logging
+import time
+
+logger = logging.getLogger("FPS.executors")
+
+
+class ManagedExecutor:
+    """
+    Пул потоков фиксированного размера с метриками очереди и корректной остановкой.
+
+    Исключения задач логируются (как и при запуске в отдельном :class:`threading.Thread`).
+
+    :param name: название пула (префикс имен потоков).
+    :type name: :obj:`str`
+
+    :param workers: кол-во потоков.
+    :type workers: :obj:`int`
+    """
+
+    def __init__(self, name: str, workers: int = 4):
+        self.name: str = name
+        """Название пула."""
+        self.workers: int = max(1, workers)
+        """Кол-во потоков."""
+        self.__executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=name)
+        self.__lock = threading.Lock()
+        self.__futures: set[Future] = set()
+        self.__submitted = 0
+        self.__started = 0
+        self.__completed = 0
+        self.__failed = 0
+        self.__wait_total = 0.0
+        self.__wait_max = 0.0
+        self.__closed = False
+
+    @property
+    def closed(self) -> bool:
+        """
+        Остановлен ли пул (см. :meth:`shutdown`).
+        """
+        return self.__closed
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future | None:
+        """
+        Ставит задачу в очередь пула.
+
+        :param func: функция.
+        :type func: :obj:`Callable`
+
+        :return: объект Future или `None`, если пул уже остановлен.
+        :rtype: :class:`concurrent.futures.Future` or :obj:`None`
+        """
+        with self.__lock:
+            if self.__closed:
+                logger.warning(f"Пул {self.name} остановлен, задача {getattr(func, '__name__', func)} "
+                               f"не будет выполнена.")  # locale
+                return None
+            self.__submitted += 1
+            future = self.__executor.submit(self.__run, func, time.monotonic(), args, kwargs)
+            self.__futures.add(future)
+        future.add_done_callback(self.__discard)
+        return future
+
+    def __discard(self, future: Future):
+        with self.__lock:
+            self.__futures.discard(future)
+
+    def __run(self, func: Callable, submitted_at: float, args: tuple, kwargs: dict):
+        waited = time.monotonic() - submitted_at
+        with self.__lock:
+            self.__started += 1
+            self.__wait_total += waited
+            self.__wait_max = max(self.__wait_max, waited)
+        try:
+            return func(*args, **kwargs)
+        except:
+            with self.__lock:
+                self.__failed += 1
+            logger.error(f"Произошла ошибка при выполнении задачи {getattr(func, '__name__', func)} "
+                         f"в пуле {self.name}.")  # locale
+            logger.debug("TRACEBACK", exc_info=True)
+        finally:
+            with self.__lock:
+                self.__completed += 1
+
+    def stats(self) -> dict[str, int | float]:
+        """
+        Возвращает метрики пула.
+
+        :return: {"workers": ..., "queued": ..., "active": ..., "completed": ..., "failed": ...,
+            "avg_wait": ..., "max_wait": ...}
+        :rtype: :obj:`dict`
+        """
+        with self.__lock:
+            return {"workers": self.workers, "queued": self.__submitted - self.__started,
+                    "active": self.__started - self.__completed, "completed": self.__completed,
+                    "failed": self.__failed, "avg_wait": round(self.__wait_total / (self.__started or 1), 3),
+                    "max_wait": round(self.__wait_max, 3)}
+
+    def shutdown(self, timeout: float | None = None) -> bool:
+        """
+        Останавливает пул: новые задачи не принимаются, уже поставленные выполняются.
+
+        :param timeout: максимальное время ожидания выполнения поставленных задач (сек).
+        :type timeout: :obj:`float` or :obj:`None`, опционально
+
+        :return: `True`, если все задачи выполнены.
+        :rtype: :obj:`bool`
+        """
+        with self.__lock:
+            self.__closed = True
+            futures = set(self.__futures)
+        _, not_done = wait(futures, timeout)
+        self.__executor.shutdown(wait=False)
+        return not not_done
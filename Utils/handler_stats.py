@@ -0,0 +1,140 @@
+"""
+В данном модуле описан сборщик статистики времени выполнения хэндлеров.
+"""
+from __future__ import annotations
+from typing import Literal
+
+from collections import deque
+import threading
+
+
+class HandlerMetric:
+    """
+    Накопленная статистика одной группы (хэндлера, плагина или типа события).
+
+    :param samples: сколько последних замеров хранить для расчета перцентилей.
+    :type samples: :obj:`int`
+    """
+    __slots__ = ("count", "total", "max", "errors", "samples")
+
+    def __init__(self, samples: int):
+        self.count: int = 0
+        """Кол-во вызовов."""
+        self.total: float = 0
+        """Суммарное время выполнения (сек)."""
+        self.max: float = 0
+        """Максимальное время выполнения (сек)."""
+        self.errors: int = 0
+        """Кол-во вызовов, завершившихся исключением."""
+        self.samples: deque[float] = deque(maxlen=samples)
+        """Последние замеры (сек)."""
+
+    def add(self, duration: float, error: bool):
+        self.count += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+        if error:
+            self.errors += 1
+        self.samples.append(duration)
+
+    def percentile(self, p: float) -> float:
+        """
+        Возвращает перцентиль по последним замерам.
+
+        :param p: перцентиль (0-100).
+        :type p: :obj:`float`
+
+        :rtype: :obj:`float`
+        """
+        if not self.samples:
+            return 0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+
+class HandlerStats:
+    """
+    Сборщик статистики времени выполнения хэндлеров: по каждому хэндлеру, по каждому плагину (UUID) и по каждому
+    типу события.
+
+    :param samples: сколько последних замеров хранить для расчета перцентилей (для каждой группы).
+    :type samples: :obj:`int`, опционально
+    """
+
+    def __init__(self, samples: int = 500):
+        self.samples: int = samples
+        """Сколько последних замеров хранить для расчета перцентилей."""
+        self.__lock = threading.Lock()
+        self.__groups: dict[str, dict[str, HandlerMetric]] = {"handler": {}, "plugin": {}, "event": {}}
+
+    def record(self, handler: str, plugin_uuid: str | None, event_type: str, duration: float, error: bool = False):
+        """
+        Добавляет замер.
+
+        :param handler: название хэндлера.
+        :type handler: :obj:`str`
+
+        :param plugin_uuid: UUID плагина, которому принадлежит хэндлер (`None` для встроенных хэндлеров).
+        :type plugin_uuid: :obj:`str` or :obj:`None`
+
+        :param event_type: тип события.
+        :type event_type: :obj:`str`
+
+        :param duration: время выполнения (сек).
+        :type duration: :obj:`float`
+
+        :param error: завершился ли хэндлер исключением.
+        :type error: :obj:`bool`, опционально
+        """
+        with self.__lock:
+            for group, key in (("handler", handler), ("plugin", plugin_uuid or "builtin"), ("event", event_type)):
+                metrics = self.__groups[group]
+                if (metric := metrics.get(key)) is None:
+                    metric = metrics[key] = HandlerMetric(self.samples)
+                metric.add(duration, error)
+
+    def snapshot(self, group: Literal["handler", "plugin", "event"]) -> list[dict]:
+        """
+        Возвращает статистику группы, отсортированную по суммарному времени выполнения.
+
+        :param group: группа (`handler`, `plugin` или `event`).
+        :type group: :obj:`str`
+
+        :return: [{"name": ..., "count": ..., "total": ..., "p50": ..., "p95": ..., "max": ..., "errors": ...}]
+        :rtype: :obj:`list` of :obj:`dict`
+        """
+        with self.__lock:
+            result = [{"name": k, "count": v.count, "total": v.total, "p50": v.percentile(50),
+                       "p95": v.percentile(95), "max": v.max, "errors": v.errors}
+                      for k, v in self.__groups[group].items()]
+        return sorted(result, key=lambda x: x["total"], reverse=True)
+
+    def reset(self):
+        """
+        Сбрасывает всю статистику.
+        """
+        with self.__lock:
+            for metrics in self.__groups.values():
+                metrics.clear()
+
+    @staticmethod
+    def format_rows(rows: list[dict], limit: int | None = None, names: dict[str, str] | None = None) -> list[str]:
+        """
+        Форматирует строки статистики: `название: n=..., sum=...s, p50=...ms, p95=...ms, max=...ms, err=...`.
+
+        :param rows: строки из :meth:`Utils.handler_stats.HandlerStats.snapshot`.
+        :type rows: :obj:`list` of :obj:`dict`
+
+        :param limit: максимальное кол-во строк.
+        :type limit: :obj:`int` or :obj:`None`, опционально
+
+        :param names: отображаемые названия {ключ: название} (например, названия плагинов по UUID).
+        :type names: :obj:`dict` or :obj:`None`, опционально
+
+        :rtype: :obj:`list` of :obj:`str`
+        """
+        names = names or {}
+        return [f"{names.get(r['name'], r['name'])}: n={r['count']}, sum={r['total']:.2f}s, "
+                f"p50={r['p50'] * 1000:.0f}ms, p95={r['p95'] * 1000:.0f}ms, max={r['max'] * 1000:.0f}ms, "
+                f"err={r['errors']}" for r in rows[:limit]]
@@ -0,0 +1,125 @@
+"""
+В данном модуле описан общий кэш полной информации о заказах (FunPayAPI.types.Order).
+"""
+from __future__ import annotations
+from typing import Callable
+
+import threading
+import time
+
+from FunPayAPI.common.bounded import BoundedDict
+from FunPayAPI.common.enums import OrderStatuses
+from FunPayAPI import types
+
+
+class OrderCache:
+    """
+    Потокобезопасный кэш заказов с временем жизни, зависящим от статуса заказа.
+
+    Одновременные запросы одного и того же заказа объединяются: заказ запрашивается один раз, остальные потоки
+    ждут результата этого запроса.
+
+    :param paid_ttl: время жизни (сек) оплаченного (не закрытого) заказа.
+    :type paid_ttl: :obj:`float`
+
+    :param closed_ttl: время жизни (сек) закрытого заказа или заказа с возвратом.
+    :type closed_ttl: :obj:`float`
+
+    :param maxsize: максимальное кол-во заказов в кэше.
+    :type maxsize: :obj:`int`
+    """
+
+    def __init__(self, paid_ttl: float = 30, closed_ttl: float = 3600, maxsize: int = 500):
+        self.ttl: dict[OrderStatuses, float] = {OrderStatuses.PAID: paid_ttl, OrderStatuses.CLOSED: closed_ttl,
+                                                OrderStatuses.REFUNDED: closed_ttl}
+        """Время жизни заказа в кэше в зависимости от его статуса."""
+        self.hits: int = 0
+        """Кол-во заказов, взятых из кэша."""
+        self.misses: int = 0
+        """Кол-во запросов заказов к FunPay."""
+        self.coalesced: int = 0
+        """Кол-во обращений, дождавшихся уже выполняющегося запроса того же заказа."""
+        self.__orders: BoundedDict[str, tuple[types.Order, float]] = BoundedDict(maxsize)
+        self.__in_flight: dict[str, tuple[threading.Event, list[types.Order | None]]] = {}
+        self.__lock = threading.Lock()
+
+    def get(self, order_id: str, fetch: Callable[[str], types.Order | None],
+            expected_status: OrderStatuses | None = None, force: bool = False) -> types.Order | None:
+        """
+        Возвращает заказ из кэша или получает его с помощью `fetch`.
+
+        :param order_id: ID заказа.
+        :type order_id: :obj:`str`
+
+        :param fetch: функция, получающая заказ с FunPay (возвращает `None` или возбуждает исключение при ошибке).
+        :type fetch: :obj:`Callable`
+
+        :param expected_status: известный статус заказа. Если статус заказа в кэше отличается, заказ запрашивается
+            заново.
+        :type expected_status: :class:`FunPayAPI.common.enums.OrderStatuses` or :obj:`None`, опционально
+
+        :param force: запросить заказ заново, даже если он есть в кэше.
+        :type force: :obj:`bool`, опционально
+
+        :return: заказ или `None`, если получить его не удалось.
+        :rtype: :class:`FunPayAPI.types.Order` or :obj:`None`
+        """
+        with self.__lock:
+            cached = self.__orders.get(order_id)
+            if cached is not None and not force and cached[1] > time.monotonic() and \
+                    (expected_status is None or cached[0].status == expected_status):
+                self.hits += 1
+                return cached[0]
+            if (in_flight := self.__in_flight.get(order_id)) is not None:
+                self.coalesced += 1
+                owner = False
+            else:
+                in_flight = self.__in_flight[order_id] = (threading.Event(), [None])
+                self.misses += 1
+                owner = True
+
+        event, result = in_flight
+        if not owner:
+            event.wait()
+            return result[0]
+
+        try:
+            order = fetch(order_id)
+            result[0] = order
+            if order is not None:
+                with self.__lock:
+                    self.__orders[order_id] = (order, time.monotonic() + self.ttl.get(order.status, 0))
+            return order
+        finally:
+            with self.__lock:
+                del self.__in_flight[order_id]
+            event.set()
+
+    def put(self, order: types.Order):
+        """
+        Добавляет (обновляет) заказ в кэше.
+
+        :param order: заказ.
+        :type order: :class:`FunPayAPI.types.Order`
+        """
+        with self.__lock:
+            self.__orders[order.id] = (order, time.monotonic() + self.ttl.get(order.status, 0))
+
+    def invalidate(self, order_id: str):
+        """
+        Удаляет заказ из кэша.
+
+        :param order_id: ID заказа.
+        :type order_id: :obj:`str`
+        """
+        with self.__lock:
+            self.__orders.pop(order_id, None)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Возвращает метрики кэша.
+
+        :return: {"size": ..., "hits": ..., "misses": ..., "coalesced": ...}
+        :rtype: :obj:`dict`
+        """
+        return {"size": len(self.__orders), "hits": self.hits, "misses": self.misses, "coalesced": self.coalesced}
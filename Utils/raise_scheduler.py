@@ -0,0 +1,272 @@
+"""
+В данном модуле описан планировщик автоподнятия лотов (очередь категорий по времени следующего поднятия).
+"""
+from __future__ import annotations
+
+import threading
+import logging
+import random
+import heapq
+import json
+import time
+import os
+
+logger = logging.getLogger("FPS.raise_scheduler")
+
+
+class RaiseStats:
+    """
+    Статистика поднятий лотов одной категории.
+    """
+    __slots__ = ("attempts", "raised", "waits", "errors", "last_latency", "total_latency")
+
+    def __init__(self):
+        self.attempts: int = 0
+        """Кол-во запросов на поднятие."""
+        self.raised: int = 0
+        """Кол-во успешных поднятий."""
+        self.waits: int = 0
+        """Кол-во ответов "подождите" (поднимать еще рано)."""
+        self.errors: int = 0
+        """Кол-во ошибок."""
+        self.last_latency: float = 0
+        """Время выполнения последнего запроса (сек)."""
+        self.total_latency: float = 0
+        """Суммарное время выполнения запросов (сек)."""
+
+    @property
+    def success_rate(self) -> float:
+        """
+        Доля успешных поднятий среди запросов, завершившихся поднятием или ошибкой (ответы "подождите" не учитываются).
+        """
+        return self.raised / (self.raised + self.errors) if self.raised + self.errors else 1.0
+
+    @property
+    def avg_latency(self) -> float:
+        """
+        Среднее время выполнения запроса (сек).
+        """
+        return self.total_latency / self.attempts if self.attempts else 0.0
+
+
+class RaiseScheduler:
+    """
+    Очередь с приоритетом (куча) категорий (игр) по времени, когда их лоты можно поднять.
+
+    Расписание (время следующего поднятия, время последнего поднятия и интервал между поднятиями для каждой
+    категории) сохраняется в файл (:meth:`save`) и переживает перезапуск.
+
+    :param path: путь до файла расписания.
+    :type path: :obj:`str`
+
+    :param jitter: максимальная случайная добавка (сек) ко времени, полученному от FunPay.
+    :type jitter: :obj:`float`, опционально
+    """
+
+    DEFAULT_INTERVAL: float = 3600
+    """Интервал между поднятиями (сек), пока FunPay не сообщил реальный: поднятие раньше срока лишь тратит запрос."""
+
+    def __init__(self, path: str, jitter: float = 10):
+        self.path: str = path
+        """Путь до файла расписания."""
+        self.jitter: float = max(0.0, jitter)
+        """Максимальная случайная добавка (сек) ко времени, полученному от FunPay."""
+        self.next_times: dict[int, float] = {}
+        """Время следующего поднятия {ID категории: timestamp}."""
+        self.raised_times: dict[int, float] = {}
+        """Время последнего поднятия {ID категории: timestamp}."""
+        self.intervals: dict[int, float] = {}
+        """Интервал между поднятиями, сообщенный FunPay {ID категории: сек}."""
+        self.stats: dict[int, RaiseStats] = {}
+        """Статистика поднятий за время работы {ID категории: статистика}."""
+        self.__heap: list[tuple[float, int]] = []
+        self.__lock = threading.RLock()
+        self.__wakeup = threading.Event()
+
+    def load(self):
+        """
+        Загружает расписание из файла.
+        """
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.warning(f"Не удалось загрузить расписание поднятия лотов из {self.path}: {e}")  # locale
+            return
+        with self.__lock:
+            self.raised_times = {int(k): v for k, v in data.get("raised", {}).items()}
+            self.intervals = {int(k): v for k, v in data.get("intervals", {}).items()}
+            for k, v in data.get("next", {}).items():
+                self.schedule(int(k), v, save=False)
+
+    def save(self):
+        """
+        Сохраняет расписание в файл (атомарно: через временный файл).
+        """
+        with self.__lock:
+            data = {"next": self.next_times, "raised": self.raised_times, "intervals": self.intervals}
+            tmp_path = f"{self.path}.tmp"
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, separators=(",", ":"))
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                logger.warning(f"Не удалось сохранить расписание поднятия лотов в {self.path}: {e}")  # locale
+
+    def sync(self, category_ids: list[int]):
+        """
+        Синхронизирует расписание со списком категорий, в которых есть лоты: новые категории становятся доступны
+        для поднятия сразу, исчезнувшие удаляются из расписания.
+
+        :param category_ids: ID категорий.
+        :type category_ids: :obj:`list` of :obj:`int`
+        """
+        with self.__lock:
+            category_ids = set(category_ids)
+            now = time.time()
+            for category_id in category_ids - self.next_times.keys():
+                self.schedule(category_id, now, save=False)
+            for category_id in self.next_times.keys() - category_ids:
+                del self.next_times[category_id]
+
+    def schedule(self, category_id: int, when: float, jitter: bool = False, save: bool = True):
+        """
+        Устанавливает время следующего поднятия категории.
+
+        :param category_id: ID категории.
+        :type category_id: :obj:`int`
+
+        :param when: timestamp.
+        :type when: :obj:`float`
+
+        :param jitter: добавить ли случайную задержку (до :py:obj:`.RaiseScheduler.jitter` сек).
+        :type jitter: :obj:`bool`, опционально
+
+        :param save: сохранить ли расписание в файл.
+        :type save: :obj:`bool`, опционально
+        """
+        if jitter and self.jitter:
+            when += random.uniform(0, self.jitter)
+        with self.__lock:
+            self.next_times[category_id] = when
+            heapq.heappush(self.__heap, (when, category_id))
+            if save:
+                self.save()
+
+    def mark_raised(self, category_id: int) -> float | None:
+        """
+        Запоминает время поднятия категории.
+
+        :param category_id: ID категории.
+        :type category_id: :obj:`int`
+
+        :return: время предыдущего поднятия или `None`.
+        :rtype: :obj:`float` or :obj:`None`
+        """
+        with self.__lock:
+            last_time = self.raised_times.get(category_id)
+            self.raised_times[category_id] = time.time()
+            return last_time
+
+    def set_wait_time(self, category_id: int, wait_time: float):
+        """
+        Планирует следующее поднятие категории по времени ожидания, полученному от FunPay, и запоминает интервал
+        между поднятиями.
+
+        :param category_id: ID категории.
+        :type category_id: :obj:`int`
+
+        :param wait_time: время ожидания (сек).
+        :type wait_time: :obj:`float`
+        """
+        now = time.time()
+        with self.__lock:
+            if (raised := self.raised_times.get(category_id)) is not None:
+                self.intervals[category_id] = now + wait_time - raised
+            self.schedule(category_id, now + wait_time, jitter=True, save=False)
+
+    def schedule_after_raise(self, category_id: int):
+        """
+        Планирует следующее поднятие категории после успешного поднятия: через известный интервал между
+        поднятиями или через :py:obj:`.RaiseScheduler.DEFAULT_INTERVAL`, если интервал еще не известен (если FunPay
+        ответит, что еще рано, время и интервал будут уточнены по его ответу).
+
+        :param category_id: ID категории.
+        :type category_id: :obj:`int`
+        """
+        interval = self.intervals.get(category_id) or self.DEFAULT_INTERVAL
+        self.schedule(category_id, time.time() + interval, jitter=True, save=False)
+
+    def record(self, category_id: int, latency: float, result: str):
+        """
+        Добавляет результат запроса на поднятие в статистику.
+
+        :param category_id: ID категории.
+        :type category_id: :obj:`int`
+
+        :param latency: время выполнения запроса (сек).
+        :type latency: :obj:`float`
+
+        :param result: `raised`, `wait` или `error`.
+        :type result: :obj:`str`
+        """
+        with self.__lock:
+            if (stats := self.stats.get(category_id)) is None:
+                stats = self.stats[category_id] = RaiseStats()
+            stats.attempts += 1
+            stats.last_latency = latency
+            stats.total_latency += latency
+            if result == "raised":
+                stats.raised += 1
+            elif result == "wait":
+                stats.waits += 1
+            else:
+                stats.errors += 1
+
+    def pop_due(self, now: float | None = None) -> list[int]:
+        """
+        Извлекает из очереди категории, время поднятия которых уже настало.
+
+        :return: ID категорий в порядке времени поднятия.
+        :rtype: :obj:`list` of :obj:`int`
+        """
+        now = now or time.time()
+        due = []
+        with self.__lock:
+            while self.__heap and self.__heap[0][0] <= now:
+                when, category_id = heapq.heappop(self.__heap)
+                # Запись устарела (категория перепланирована или удалена)
+                if self.next_times.get(category_id) != when or category_id in due:
+                    continue
+                due.append(category_id)
+        return due
+
+    def next_time(self) -> float | None:
+        """
+        Возвращает ближайшее время поднятия.
+
+        :rtype: :obj:`float` or :obj:`None`
+        """
+        with self.__lock:
+            while self.__heap and self.next_times.get(self.__heap[0][1]) != self.__heap[0][0]:
+                heapq.heappop(self.__heap)
+            return self.__heap[0][0] if self.__heap else None
+
+    def wait(self, timeout: float | None):
+        """
+        Ждет до `timeout` секунд или до вызова :meth:`wake`.
+
+        :param timeout: максимальное время ожидания (сек).
+        :type timeout: :obj:`float` or :obj:`None`
+        """
+        self.__wakeup.wait(timeout)
+        self.__wakeup.clear()
+
+    def wake(self):
+        """
+        Прерывает ожидание :meth:`wait` (например, после обновления списка лотов).
+        """
+        self.__wakeup.set()
@@ -0,0 +1,424 @@
+"""
+В данном модуле описан конвейер отправки сообщений на FunPay: очереди сообщений по чатам (с объединением соседних
+текстовых сообщений), отложенные без блокировки потоков паузы ($sleep) и повторы, кэш ID выгруженных изображений.
+"""
+from __future__ import annotations
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from FunPayAPI.account import Account
+    from FunPayAPI import types
+
+from concurrent.futures import Future
+from collections import deque
+import threading
+import itertools
+import hashlib
+import logging
+import heapq
+import time
+
+from FunPayAPI.account import FLOOD_PAUSE
+from FunPayAPI.common.bounded import BoundedDict
+from locales.localizer import Localizer
+from Utils.executors import ManagedExecutor
+
+logger = logging.getLogger("FPS.send_pipeline")
+localizer = Localizer()
+_ = localizer.translate
+
+
+class SendJob:
+    """
+    Сообщение (набор сущностей: текстов, изображений, пауз), ожидающее отправки в чат.
+    """
+    __slots__ = ("chat_id", "entities", "chat_name", "interlocutor_id", "attempts", "attempts_left", "flags",
+                 "coalesce", "text", "watermark", "index", "result", "future", "merged", "submitted", "waited")
+
+    def __init__(self, chat_id: int | str, entities: list[str | int | float | bytes], chat_name: str | None,
+                 interlocutor_id: int | None, attempts: int, flags: tuple[bool, bool, bool], coalesce: bool = False,
+                 text: str | None = None, watermark: bool = False):
+        self.chat_id: int | str = chat_id
+        """ID чата."""
+        self.entities: list[str | int | float | bytes] = entities
+        """Тексты (:obj:`str`), ID изображений (:obj:`int`) / изображения (:obj:`bytes`), паузы (:obj:`float`)."""
+        self.chat_name: str | None = chat_name
+        """Название чата."""
+        self.interlocutor_id: int | None = interlocutor_id
+        """ID собеседника."""
+        self.attempts: int = attempts
+        """Кол-во попыток на отправку одной сущности."""
+        self.attempts_left: int = attempts
+        """Оставшееся кол-во попыток на отправку текущей сущности."""
+        self.flags: tuple[bool, bool, bool] = flags
+        """(add_to_ignore_list, update_last_saved_message, leave_as_unread) для Account.send_message."""
+        self.coalesce: bool = coalesce
+        """Можно ли объединять сообщение с соседними текстовыми сообщениями того же чата."""
+        self.text: str | None = text
+        """Исходный текст сообщения (до добавления водяного знака и разбиения на сущности)."""
+        self.watermark: bool = watermark
+        """Добавлялся ли водяной знак."""
+        self.index: int = 0
+        """Индекс текущей сущности."""
+        self.result: list[types.Message] = []
+        """Отправленные сообщения."""
+        self.future: Future = Future()
+        """Future с результатом отправки: список отправленных сообщений или пустой список при ошибке."""
+        self.merged: list[SendJob] = []
+        """Сообщения, объединенные с данным (получают тот же результат)."""
+        self.submitted: float = time.monotonic()
+        """Время постановки в очередь (time.monotonic())."""
+        self.waited: float | None = None
+        """Время ожидания в очереди до начала отправки (сек)."""
+
+
+class SendPipeline:
+    """
+    Конвейер отправки сообщений на FunPay.
+
+    Сообщения одного чата отправляются строго по очереди, разные чаты обрабатываются параллельно (в пуле `executor`).
+    Паузы ($sleep), повторы после ошибок и ожидание после ошибок флуда (общее для всех чатов) планируются по
+    таймеру: поток пула в это время занят другими чатами.
+
+    Соседние текстовые сообщения одного чата, поставленные в очередь с `coalesce=True` (приветствие, автоответ,
+    ответ на отзыв и т.д.) и встретившиеся в очереди (чат занят предыдущим сообщением), отправляются одним
+    сообщением: исходные тексты объединяются через пустую строку и заново разбиваются функцией `compose`
+    (водяной знак добавляется один раз), если это уменьшает кол-во отправляемых сообщений.
+    Если задан `coalesce_window`, отправка объединяемого сообщения в свободный чат откладывается на это время, чтобы
+    следующие сообщения успели его догнать.
+
+    :param account: аккаунт.
+    :type account: :class:`FunPayAPI.account.Account`
+
+    :param executor: пул потоков для отправки.
+    :type executor: :class:`Utils.executors.ManagedExecutor`
+
+    :param retry_delay: пауза перед повторной попыткой отправки (сек).
+    :type retry_delay: :obj:`float`, опционально
+
+    :param flood_pause: пауза после ошибки "Нельзя отправлять сообщения слишком часто." (сек).
+    :type flood_pause: :obj:`float`, опционально
+
+    :param image_cache_size: максимальное кол-во ID выгруженных изображений в кэше.
+    :type image_cache_size: :obj:`int`, опционально
+
+    :param compose: функция (текст, водяной знак) -> сущности (см. Cardinal.compose_message_entities).
+        Если не передана, сообщения не объединяются.
+    :type compose: :obj:`Callable` or :obj:`None`, опционально
+
+    :param coalesce_window: задержка начала отправки объединяемых сообщений в свободный чат (сек).
+        0 - не задерживать.
+    :type coalesce_window: :obj:`float`, опционально
+    """
+
+    def __init__(self, account: Account, executor: ManagedExecutor, retry_delay: float = 1,
+                 flood_pause: float = FLOOD_PAUSE, image_cache_size: int = 256,
+                 compose: Callable[[str, bool], list[str | int | float]] | None = None, coalesce_window: float = 0):
+        self.account: Account = account
+        """Аккаунт."""
+        self.executor: ManagedExecutor = executor
+        """Пул потоков для отправки."""
+        self.retry_delay: float = retry_delay
+        """Пауза перед повторной попыткой отправки (сек)."""
+        self.flood_pause: float = flood_pause
+        """Пауза после ошибки флуда (сек)."""
+        self.compose: Callable[[str, bool], list[str | int | float]] | None = compose
+        """Функция (текст, водяной знак) -> сущности для объединения сообщений."""
+        self.coalesce_window: float = max(0.0, coalesce_window)
+        """Задержка начала отправки объединяемых сообщений в свободный чат (сек). 0 - не задерживать."""
+        self.sent: int = 0
+        """Кол-во отправленных сообщений (текстов и изображений)."""
+        self.failed: int = 0
+        """Кол-во сообщений, которые не удалось отправить."""
+        self.retries: int = 0
+        """Кол-во повторных попыток отправки."""
+        self.deferred: int = 0
+        """Кол-во отправок, отложенных из-за ошибки флуда."""
+        self.image_hits: int = 0
+        """Кол-во изображений, ID которых взят из кэша."""
+        self.coalesced: int = 0
+        """Кол-во сообщений, объединенных с предыдущими."""
+        self.__jobs_started = 0
+        self.__wait_total = 0.0
+        self.__wait_max = 0.0
+        self.__image_ids: BoundedDict[str, int] = BoundedDict(image_cache_size)
+        self.__queues: dict[int | str, deque[SendJob]] = {}
+        self.__lock = threading.Lock()
+        self.__timers: list[tuple[float, int, int | str]] = []
+        self.__timers_counter = itertools.count()
+        self.__timers_cond = threading.Condition()
+        self.__closed = False
+        self.__timers_thread = threading.Thread(target=self.__timers_loop, name="FPS-send-timers", daemon=True)
+        self.__timers_thread.start()
+
+    def submit(self, chat_id: int | str, entities: list[str | int | float | bytes], chat_name: str | None = None,
+               interlocutor_id: int | None = None, attempts: int = 3, add_to_ignore_list: bool = True,
+               update_last_saved_message: bool = False, leave_as_unread: bool = False,
+               coalesce: bool = False, text: str | None = None, watermark: bool = False) -> Future:
+        """
+        Ставит сообщение в очередь чата.
+
+        :param chat_id: ID чата.
+        :type chat_id: :obj:`int` or :obj:`str`
+
+        :param entities: тексты (:obj:`str`), ID изображений (:obj:`int`) или изображения (:obj:`bytes`),
+            паузы в сек. (:obj:`float`).
+        :type entities: :obj:`list`
+
+        :param chat_name: название чата.
+        :type chat_name: :obj:`str` or :obj:`None`, опционально
+
+        :param interlocutor_id: ID собеседника.
+        :type interlocutor_id: :obj:`int` or :obj:`None`, опционально
+
+        :param attempts: кол-во попыток на отправку каждой сущности.
+        :type attempts: :obj:`int`, опционально
+
+        :param add_to_ignore_list: см. :meth:`FunPayAPI.account.Account.send_message`.
+        :param update_last_saved_message: см. :meth:`FunPayAPI.account.Account.send_message`.
+        :param leave_as_unread: см. :meth:`FunPayAPI.account.Account.send_message`.
+
+        :param coalesce: можно ли объединить сообщение с соседними текстовыми сообщениями этого чата
+            (требуется `text`).
+        :type coalesce: :obj:`bool`, опционально
+
+        :param text: исходный текст сообщения, из которого получены `entities`.
+        :type text: :obj:`str` or :obj:`None`, опционально
+
+        :param watermark: добавлялся ли водяной знак при получении `entities`.
+        :type watermark: :obj:`bool`, опционально
+
+        :return: Future с результатом: список отправленных сообщений или пустой список при ошибке.
+        :rtype: :class:`concurrent.futures.Future`
+        """
+        job = SendJob(chat_id, entities, chat_name, interlocutor_id, max(1, attempts),
+                      (add_to_ignore_list, update_last_saved_message, leave_as_unread),
+                      coalesce and text is not None and self.compose is not None, text, watermark)
+        with self.__lock:
+            queue = self.__queues.get(chat_id)
+            start = queue is None
+            if start:
+                queue = self.__queues[chat_id] = deque()
+            queue.append(job)
+        if start and job.coalesce and self.coalesce_window:
+            self.__call_later(self.coalesce_window, chat_id)
+        elif start:
+            self.__dispatch(chat_id)
+        return job.future
+
+    def image_id(self, image: bytes) -> int:
+        """
+        Возвращает ID изображения на серверах FunPay, выгружая изображение только при первом обращении.
+
+        :param image: изображение в виде байтов.
+        :type image: :obj:`bytes`
+
+        :return: ID изображения.
+        :rtype: :obj:`int`
+        """
+        key = hashlib.sha1(image).hexdigest()
+        if (image_id := self.__image_ids.get(key)) is not None:
+            self.image_hits += 1
+            return image_id
+        image_id = self.account.upload_image(image, type_="chat")
+        self.__image_ids[key] = image_id
+        return image_id
+
+    def stats(self) -> dict[str, int]:
+        """
+        Возвращает метрики конвейера.
+
+        :return: {"chats": ..., "queued": ..., "sent": ..., "failed": ..., "retries": ..., "deferred": ...,
+            "coalesced": ..., "image_hits": ..., "avg_wait": ..., "max_wait": ...}
+        :rtype: :obj:`dict`
+        """
+        with self.__lock:
+            chats, queued = len(self.__queues), sum(len(i) for i in self.__queues.values())
+            avg_wait = self.__wait_total / (self.__jobs_started or 1)
+            max_wait = self.__wait_max
+        return {"chats": chats, "queued": queued, "sent": self.sent, "failed": self.failed, "retries": self.retries,
+                "deferred": self.deferred, "coalesced": self.coalesced, "image_hits": self.image_hits,
+                "avg_wait": round(avg_wait, 3), "max_wait": round(max_wait, 3)}
+
+    def cancel(self, chat_id: int | str, future: Future) -> bool:
+        """
+        Убирает сообщение из очереди чата, если его отправка еще не началась (в т.ч. оно не объединено с другим
+        сообщением). Future такого сообщения завершается с результатом `[]`.
+
+        :param chat_id: ID чата.
+        :type chat_id: :obj:`int` or :obj:`str`
+
+        :param future: Future, полученный от :meth:`submit`.
+        :type future: :class:`concurrent.futures.Future`
+
+        :return: True, если сообщение убрано из очереди (и точно не будет отправлено), False, если его отправка
+            уже началась или завершилась.
+        :rtype: :obj:`bool`
+        """
+        with self.__lock:
+            queue = self.__queues.get(chat_id, ())
+            job = next((i for i in queue if i.future is future), None)
+            if job is None or job.waited is not None:
+                return False
+            # Если это первое сообщение очереди, ее обработка уже запланирована и просто перейдет к следующему
+            queue.remove(job)
+        future.set_result([])
+        return True
+
+    def timeout_for(self, entities: list[str | int | float | bytes], attempts: int = 3) -> float:
+        """
+        Возвращает разумное максимальное время отправки сообщения: паузы ($sleep) плюс время всех попыток отправки
+        каждой части с запасом на ожидание в очереди.
+
+        :param entities: сущности сообщения.
+        :type entities: :obj:`list`
+
+        :param attempts: кол-во попыток на отправку каждой сущности.
+        :type attempts: :obj:`int`, опционально
+
+        :return: время (сек).
+        :rtype: :obj:`float`
+        """
+        attempt_time = 2 * self.account.requests_timeout + self.retry_delay + self.flood_pause
+        return 30 + sum(i if isinstance(i, float) else max(1, attempts) * attempt_time for i in entities)
+
+    def stop(self):
+        """
+        Останавливает таймеры: отложенные отправки больше не возобновляются.
+        """
+        with self.__timers_cond:
+            self.__closed = True
+            self.__timers_cond.notify()
+
+    def __dispatch(self, chat_id: int | str):
+        if self.executor.submit(self.__run, chat_id) is None:
+            self.__fail_chat(chat_id)
+
+    def __call_later(self, delay: float, chat_id: int | str):
+        with self.__timers_cond:
+            heapq.heappush(self.__timers, (time.monotonic() + delay, next(self.__timers_counter), chat_id))
+            self.__timers_cond.notify()
+
+    def __timers_loop(self):
+        while True:
+            with self.__timers_cond:
+                while not self.__closed and (not self.__timers or self.__timers[0][0] > time.monotonic()):
+                    self.__timers_cond.wait(self.__timers[0][0] - time.monotonic() if self.__timers else None)
+                if self.__closed:
+                    return
+                chat_id = heapq.heappop(self.__timers)[2]
+            self.__dispatch(chat_id)
+
+    def __fail_chat(self, chat_id: int | str, error: Exception | None = None):
+        """
+        Завершает все сообщения в очереди чата: с результатом `[]` или с исключением `error`.
+        """
+        with self.__lock:
+            queue = self.__queues.pop(chat_id, deque())
+        for job in queue:
+            self.failed += 1
+            for i in [job] + job.merged:
+                if i.future.done():
+                    continue
+                if error is not None:
+                    i.future.set_exception(error)
+                else:
+                    i.future.set_result([])
+
+    def __flood_wait(self) -> float:
+        # Обе ошибки флуда относятся ко всему аккаунту, поэтому пауза общая для всех чатов
+        last_error = max(self.account.last_flood_err_time, self.account.last_multiuser_flood_err_time)
+        return last_error + self.flood_pause - time.time()
+
+    def __start(self, job: SendJob):
+        job.waited = time.monotonic() - job.submitted
+        self.__jobs_started += 1
+        self.__wait_total += job.waited
+        self.__wait_max = max(self.__wait_max, job.waited)
+
+    def __merge(self, job: SendJob, other: SendJob) -> bool:
+        if not (job.coalesce and other.coalesce and job.flags == other.flags and job.watermark == other.watermark) \
+                or not all(isinstance(i, str) for i in itertools.chain(job.entities, other.entities)):
+            return False
+        text = f"{job.text}\n\n{other.text}"
+        entities = self.compose(text, job.watermark)
+        if len(entities) >= len(job.entities) + len(other.entities) or \
+                not all(isinstance(i, str) for i in entities):
+            return False
+        job.text, job.entities = text, entities
+        job.merged.append(other)
+        return True
+
+    def __send(self, job: SendJob, entity: str | int | bytes) -> types.Message:
+        if isinstance(entity, bytes):
+            entity = self.image_id(entity)
+        if isinstance(entity, str):
+            return self.account.send_message(job.chat_id, entity, job.chat_name, job.interlocutor_id, None, *job.flags)
+        return self.account.send_image(job.chat_id, entity, job.chat_name, job.interlocutor_id, *job.flags)
+
+    def __run(self, chat_id: int | str):
+        """
+        Отправляет сообщения из очереди чата. Любая непредвиденная ошибка завершает все сообщения очереди
+        (иначе очередь чата осталась бы без обработчика, а последующие сообщения - без ответа).
+        """
+        try:
+            self.__process(chat_id)
+        except Exception as e:
+            logger.error(f"Произошла непредвиденная ошибка при отправке сообщений в чат {chat_id}.")  # locale
+            logger.debug("TRACEBACK", exc_info=True)
+            self.__fail_chat(chat_id, e)
+
+    def __process(self, chat_id: int | str):
+        """
+        Отправляет сообщения из очереди чата, пока очередь не опустеет или не понадобится пауза.
+        """
+        while True:
+            with self.__lock:
+                queue = self.__queues.get(chat_id)
+                if queue is None:
+                    return
+                if not queue:
+                    del self.__queues[chat_id]
+                    return
+                job = queue[0]
+                if job.waited is None:
+                    self.__start(job)
+                    while len(queue) > 1 and self.__merge(job, queue[1]):
+                        self.__start(queue[1])
+                        self.coalesced += 1
+                        del queue[1]
+
+            while job.index < len(job.entities):
+                entity = job.entities[job.index]
+                if isinstance(entity, float):
+                    job.index += 1
+                    self.__call_later(entity, chat_id)
+                    return
+                if (wait := self.__flood_wait()) > 0:
+                    self.deferred += 1
+                    self.__call_later(wait, chat_id)
+                    return
+                try:
+                    job.result.append(self.__send(job, entity))
+                    self.sent += 1
+                    logger.info(_("crd_msg_sent", chat_id))
+                    job.index += 1
+                    job.attempts_left = job.attempts
+                except:
+                    logger.warning(_("crd_msg_send_err", chat_id))
+                    logger.debug("TRACEBACK", exc_info=True)
+                    logger.info(_("crd_msg_attempts_left", job.attempts_left))
+                    job.attempts_left -= 1
+                    if job.attempts_left:
+                        self.retries += 1
+                        self.__call_later(max(self.retry_delay, self.__flood_wait()), chat_id)
+                        return
+                    logger.error(_("crd_msg_no_more_attempts_err", chat_id))
+                    self.failed += 1
+                    job.result = []
+                    break
+
+            for i in [job] + job.merged:
+                i.future.set_result(job.result)
+            with self.__lock:
+                queue.popleft()
@@ -7,7 +7,6 @@ if TYPE_CHECKING:
 from tg_bot.utils import NotificationTypes
 from telebot.types import InlineKeyboardMarkup as K, InlineKeyboardButton as B
 from locales.localizer import Localizer
-from threading import Thread
 from logging import getLogger
 import requests
 import json
@@ -172,11 +171,8 @@ def announcements_loop_iteration(crd: Cardinal, ignore_last_tag: bool = False):
     pin = get_pin(data)
 
     if text or photo:
-        Thread(target=crd.telegram.send_notification,
-               args=(text,),
-               kwargs={"photo": photo, 'notification_type': notification_type, 'keyboard': keyboard,
-                       'pin': pin},
-               daemon=True).start()
+        crd.telegram_executor.submit(crd.telegram.send_notification, text, photo=photo,
+                                     notification_type=notification_type, keyboard=keyboard, pin=pin)
 
 
 def announcements_loop(crd: Cardinal):
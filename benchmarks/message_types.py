@@ -0,0 +1,143 @@
+"""
+Замер скорости определения типа сообщения: RegularExpressions.get_message_type (выбор выражения по началу
+сообщения) против прежней последовательной проверки всех регулярных выражений.
+
+Таблица RegularExpressions.SYS_MSG_DISPATCH содержит только русские и английские начала сообщений (как и сами
+регулярные выражения), поэтому украинские системные сообщения (UK_SYSTEM) всегда проходят через прежнюю цепочку
+выражений: это проверяется отдельно, а их время замеряется отдельной строкой.
+
+Запуск из корня репозитория: python benchmarks/message_types.py
+"""
+from __future__ import annotations
+
+import timeit
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from FunPayAPI.common.enums import MessageTypes
+from FunPayAPI.common.utils import RegularExpressions
+
+N = 20000
+
+SYSTEM = [
+    "Покупатель buyer оплатил заказ #ABCD1234. World of Warcraft, Золото, 100 шт. "
+    "buyer, не забудьте потом нажать кнопку «Подтвердить выполнение заказа».",
+    "The buyer buyer has paid for order #ABCD1234. World of Warcraft, Gold, 100 pcs. "
+    "buyer, do not forget to press the «Confirm order fulfilment» button once you finish.",
+    "Покупатель buyer подтвердил успешное выполнение заказа #ABCD1234 и отправил деньги продавцу seller.",
+    "The buyer buyer has confirmed that order #ABCD1234 has been fulfilled successfully and that the seller seller "
+    "has been paid.",
+    "Покупатель buyer написал отзыв к заказу #ABCD1234.",
+    "The buyer buyer has given feedback to the order #ABCD1234.",
+    "Покупатель buyer изменил отзыв к заказу #ABCD1234.",
+    "The buyer buyer has edited their feedback to the order #ABCD1234.",
+    "Покупатель buyer удалил отзыв к заказу #ABCD1234.",
+    "The buyer buyer has deleted their feedback to the order #ABCD1234.",
+    "Продавец seller ответил на отзыв к заказу #ABCD1234.",
+    "The seller seller has replied to their feedback to the order #ABCD1234.",
+    "Продавец seller изменил ответ на отзыв к заказу #ABCD1234.",
+    "The seller seller has edited a reply to their feedback to the order #ABCD1234.",
+    "Продавец seller удалил ответ на отзыв к заказу #ABCD1234.",
+    "The seller seller has deleted a reply to their feedback to the order #ABCD1234.",
+    "Продавец seller вернул деньги покупателю buyer по заказу #ABCD1234.",
+    "The seller seller has refunded the buyer buyer on order #ABCD1234.",
+    "Администратор admin вернул деньги покупателю buyer по заказу #ABCD1234.",
+    "The administrator admin has refunded the buyer buyer on order #ABCD1234.",
+    "Администратор admin подтвердил успешное выполнение заказа #ABCD1234 и отправил деньги продавцу seller.",
+    "Заказ #ABCD1234 открыт повторно.",
+    "Order #ABCD1234 has been reopened.",
+    "Часть средств по заказу #ABCD1234 возвращена покупателю.",
+    "A part of the funds pertaining to the order #ABCD1234 has been refunded.",
+    "Вы можете перейти в Discord. Внимание: общение за пределами сервера FunPay считается нарушением правил.",
+    "Уважаемые продавцы, не доверяйте сообщениям в чате! Перед выполнением заказа всегда проверяйте наличие "
+    "оплаты в разделе «Мои продажи».",
+]
+
+UK_SYSTEM = [
+    "Покупець buyer оплатив замовлення #ABCD1234. World of Warcraft, Золото, 100 шт. "
+    "buyer, не забудьте потім натиснути кнопку «Підтвердити виконання замовлення».",
+    "Покупець buyer підтвердив успішне виконання замовлення #ABCD1234 і відправив гроші продавцю seller.",
+    "Покупець buyer написав відгук до замовлення #ABCD1234.",
+    "Покупець buyer змінив відгук до замовлення #ABCD1234.",
+    "Покупець buyer видалив відгук до замовлення #ABCD1234.",
+    "Продавець seller відповів на відгук до замовлення #ABCD1234.",
+    "Продавець seller повернув гроші покупцю buyer за замовленням #ABCD1234.",
+    "Адміністратор admin повернув гроші покупцю buyer за замовленням #ABCD1234.",
+    "Замовлення #ABCD1234 відкрито повторно.",
+    "Частину коштів за замовленням #ABCD1234 повернуто покупцю.",
+]
+
+USER = [
+    "Здравствуйте! Когда будет выполнен заказ?",
+    "Добрий день, коли буде готово?",
+    "Hello, is this still available?",
+    "Скинул оплату по заказу #ABCD1234, проверьте пожалуйста",
+    "Покупатель просит вернуть деньги",
+    "!help",
+    "ok",
+]
+
+
+def old_get_message_type(text: str) -> MessageTypes:
+    """
+    Прежняя реализация: все регулярные выражения проверяются по очереди.
+    """
+    res = RegularExpressions()
+    if res.DISCORD.search(text):
+        return MessageTypes.DISCORD
+    if res.DEAR_VENDORS.search(text):
+        return MessageTypes.DEAR_VENDORS
+    if res.ORDER_PURCHASED.findall(text) and res.ORDER_PURCHASED2.findall(text):
+        return MessageTypes.ORDER_PURCHASED
+    if res.ORDER_ID.search(text) is None:
+        return MessageTypes.NON_SYSTEM
+    sys_msg_types = {
+        MessageTypes.ORDER_CONFIRMED: res.ORDER_CONFIRMED,
+        MessageTypes.NEW_FEEDBACK: res.NEW_FEEDBACK,
+        MessageTypes.NEW_FEEDBACK_ANSWER: res.NEW_FEEDBACK_ANSWER,
+        MessageTypes.FEEDBACK_CHANGED: res.FEEDBACK_CHANGED,
+        MessageTypes.FEEDBACK_DELETED: res.FEEDBACK_DELETED,
+        MessageTypes.REFUND: res.REFUND,
+        MessageTypes.FEEDBACK_ANSWER_CHANGED: res.FEEDBACK_ANSWER_CHANGED,
+        MessageTypes.FEEDBACK_ANSWER_DELETED: res.FEEDBACK_ANSWER_DELETED,
+        MessageTypes.ORDER_CONFIRMED_BY_ADMIN: res.ORDER_CONFIRMED_BY_ADMIN,
+        MessageTypes.PARTIAL_REFUND: res.PARTIAL_REFUND,
+        MessageTypes.ORDER_REOPENED: res.ORDER_REOPENED,
+        MessageTypes.REFUND_BY_ADMIN: res.REFUND_BY_ADMIN
+    }
+    for i in sys_msg_types:
+        if sys_msg_types[i].search(text):
+            return i
+    return MessageTypes.NON_SYSTEM
+
+
+def measure(func, texts: list[str]) -> float:
+    """
+    Возвращает среднее время (мкс) определения типа одного сообщения.
+    """
+    n = max(1, N // len(texts))
+    best = min(timeit.repeat(lambda: [func(i) for i in texts], number=n, repeat=5))
+    return best / (n * len(texts)) * 1e6
+
+
+def main():
+    res = RegularExpressions()
+    for text in SYSTEM + UK_SYSTEM + USER:
+        assert old_get_message_type(text) is res.get_message_type(text), text
+    print(f"Результаты совпадают на {len(SYSTEM) + len(UK_SYSTEM) + len(USER)} сообщениях.")
+    for text in UK_SYSTEM:
+        assert not any(text.startswith(prefixes) for prefixes, _ in res.SYS_MSG_DISPATCH), text
+    print(f"Украинские системные сообщения ({len(UK_SYSTEM)}) не попадают в SYS_MSG_DISPATCH и проверяются "
+          f"цепочкой выражений.")
+    # В реальном трафике пользовательских сообщений в разы больше, чем системных
+    for name, texts in (("системные", SYSTEM), ("системные (uk, цепочка выражений)", UK_SYSTEM),
+                        ("пользовательские", USER), ("смешанные", SYSTEM + USER * 4)):
+        old = measure(old_get_message_type, texts)
+        new = measure(res.get_message_type, texts)
+        print(f"{name}: {old:.2f} -> {new:.2f} мкс на сообщение")
+
+
+if __name__ == "__main__":
+    main()
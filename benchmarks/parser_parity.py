@@ -0,0 +1,260 @@
+"""
+Проверка совпадения результатов бэкендов HTML-парсера (`lxml` и `bs4`, см. FunPayAPI.common.parser) на сохраненных
+(обезличенных) страницах FunPay из benchmarks/fixtures и замер скорости их разбора.
+
+Проверяются:
+
+* интерфейс Node: find / find_all (по тегу, классу, атрибутам, регулярным выражениям, функциям, recursive=False,
+  limit), get_text, text, attrs, get, `[]`;
+* код FunPayAPI, разбирающий эти страницы: Runner.iter_chat_updates (chat_bookmarks), разбор сообщений chat_node,
+  Account.get_sales (orders/trade), Account.get_lot_page (lots/offer).
+
+Запуск из корня репозитория: python benchmarks/parser_parity.py
+"""
+from __future__ import annotations
+
+from typing import Any
+from enum import Enum
+import timeit
+import json
+import re
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from FunPayAPI.account import Account
+from FunPayAPI.common import parser as html_parser
+from FunPayAPI.updater.runner import Runner
+
+N = 200
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+ACCOUNT_ID = 1000001
+LOT_ID = 12345678
+BOOLEAN_ATTRS = ("selected", "checked", "disabled", "readonly", "multiple")
+
+
+def load(name: str) -> str:
+    with open(os.path.join(FIXTURES, name), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def chat_node_htmls() -> list[str]:
+    """
+    Возвращает HTML сообщений из ответа chat_node (так же, как Account.__parse_messages).
+    """
+    return [i["html"].replace("<br>", "\n") for i in json.loads(load("chat_node.json"))["chat"]["messages"]]
+
+
+PAGES = {
+    "chat_bookmarks": lambda: [load("chat_bookmarks.html")],
+    "chat_node": chat_node_htmls,
+    "orders/trade": lambda: [load("orders_trade.html")],
+    "lots/offer": lambda: [load("lot.html")],
+}
+
+
+def attrs_state(node) -> dict:
+    """
+    Возвращает атрибуты элемента. Логические атрибуты HTML без значения (`<option selected>`) в дереве lxml равны
+    своему имени, а в bs4 - пустой строке (см. FunPayAPI.common.parser), поэтому сравнивается только их наличие.
+    """
+    return {k: True if k in BOOLEAN_ATTRS else v for k, v in node.attrs.items()}
+
+
+def node_state(node) -> tuple | None:
+    """
+    Возвращает сравнимое состояние элемента: тег, атрибуты и текст в разных вариантах.
+    """
+    if node is None:
+        return None
+    return (node.name, attrs_state(node), node.text, node.get_text(" ", strip=True), node.get_text("|"),
+            node.get("class"), node.get("data-missing", "default"))
+
+
+def queries(soup) -> list[tuple[str, tuple, dict]]:
+    """
+    Составляет запросы по всем тегам, классам и атрибутам, встречающимся в документе (дерево `soup` - bs4).
+    """
+    names, classes, full_classes, attrs = set(), set(), set(), {}
+    for tag in soup.find_all(True):
+        names.add(tag.name)
+        for key, value in tag.attrs.items():
+            if key == "class":
+                classes.update(value)
+                if len(value) > 1:
+                    full_classes.add(" ".join(value))
+            elif key not in attrs:
+                attrs[key] = value
+
+    result = [("find_all", (True,), {}), ("find_all", (), {"recursive": False}),
+              ("find_all", (lambda x: x.name == "option" and x.get("value"),), {}),
+              ("find_all", ("div",), {"limit": 3})]
+    for name in sorted(names):
+        result += [("find_all", (name,), {}), ("find", (name,), {})]
+    for class_ in sorted(classes | full_classes):
+        result += [("find_all", (), {"class_": class_}), ("find", ("div", {"class": class_}), {}),
+                   ("find_all", ("a",), {"class_": class_})]
+    result.append(("find_all", (), {"class_": ["info", "warning", "unread"]}))
+    for key, value in sorted(attrs.items()):
+        result.append(("find_all", (), {"attrs": {key: True}}))
+        if key not in BOOLEAN_ATTRS:
+            result += [("find_all", (), {"attrs": {key: value}}), ("find_all", (), {"attrs": {key: re.compile(r"\d")}})]
+    result += [
+        ("find_all", ("a",), {"href": re.compile(r"^https://funpay\.com/users/\d+/$")}),
+        ("find_all", ("a",), {"href": lambda href: href and "/users/" in href}),
+        ("find_all", ("div",), {"role": "alert"}),
+        ("find_all", ("input",), {"attrs": {"type": "hidden", "name": "continue"}}),
+        ("find_all", ("option",), {"selected": True}),
+        ("find_all", ("div",), {"data-missing": None, "class_": "media-user-name"}),
+    ]
+    return result
+
+
+def run_query(root, method: str, args: tuple, kwargs: dict) -> Any:
+    result = getattr(root, method)(*args, **kwargs)
+    if method == "find":
+        return node_state(result)
+    return [node_state(i) for i in result]
+
+
+def check_node_api(page: str, htmls: list[str]) -> int:
+    """
+    Сравнивает результаты запросов к деревьям бэкендов, а также запросов от найденных элементов (в т.ч. с
+    recursive=False).
+
+    :return: кол-во проверенных запросов.
+    """
+    if len(htmls) == 1:
+        lxml_roots, bs4_roots = [html_parser.make_soup(htmls[0], "lxml")], [html_parser.make_soup(htmls[0], "bs4")]
+    else:
+        lxml_roots, bs4_roots = html_parser.make_soups(htmls, "lxml"), html_parser.make_soups(htmls, "bs4")
+    checked = 0
+    for lxml_root, bs4_root in zip(lxml_roots, bs4_roots):
+        if len(htmls) == 1:
+            pairs = [(lxml_root, bs4_root)]
+        else:
+            # Фрагменты make_soups (lxml) - блоки-обертки, а не корни документов, поэтому сравниваются их первые
+            # дочерние элементы
+            pairs = [(lxml_root.find(recursive=False), bs4_root.find("body").find(recursive=False))]
+        for method, args, kwargs in queries(bs4_root):
+            for lxml_node, bs4_node in pairs:
+                expected = run_query(bs4_node, method, args, kwargs)
+                assert run_query(lxml_node, method, args, kwargs) == expected, (page, method, args, kwargs)
+                checked += 1
+        # Запросы от каждого элемента: вложенный поиск, recursive=False, attrs / get / []
+        lxml_nodes = pairs[0][0].find_all(True)
+        bs4_nodes = pairs[0][1].find_all(True)
+        assert len(lxml_nodes) == len(bs4_nodes), page
+        for lxml_node, bs4_node in zip(lxml_nodes, bs4_nodes):
+            for method, args, kwargs in (("find_all", (), {"recursive": False}), ("find", ("div",), {}),
+                                         ("find", ("a",), {"recursive": False}), ("find_all", ("span",), {})):
+                assert run_query(lxml_node, method, args, kwargs) == run_query(bs4_node, method, args, kwargs), \
+                    (page, bs4_node.name, method, args, kwargs)
+                checked += 1
+            for key in bs4_node.attrs:
+                if key not in BOOLEAN_ATTRS:
+                    assert lxml_node[key] == bs4_node[key] == lxml_node.get(key), (page, key)
+    return checked
+
+
+class FixtureResponse:
+    """
+    Ответ FunPay из сохраненной страницы.
+    """
+
+    def __init__(self, text: str):
+        self.content = text.encode()
+        self.text = text
+        self.status_code = 200
+
+
+class FixtureAccount(Account):
+    """
+    Аккаунт, получающий страницы FunPay из benchmarks/fixtures вместо запросов.
+    """
+
+    def __init__(self):
+        super().__init__("fixture")
+        self._Account__initiated = True
+        self.id = ACCOUNT_ID
+        self.username = "seller"
+
+    def method(self, request_method, api_method, headers, payload, exclude_phpsessid=False, raise_not_200=False,
+               locale=None, priority=None):
+        if "orders/trade" in api_method:
+            return FixtureResponse(load("orders_trade.html"))
+        if api_method == f"lots/offer?id={LOT_ID}":
+            return FixtureResponse(load("lot.html"))
+        raise AssertionError(f"Неожиданный запрос: {api_method}")
+
+
+def object_state(obj: Any) -> Any:
+    """
+    Возвращает сравнимое состояние объекта FunPayAPI.types / события (рекурсивно по атрибутам-слотам и __dict__).
+    Атрибут `html` (`str()` элемента) не сравнивается: порядок атрибутов и пробелы в нем у бэкендов различаются.
+    """
+    if isinstance(obj, (list, tuple)):
+        return [object_state(i) for i in obj]
+    if isinstance(obj, dict):
+        return {k: object_state(v) for k, v in obj.items()}
+    if not type(obj).__module__.startswith("FunPayAPI") or isinstance(obj, Enum):
+        return obj
+    names = [i for cls in type(obj).__mro__ for i in getattr(cls, "__slots__", ()) if i != "__dict__"]
+    names += list(getattr(obj, "__dict__", {}))
+    return {i: object_state(getattr(obj, i)) for i in names
+            if hasattr(obj, i) and i not in ("html", "runner_tag", "tag")}
+
+
+def parse_pages(backend: str) -> dict[str, Any]:
+    """
+    Разбирает сохраненные страницы кодом FunPayAPI с бэкендом `backend`.
+    """
+    html_parser.set_backend(backend)
+    account = FixtureAccount()
+    runner = Runner(account, disable_message_requests=True)
+    bookmarks = {"type": "chat_bookmarks", "tag": "fixture", "data": {"html": load("chat_bookmarks.html")}}
+    messages = json.loads(load("chat_node.json"))["chat"]["messages"]
+    return {
+        "chat_bookmarks": runner.parse_chat_updates(bookmarks),
+        "chat_node": account._Account__parse_messages(messages, "users-1000001-2000001", 2000001, "buyer_one"),
+        "orders/trade": account.get_sales()[:3],
+        "lots/offer": account.get_lot_page(LOT_ID),
+    }
+
+
+def check_parsing() -> int:
+    """
+    Сравнивает объекты, полученные кодом FunPayAPI с разными бэкендами.
+
+    :return: кол-во проверенных страниц.
+    """
+    lxml_result, bs4_result = parse_pages("lxml"), parse_pages("bs4")
+    for page in PAGES:
+        expected = object_state(bs4_result[page])
+        assert expected, page
+        assert object_state(lxml_result[page]) == expected, page
+    return len(PAGES)
+
+
+def main():
+    backend = html_parser.get_backend()
+    try:
+        for page, htmls in PAGES.items():
+            print(f"{page}: совпадают результаты {check_node_api(page, htmls())} запросов к Node.")
+        print(f"Код FunPayAPI возвращает одинаковые объекты на всех страницах ({check_parsing()}).")
+    finally:
+        html_parser.set_backend(backend)
+
+    for page, htmls in PAGES.items():
+        htmls = htmls()
+        if len(htmls) == 1:
+            parse = lambda backend: html_parser.make_soup(htmls[0], backend)
+        else:
+            parse = lambda backend: html_parser.make_soups(htmls, backend)
+        times = {i: min(timeit.repeat(lambda: parse(i), number=N, repeat=5)) / N * 1e3 for i in html_parser.BACKENDS}
+        print(f"{page}: bs4 {times['bs4']:.2f} мс -> lxml {times['lxml']:.2f} мс")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Замер скорости подстановки переменных в шаблоны: format_msg_text / format_order_text (разбор шаблона
+compile_template один раз + MessageTemplate.render) против прежней реализации (вычисление всех переменных и
+str.replace для каждой переменной при каждом вызове).
+
+Запуск из корня репозитория: python benchmarks/templates.py
+"""
+from __future__ import annotations
+
+from datetime import datetime
+import timeit
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from FunPayAPI import types
+from FunPayAPI.common.enums import Currency, OrderStatuses
+from Utils import cardinal_tools
+from Utils.cardinal_tools import get_month_name, safe_text
+
+N = 20000
+
+MSG_TEMPLATES = {
+    "без переменных": "Спасибо за покупку! Хорошего дня.",
+    "приветствие": "Привет, $username! Сегодня $date_text, $time. Чат $chat_name ($chat_id): $message_text",
+    "все переменные": " ".join(cardinal_tools.MSG_VARIABLES),
+}
+
+ORDER_TEMPLATES = {
+    "без переменных": "Спасибо! Оставьте отзыв.",
+    "выдача": "Заказ $order_id ($order_link): $order_desc_and_params / $order_desc_or_params. Игра: $game, $category.",
+    "все переменные": " ".join(cardinal_tools.ORDER_VARIABLES),
+}
+
+
+def old_format_msg_text(text: str, obj: types.Message | types.ChatShortcut) -> str:
+    """
+    Прежняя реализация format_msg_text.
+    """
+    date_obj = datetime.now()
+    month_name = get_month_name(date_obj.month)
+    date = date_obj.strftime("%d.%m.%Y")
+    str_date = f"{date_obj.day} {month_name}"
+    str_full_date = str_date + f" {date_obj.year} года"
+    time_ = date_obj.strftime("%H:%M")
+    time_full = date_obj.strftime("%H:%M:%S")
+    username = obj.author if isinstance(obj, types.Message) else obj.name
+    chat_name = obj.chat_name if isinstance(obj, types.Message) else obj.name
+    chat_id = str(obj.chat_id) if isinstance(obj, types.Message) else str(obj.id)
+    variables = {
+        "$full_date_text": str_full_date,
+        "$date_text": str_date,
+        "$date": date,
+        "$time": time_,
+        "$full_time": time_full,
+        "$username": safe_text(username),
+        "$message_text": str(obj),
+        "$chat_id": chat_id,
+        "$chat_name": safe_text(chat_name)
+    }
+    for var in variables:
+        text = text.replace(var, variables[var])
+    return text
+
+
+def old_format_order_text(text: str, order: types.OrderShortcut) -> str:
+    """
+    Прежняя реализация format_order_text (для types.OrderShortcut без подкатегории).
+    """
+    date_obj = datetime.now()
+    month_name = get_month_name(date_obj.month)
+    date = date_obj.strftime("%d.%m.%Y")
+    str_date = f"{date_obj.day} {month_name}"
+    str_full_date = str_date + f" {date_obj.year} года"
+    time_ = date_obj.strftime("%H:%M")
+    time_full = date_obj.strftime("%H:%M:%S")
+    game, subcategory = order.subcategory_name.rsplit(", ", 1)
+    subcategory_fullname = f"{subcategory} {game}"
+    description = order.description
+    params = ""
+    variables = {
+        "$full_date_text": str_full_date,
+        "$date_text": str_date,
+        "$date": date,
+        "$time": time_,
+        "$full_time": time_full,
+        "$username": safe_text(order.buyer_username),
+        "$order_desc_and_params": f"{description}, {params}" if description and params else f"{description}{params}",
+        "$order_desc_or_params": description if description else params,
+        "$order_desc": description,
+        "$order_title": description,
+        "$order_params": params,
+        "$order_id": order.id,
+        "$order_link": f"https://funpay.com/orders/{order.id}/",
+        "$category_fullname": subcategory_fullname,
+        "$category": subcategory,
+        "$game": game
+    }
+    for var in variables:
+        text = text.replace(var, variables[var])
+    return text
+
+
+def measure(func, *args) -> float:
+    """
+    Возвращает лучшее среднее время (мкс) одного вызова.
+    """
+    return min(timeit.repeat(lambda: func(*args), number=N, repeat=5)) / N * 1e6
+
+
+def main():
+    message = types.Message(1, "!help", 123, "buyer", 5, "buyer", 5, None)
+    order = types.OrderShortcut("#ABCDEF12", "100 золота, EU", 10.5, Currency.RUB, "buyer", 5, 123,
+                                OrderStatuses.PAID, datetime.now(), "World of Warcraft, Золото", None, None)
+    rows = [("сообщение", name, old_format_msg_text, cardinal_tools.format_msg_text, text, message)
+            for name, text in MSG_TEMPLATES.items()]
+    rows += [("заказ", name, old_format_order_text, cardinal_tools.format_order_text, text, order)
+             for name, text in ORDER_TEMPLATES.items()]
+
+    for kind, name, old, new, text, obj in rows:
+        assert old(text, obj) == new(text, obj), f"{kind}, {name}"
+    print("Результаты совпадают на всех шаблонах.")
+
+    for kind, name, old, new, text, obj in rows:
+        print(f"{kind}, {name}: {measure(old, text, obj):.2f} -> {measure(new, text, obj):.2f} мкс")
+
+    # Отдельно: разбор шаблона (без кэша) и подстановка в уже разобранный шаблон
+    text = MSG_TEMPLATES["приветствие"]
+    template = cardinal_tools.compile_template(text, cardinal_tools.MSG_VARIABLES)
+    values = {i: "x" for i in template.variables}
+    parse = measure(cardinal_tools.MessageTemplate, text, cardinal_tools.MSG_VARIABLES)
+    print(f"разбор шаблона: {parse:.2f} мкс, render: {measure(template.render, values):.2f} мкс")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Замер памяти, занимаемой объектами FunPayAPI.types (со __slots__) и такими же объектами с обычным __dict__ (как до
+перехода на __slots__).
+
+Запуск из корня репозитория: python benchmarks/types_memory.py
+"""
+from __future__ import annotations
+
+import datetime
+import tracemalloc
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from FunPayAPI import types
+from FunPayAPI.common.enums import Currency, OrderStatuses
+
+N = 20000
+
+
+def copy_attrs(source, target):
+    """
+    Копирует атрибуты-слоты объекта `source` в `target` (значения общие, новые не создаются).
+    """
+    for cls in type(source).__mro__:
+        for name in getattr(cls, "__slots__", ()):
+            if hasattr(source, name):
+                setattr(target, name, getattr(source, name))
+    return target
+
+
+class Plain:
+    """
+    Объект с обычным __dict__ и теми же атрибутами, что и у переданного объекта.
+    """
+
+    def __init__(self, obj):
+        copy_attrs(obj, self)
+
+
+def make_message(i: int) -> types.Message:
+    return types.Message(i, "Здравствуйте! Когда будет выполнен заказ?", 1000 + i, "buyer", 5, "buyer", 5, None)
+
+
+def make_chat(i: int) -> types.ChatShortcut:
+    return types.ChatShortcut(1000 + i, "buyer", "Здравствуйте!", i, i, True, None)
+
+
+def make_order(i: int) -> types.OrderShortcut:
+    return types.OrderShortcut(f"#A{i:07}", "100 золота, EU", 10.5, Currency.RUB, "buyer", 5, 1000 + i,
+                               OrderStatuses.PAID, datetime.datetime.now(), "World of Warcraft, Золото", None, None)
+
+
+def measure(factory) -> float:
+    """
+    Возвращает среднее кол-во байт на объект.
+    """
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    objects = [factory(i) for i in range(N)]
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del objects
+    return size / N
+
+
+def main():
+    for name, factory in (("Message", make_message), ("ChatShortcut", make_chat), ("OrderShortcut", make_order)):
+        originals = [factory(i) for i in range(N)]
+        # Копии ссылаются на те же значения атрибутов, поэтому замеряется только память самих объектов
+        slots = measure(lambda i: copy_attrs(originals[i], type(originals[i]).__new__(type(originals[i]))))
+        # Отдельный класс для каждого типа, чтобы словари атрибутов разделяли ключи (как у исходного класса)
+        plain = type(f"Plain{name}", (Plain,), {})
+        dicts = measure(lambda i: plain(originals[i]))
+        print(f"{name}: __dict__ {dicts:.0f} байт, __slots__ {slots:.0f} байт на объект")
+
+
+if __name__ == "__main__":
+    main()
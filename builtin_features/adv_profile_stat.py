@@ -10,6 +10,10 @@ if TYPE_CHECKING:
     from sigma import Cardinal
 from FunPayAPI.updater.events import *
 from FunPayAPI.common.utils import RegularExpressions
+from FunPayAPI.common.enums import RequestPriorities
+from FunPayAPI.common.scheduler import CancelToken
+from FunPayAPI.common.exceptions import RequestCancelledError
+from FunPayAPI.common.parser import keep_html
 from os.path import exists
 import os
 import tg_bot.CBT
@@ -52,33 +56,40 @@ def generate_adv_profile(cardinal: Cardinal, chat_id: int, mess_id: int) -> str:
 
     cardinal.balance = cardinal.get_balance()
 
-    next_order_id, all_sales, locale, subcs = account.get_sales()
-    c = 1
-    while next_order_id is not None:
-        for attempts in range(2, -1, -1):
-            try:
-                time.sleep(1)
-                next_order_id, new_sales, locale, subcs = account.get_sales(start_from=next_order_id, locale=locale,
-                                                                            sudcategories=subcs)
-                break
-            except:
-                logger.debug(f"{LOGGER_PREFIX} Не удалось получить список заказов (#{next_order_id}). Осталось попыток: {attempts}")
-                logger.debug("TRACEBACK", exc_info=True)
-        else:
-            raise Exception("Не удалось получить список заказов")
-
-        all_sales += new_sales
-        str4tg = f"Обновляю статистику аккаунта. Запрос N{c}. Последний заказ: <a href='https://funpay.com/orders/{next_order_id}/'>{next_order_id}</a>"
-
-        if c % 5 == 0 or next_order_id is None:
-            try:
-                msg = bot.edit_message_text(
-                    str4tg if next_order_id is not None else f"Получил {len(all_sales)} продаж, формирую статистику...",
-                    chat_id, mess_id)
-            except:
-                logger.debug(f"{LOGGER_PREFIX} Не получилось изменить сообщение.")
-                logger.debug("TRACEBACK", exc_info=True)
-        c += 1
+    bulk_token = CancelToken(RequestPriorities.BULK)  # общий для всего обхода, чтобы отмена прерывала его целиком
+    # токен регистрируется на весь обход, чтобы cardinal.account.scheduler.cancel() прерывал его и между запросами
+    with account.scheduler.track(bulk_token):
+        # дата продажи парсится из sale.html, поэтому HTML сохраняется независимо от настройки keepHTML
+        with account.scheduler.lane(RequestPriorities.BULK, bulk_token), keep_html():
+            next_order_id, all_sales, locale, subcs = account.get_sales()
+        c = 1
+        while next_order_id is not None:
+            for attempts in range(2, -1, -1):
+                try:
+                    with account.scheduler.lane(RequestPriorities.BULK, bulk_token), keep_html():
+                        next_order_id, new_sales, locale, subcs = account.get_sales(start_from=next_order_id,
+                                                                                    locale=locale, sudcategories=subcs)
+                    break
+                except RequestCancelledError:
+                    raise
+                except:
+                    logger.debug(f"{LOGGER_PREFIX} Не удалось получить список заказов (#{next_order_id}). Осталось попыток: {attempts}")
+                    logger.debug("TRACEBACK", exc_info=True)
+            else:
+                raise Exception("Не удалось получить список заказов")
+
+            all_sales += new_sales
+            str4tg = f"Обновляю статистику аккаунта. Запрос N{c}. Последний заказ: <a href='https://funpay.com/orders/{next_order_id}/'>{next_order_id}</a>"
+
+            if c % 5 == 0 or next_order_id is None:
+                try:
+                    msg = bot.edit_message_text(
+                        str4tg if next_order_id is not None else f"Получил {len(all_sales)} продаж, формирую статистику...",
+                        chat_id, mess_id)
+                except:
+                    logger.debug(f"{LOGGER_PREFIX} Не получилось изменить сообщение.")
+                    logger.debug("TRACEBACK", exc_info=True)
+            c += 1
 
     for sale in all_sales:
         try:
@@ -14,7 +14,7 @@ import io
 from telebot.apihelper import ApiTelegramException
 import FunPayAPI.types
 from FunPayAPI.common.exceptions import ImageUploadError, MessageNotDeliveredError
-from FunPayAPI.common.enums import MessageTypes, OrderStatuses
+from FunPayAPI.common.enums import MessageTypes, OrderStatuses, RequestPriorities
 from FunPayAPI.updater.events import NewMessageEvent
 from FunPayAPI.updater import events
 
@@ -343,12 +343,13 @@ class ChatSync:
             locale = None
             subcs = None
             while True:
-                start_from, sales_temp, locale, subcs = c.account.get_sales(buyer=chat_name, start_from=start_from,
-                                                                            locale=locale, sudcategories=subcs)
+                with c.account.scheduler.lane(RequestPriorities.BULK):
+                    start_from, sales_temp, locale, subcs = c.account.get_sales(buyer=chat_name,
+                                                                                start_from=start_from,
+                                                                                locale=locale, sudcategories=subcs)
                 sales.extend(sales_temp)
                 if start_from is None:
                     break
-                time.sleep(1)
             paid = 0
             refunded = 0
             closed = 0
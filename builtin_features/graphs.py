@@ -64,6 +64,9 @@ from tg_bot import CBT
 if TYPE_CHECKING:
     from sigma import Cardinal
 from FunPayAPI.updater.events import *
+from FunPayAPI.common.enums import RequestPriorities
+from FunPayAPI.common.scheduler import CancelToken
+from FunPayAPI.common.exceptions import RequestCancelledError
 import tg_bot.static_keyboards
 import telebot
 import time
@@ -482,42 +485,48 @@ def init(cardinal: Cardinal):
         now = datetime.now()
         days.sort()
         max_seconds = days[-1] * 3600 * 24
-        next_order_id, all_sales, locale, subcs = acc.get_sales()
-        c = 1
-        while next_order_id != None and (now - all_sales[-1].date).total_seconds() < max_seconds:
-            time.sleep(1)
-            for i in range(2, -1, -1):
-                try:
-                    next_order_id, new_sales, locale, subcs = acc.get_sales(start_from=next_order_id,
-                                                                            sudcategories=subcs,
-                                                                            locale=locale)
-                    break
-                except:
-                    logger.warning(f"{LOGGER_PREFIX} Не удалось получить заказы. Осталось попыток: {i}")
-                    logger.debug("TRACEBACK", exc_info=True)
-                    time.sleep(2)
-            else:
-                raise Exception("Не удалось спарсить")
-            all_sales += new_sales
-            str4tg = f"Обновляю статистику аккаунта. Запрос N{c}. Последний заказ: <a href='https://funpay.com/orders/{next_order_id}/'>{next_order_id}</a>"
-            logger.debug(f"{LOGGER_PREFIX} {str4tg}")
-            if c % 5 == 0:
-                try:
-                    msg = bot.edit_message_text(str4tg, new_mes.chat.id, new_mes.id)
-                    logger.debug(f"{LOGGER_PREFIX} Сообщение изменено. {msg}")
-                except:
-                    logger.warning(f"{LOGGER_PREFIX} Не получилось изменить сообщение.")
-                    logger.debug("TRACEBACK", exc_info=True)
-            while (days and (now - all_sales[-1].date).total_seconds() > days[0] * 3600 * 24):
-                temp_list = [sale for sale in all_sales if (now - sale.date).total_seconds() < days[0] * 3600 * 24]
-                bot.edit_message_text(f"Закончил сканировать заказы за последние {days[0]} дн..", new_mes.chat.id,
-                                      new_mes.id)
-                yield days[0], temp_list
-                del days[0]
-            c += 1
-        all_sales = [sale for sale in all_sales if (now - sale.date).total_seconds() < max_seconds]
-        if all_sales and days:
-            yield days[0], all_sales
+        bulk_token = CancelToken(RequestPriorities.BULK)  # общий для всего обхода, чтобы отмена прерывала его целиком
+        # токен регистрируется на весь обход, чтобы cardinal.account.scheduler.cancel() прерывал его и между запросами
+        with acc.scheduler.track(bulk_token):
+            with acc.scheduler.lane(RequestPriorities.BULK, bulk_token):
+                next_order_id, all_sales, locale, subcs = acc.get_sales()
+            c = 1
+            while next_order_id != None and (now - all_sales[-1].date).total_seconds() < max_seconds:
+                for i in range(2, -1, -1):
+                    try:
+                        with acc.scheduler.lane(RequestPriorities.BULK, bulk_token):
+                            next_order_id, new_sales, locale, subcs = acc.get_sales(start_from=next_order_id,
+                                                                                    sudcategories=subcs,
+                                                                                    locale=locale)
+                        break
+                    except RequestCancelledError:
+                        raise
+                    except:
+                        logger.warning(f"{LOGGER_PREFIX} Не удалось получить заказы. Осталось попыток: {i}")
+                        logger.debug("TRACEBACK", exc_info=True)
+                        time.sleep(2)
+                else:
+                    raise Exception("Не удалось спарсить")
+                all_sales += new_sales
+                str4tg = f"Обновляю статистику аккаунта. Запрос N{c}. Последний заказ: <a href='https://funpay.com/orders/{next_order_id}/'>{next_order_id}</a>"
+                logger.debug(f"{LOGGER_PREFIX} {str4tg}")
+                if c % 5 == 0:
+                    try:
+                        msg = bot.edit_message_text(str4tg, new_mes.chat.id, new_mes.id)
+                        logger.debug(f"{LOGGER_PREFIX} Сообщение изменено. {msg}")
+                    except:
+                        logger.warning(f"{LOGGER_PREFIX} Не получилось изменить сообщение.")
+                        logger.debug("TRACEBACK", exc_info=True)
+                while (days and (now - all_sales[-1].date).total_seconds() > days[0] * 3600 * 24):
+                    temp_list = [sale for sale in all_sales if (now - sale.date).total_seconds() < days[0] * 3600 * 24]
+                    bot.edit_message_text(f"Закончил сканировать заказы за последние {days[0]} дн..", new_mes.chat.id,
+                                          new_mes.id)
+                    yield days[0], temp_list
+                    del days[0]
+                c += 1
+            all_sales = [sale for sale in all_sales if (now - sale.date).total_seconds() < max_seconds]
+            if all_sales and days:
+                yield days[0], all_sales
 
     def get_graphs(m: telebot.types.Message):
         global in_progress
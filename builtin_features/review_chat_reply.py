@@ -224,7 +224,7 @@ def message_hook(cardinal: Cardinal, e: NewMessageEvent | LastChatMessageChanged
 
     if SETTINGS[stars]["enable"] and txt != "":
         txt = format_order_text(txt, order)
-        cardinal.send_message(chat_id, txt, chat_name, watermark=SETTINGS["watermark"])
+        cardinal.send_message_async(chat_id, txt, chat_name, watermark=SETTINGS["watermark"], coalesce=True)
 
 
 def get_settings_button():
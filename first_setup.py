@@ -87,6 +87,14 @@ default_config = {
     "Other": {
         "watermark": "🐦",
         "requestsDelay": "4",
+        "adaptivePolling": "0",
+        "minRequestsDelay": "1",
+        "maxRequestsDelay": "20",
+        "htmlParser": "bs4",
+        "keepHTML": "1",
+        "raiseJitter": "10",
+        "raiseConcurrency": "1",
+        "coalesceWindow": "0",
         "language": "ru"
     }
 }
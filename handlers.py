@@ -16,7 +16,6 @@ from FunPayAPI.updater.events import *
 from tg_bot import utils, keyboards
 from Utils import cardinal_tools
 from locales.localizer import Localizer
-from threading import Thread
 import configparser
 from datetime import datetime
 import logging
@@ -157,7 +156,7 @@ def greetings_handler(c: Cardinal, e: NewMessageEvent | LastChatMessageChangedEv
 
     logger.info(_("log_sending_greetings", chat_name, chat_id))
     text = cardinal_tools.format_msg_text(c.MAIN_CFG["Greetings"]["greetingsText"], obj)
-    Thread(target=c.send_message, args=(chat_id, text, chat_name), daemon=True).start()
+    c.send_message_async(chat_id, text, chat_name, coalesce=True)
 
 
 def add_old_user_handler(c: Cardinal, e: NewMessageEvent | LastChatMessageChangedEvent):
@@ -202,7 +201,7 @@ def send_response_handler(c: Cardinal, e: NewMessageEvent | LastChatMessageChang
 
     logger.info(_("log_new_cmd", command, chat_name, chat_id))
     response_text = cardinal_tools.format_msg_text(c.AR_CFG[command]["response"], obj)
-    Thread(target=c.send_message, args=(chat_id, response_text, chat_name), daemon=True).start()
+    c.send_message_async(chat_id, response_text, chat_name, coalesce=True)
 
 
 def old_send_new_msg_notification_handler(c: Cardinal, e: LastChatMessageChangedEvent):
@@ -220,8 +219,7 @@ def old_send_new_msg_notification_handler(c: Cardinal, e: LastChatMessageChanged
         user = f"👤 {user}"
     text = f"<i><b>{user}: </b></i><code>{utils.escape(str(e.chat))}</code>"
     kb = keyboards.reply(e.chat.id, e.chat.name, extend=True)
-    Thread(target=c.telegram.send_notification, args=(text, kb, utils.NotificationTypes.new_message),
-           daemon=True).start()
+    c.telegram_executor.submit(c.telegram.send_notification, text, kb, utils.NotificationTypes.new_message)
 
 
 def send_new_msg_notification_handler(c: Cardinal, e: NewMessageEvent) -> None:
@@ -305,20 +303,18 @@ def send_new_msg_notification_handler(c: Cardinal, e: NewMessageEvent) -> None:
         last_by_vertex = i.message.by_vertex
         last_badge = i.message.badge
     kb = keyboards.reply(chat_id, chat_name, extend=True)
-    Thread(target=c.telegram.send_notification, args=(text, kb, utils.NotificationTypes.new_message),
-           daemon=True).start()
+    c.telegram_executor.submit(c.telegram.send_notification, text, kb, utils.NotificationTypes.new_message)
 
 
 def send_review_notification(c: Cardinal, order: Order, chat_id: int, reply_text: str | None):
     if not c.telegram:
         return
     reply_text = _("ntfc_review_reply_text").format(utils.escape(reply_text)) if reply_text else ""
-    Thread(target=c.telegram.send_notification,
-           args=(_("ntfc_new_review").format('⭐' * order.review.stars, order.id, utils.escape(order.review.text),
-                                             reply_text),
-                 keyboards.new_order(order.id, order.buyer_username, chat_id),
-                 utils.NotificationTypes.review),
-           daemon=True).start()
+    c.telegram_executor.submit(c.telegram.send_notification,
+                               _("ntfc_new_review").format('⭐' * order.review.stars, order.id,
+                                                           utils.escape(order.review.text), reply_text),
+                               keyboards.new_order(order.id, order.buyer_username, chat_id),
+                               utils.NotificationTypes.review)
 
 
 def process_review_handler(c: Cardinal, e: NewMessageEvent | LastChatMessageChangedEvent):
@@ -381,12 +377,13 @@ def process_review_handler(c: Cardinal, e: NewMessageEvent | LastChatMessageChan
                 reply_text = cardinal_tools.format_order_text(c.MAIN_CFG["ReviewReply"].get(text), order)
                 reply_text = format_text4review(reply_text)
                 c.account.send_review(order.id, reply_text)
+                c.order_cache.invalidate(order.id)
             except:
                 logger.error(f"Произошла ошибка при ответе на отзыв {order.id}.")  # locale
                 logger.debug("TRACEBACK", exc_info=True)
         send_review_notification(c, order, chat_id, reply_text)
 
-    Thread(target=send_reply, daemon=True).start()
+    c.funpay_executor.submit(send_reply)
 
 
 def send_command_notification_handler(c: Cardinal, e: NewMessageEvent | LastChatMessageChangedEvent):
@@ -415,8 +412,8 @@ def send_command_notification_handler(c: Cardinal, e: NewMessageEvent | LastChat
     else:
         text = cardinal_tools.format_msg_text(c.AR_CFG[command]["notificationText"], obj)
 
-    Thread(target=c.telegram.send_notification, args=(text, keyboards.reply(chat_id, chat_name),
-                                                      utils.NotificationTypes.command), daemon=True).start()
+    c.telegram_executor.submit(c.telegram.send_notification, text, keyboards.reply(chat_id, chat_name),
+                               utils.NotificationTypes.command)
 
 
 def test_auto_delivery_handler(c: Cardinal, e: NewMessageEvent | LastChatMessageChangedEvent):
@@ -466,9 +463,8 @@ def send_categories_raised_notification_handler(c: Cardinal, cat: types.Category
         return
 
     text = f"""⤴️<b><i>Поднял все лоты категории</i></b> <code>{cat.name}</code>\n<tg-spoiler>{error_text}</tg-spoiler>"""  # locale
-    Thread(target=c.telegram.send_notification,
-           args=(text,),
-           kwargs={"notification_type": utils.NotificationTypes.lots_raise}, daemon=True).start()
+    c.telegram_executor.submit(c.telegram.send_notification, text,
+                               notification_type=utils.NotificationTypes.lots_raise)
 
 
 # Изменен список ордеров (REGISTER_TO_ORDERS_LIST_CHANGED)
@@ -601,8 +597,7 @@ def send_new_order_notification_handler(c: Cardinal, e: NewOrderEvent, *args):
 
     chat_id = c.account.get_chat_by_name(e.order.buyer_username, True).id
     keyboard = keyboards.new_order(e.order.id, e.order.buyer_username, chat_id)
-    Thread(target=c.telegram.send_notification, args=(text, keyboard, utils.NotificationTypes.new_order),
-           daemon=True).start()
+    c.telegram_executor.submit(c.telegram.send_notification, text, keyboard, utils.NotificationTypes.new_order)
 
 
 def deliver_goods(c: Cardinal, e: NewOrderEvent, *args):
@@ -680,8 +675,8 @@ def send_delivery_notification_handler(c: Cardinal, e: NewOrderEvent):
 <code>{utils.escape(getattr(e, "delivery_text"))}</code>\n
 📋 <b><i>Осталось товаров: </i></b>{amount}"""  # locale
 
-    Thread(target=c.telegram.send_notification, args=(text,),
-           kwargs={"notification_type": utils.NotificationTypes.delivery}, daemon=True).start()
+    c.telegram_executor.submit(c.telegram.send_notification, text,
+                               notification_type=utils.NotificationTypes.delivery)
 
 
 def update_lot_state(cardinal: Cardinal, lot: types.LotShortcut, task: int) -> bool:
@@ -777,27 +772,26 @@ def update_lots_states(cardinal: Cardinal, event: NewOrderEvent):
                     deactivated.append(lot.description)
                 elif current_task == 1:
                     restored.append(lot.description)
-            time.sleep(0.5)
 
     if deactivated:
         lots = "\n".join(deactivated)  # locale
         text = f"""🔴 <b>Деактивировал лоты:</b>
         
 <code>{lots}</code>"""
-        Thread(target=cardinal.telegram.send_notification, args=(text,),
-               kwargs={"notification_type": utils.NotificationTypes.lots_deactivate}, daemon=True).start()
+        cardinal.telegram_executor.submit(cardinal.telegram.send_notification, text,
+                                          notification_type=utils.NotificationTypes.lots_deactivate)
     if restored:
         lots = "\n".join(restored)  # locale
         text = f"""🟢 <b>Активировал лоты:</b>
 
 <code>{lots}</code>"""
-        Thread(target=cardinal.telegram.send_notification, args=(text,),
-               kwargs={"notification_type": utils.NotificationTypes.lots_restore}, daemon=True).start()
+        cardinal.telegram_executor.submit(cardinal.telegram.send_notification, text,
+                                          notification_type=utils.NotificationTypes.lots_restore)
     cardinal.last_state_change_tag = event.runner_tag
 
 
 def update_lots_state_handler(cardinal: Cardinal, event: NewOrderEvent, *args):
-    Thread(target=update_lots_states, args=(cardinal, event), daemon=True).start()
+    cardinal.funpay_executor.submit(update_lots_states, cardinal, event)
 
 
 def add_order_to_reminders_handler(c: Cardinal, e: NewOrderEvent, *args):
@@ -831,8 +825,8 @@ def send_thank_u_message_handler(c: Cardinal, e: OrderStatusChangedEvent):
     logger.info(f"Пользователь $YELLOW{e.order.buyer_username}$RESET подтвердил выполнение заказа "  # locale
                 f"$YELLOW{e.order.id}.$RESET")  # locale
     logger.info(f"Отправляю ответное сообщение ...")  # locale
-    Thread(target=c.send_message, args=(chat.id, text, e.order.buyer_username),
-           kwargs={'watermark': c.MAIN_CFG["OrderConfirm"].getboolean("watermark")}, daemon=True).start()
+    c.send_message_async(chat.id, text, e.order.buyer_username,
+                         watermark=c.MAIN_CFG["OrderConfirm"].getboolean("watermark"), coalesce=True)
 
 
 def send_order_confirmed_notification_handler(cardinal: Cardinal, event: OrderStatusChangedEvent):
@@ -843,13 +837,12 @@ def send_order_confirmed_notification_handler(cardinal: Cardinal, event: OrderSt
         return
 
     chat = cardinal.account.get_chat_by_name(event.order.buyer_username, True)
-    Thread(target=cardinal.telegram.send_notification,  # locale
-           args=(
-               f"""🪙 Пользователь <a href="https://funpay.com/chat/?node={chat.id}">{event.order.buyer_username}</a> """
-               f"""подтвердил выполнение заказа <code>{event.order.id}</code>. (<code>{event.order.price} {event.order.currency}</code>)""",
-               keyboards.new_order(event.order.id, event.order.buyer_username, chat.id),
-               utils.NotificationTypes.order_confirmed),
-           daemon=True).start()
+    cardinal.telegram_executor.submit(
+        cardinal.telegram.send_notification,  # locale
+        f"""🪙 Пользователь <a href="https://funpay.com/chat/?node={chat.id}">{event.order.buyer_username}</a> """
+        f"""подтвердил выполнение заказа <code>{event.order.id}</code>. (<code>{event.order.price} {event.order.currency}</code>)""",
+        keyboards.new_order(event.order.id, event.order.buyer_username, chat.id),
+        utils.NotificationTypes.order_confirmed)
 
 
 def remove_order_from_reminders_handler(c: Cardinal, e: OrderStatusChangedEvent):
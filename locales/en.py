@@ -255,6 +255,22 @@ sys_info = """<b><u>Data summary</u></b>
     Uptime:  <code>{}</code>
     Chat ID:  <code>{}</code>"""
 
+handler_stats = """<b><u>Handler statistics</u></b>
+
+<b>By event:</b>
+{}
+
+<b>By plugin:</b>
+{}
+
+<b>Slowest handlers:</b>
+{}"""
+handler_stats_disabled = "❌ Handler statistics are disabled ([HandlerStats] section in _main.cfg)."
+handler_stats_empty = "    <i>no data</i>"
+scheduler_stats = """<b>FunPay request queues:</b>
+{}"""
+bulk_cancelled = "🛑 Background FunPay traversals cancelled: <code>{}</code>."
+
 act_blacklist = """Enter the username you want to add to the blacklist."""
 already_blacklisted = "❌ <code>{}</code> is already on the blacklist."
 user_blacklisted = "✅ <code>{}</code> is blacklisted."
@@ -530,6 +546,8 @@ cmd_about = "about current version"
 cmd_check_updates = "check for updates"
 cmd_update = "upgrade to the next version"
 cmd_sys = "system load information"
+cmd_handler_stats = "handler execution time statistics"
+cmd_cancel_bulk = "cancel background FunPay traversals (graphs, statistics)"
 cmd_create_backup = "create backup"
 cmd_get_backup = "get backup"
 cmd_upload_backup = "upload backup"
@@ -595,6 +613,7 @@ log_click_attempt = "$MAGENTA@{} (ID: {})$RESET presses the control panel button
 log_access_granted = "$MAGENTA@{} (ID: {})$RESET gained access to the control panel."
 log_new_ad_key = "$MAGENTA@{} (ID: {})$RESET created a key to deliver $YELLOW{}$RESET: $CYAN{}$RESET."
 log_user_blacklisted = "$MAGENTA@{} (ID: {})$RESET has blacklisted $YELLOW{}$RESET."
+log_bulk_cancelled = "$MAGENTA@{} (ID: {})$RESET has cancelled background FunPay traversals: $YELLOW{}$RESET."
 log_user_unbanned = "$MAGENTA@{} (ID: {})$RESET has removed $YELLOW{}$RESET from the blacklist."
 log_watermark_changed = "$MAGENTA@{} (ID: {})$RESET changed the message watermark to $YELLOW{}$RESET."
 log_watermark_deleted = "$MAGENTA@{} (ID: {})$RESET deleted the message watermark."
@@ -266,6 +266,22 @@ sys_info = """<b><u>Сводка данных</u></b>
     Аптайм:  <code>{}</code>
     ID чата:  <code>{}</code>"""
 
+handler_stats = """<b><u>Статистика хэндлеров</u></b>
+
+<b>По событиям:</b>
+{}
+
+<b>По плагинам:</b>
+{}
+
+<b>Самые долгие хэндлеры:</b>
+{}"""
+handler_stats_disabled = "❌ Сбор статистики хэндлеров выключен (секция [HandlerStats] в _main.cfg)."
+handler_stats_empty = "    <i>нет данных</i>"
+scheduler_stats = """<b>Очереди запросов к FunPay:</b>
+{}"""
+bulk_cancelled = "🛑 Отменено фоновых обходов FunPay: <code>{}</code>."
+
 act_blacklist = """Введи имя пользователя, которого хочешь добавить в ЧС."""
 already_blacklisted = "❌ <code>{}</code> уже находится в ЧС."
 user_blacklisted = "✅ <code>{}</code> добавлен в ЧС."
@@ -547,6 +563,8 @@ cmd_about = "об текущей версии"
 cmd_check_updates = "проверить на наличие обновлений"
 cmd_update = "обновиться до след. версии"
 cmd_sys = "информация о нагрузке на систему"
+cmd_handler_stats = "статистика времени выполнения хэндлеров"
+cmd_cancel_bulk = "отменить фоновые обходы FunPay (графики, статистика)"
 cmd_create_backup = "создать бэкап"
 cmd_get_backup = "получить бэкап"
 cmd_upload_backup = "выгрузить бэкап"
@@ -617,6 +635,7 @@ log_click_attempt = "$MAGENTA@{} (ID: {})$RESET нажимает кнопки П
 log_access_granted = "$MAGENTA@{} (ID: {})$RESET получил доступ к ПУ."
 log_new_ad_key = "$MAGENTA@{} (ID: {})$RESET создал ключ для выдачи $YELLOW{}$RESET: $CYAN{}$RESET."
 log_user_blacklisted = "$MAGENTA@{} (ID: {})$RESET добавил $YELLOW{}$RESET в ЧС."
+log_bulk_cancelled = "$MAGENTA@{} (ID: {})$RESET отменил фоновые обходы FunPay: $YELLOW{}$RESET."
 log_user_unbanned = "$MAGENTA@{} (ID: {})$RESET удалил $YELLOW{}$RESET из ЧС."
 log_watermark_changed = "$MAGENTA@{} (ID: {})$RESET изменил водяной знак сообщений на $YELLOW{}$RESET."
 log_watermark_deleted = "$MAGENTA@{} (ID: {})$RESET удалил водяной знак сообщений."
@@ -252,6 +252,22 @@ sys_info = """<b><u>Дані системи</u></b>
     Аптайм:  <code>{}</code>
     ID чату:  <code>{}</code>"""
 
+handler_stats = """<b><u>Статистика хендлерів</u></b>
+
+<b>За подіями:</b>
+{}
+
+<b>За плагінами:</b>
+{}
+
+<b>Найдовші хендлери:</b>
+{}"""
+handler_stats_disabled = "❌ Збір статистики хендлерів вимкнено (секція [HandlerStats] у _main.cfg)."
+handler_stats_empty = "    <i>немає даних</i>"
+scheduler_stats = """<b>Черги запитів до FunPay:</b>
+{}"""
+bulk_cancelled = "🛑 Скасовано фонових обходів FunPay: <code>{}</code>."
+
 act_blacklist = """Введи ім'я користувача, якого хочеш додати в ЧС."""
 already_blacklisted = "❌ <code>{}</code> вже знаходиться в ЧС."
 user_blacklisted = "✅ <code>{}</code> доданий в ЧС."
@@ -528,6 +544,8 @@ cmd_about = "про поточну версію"
 cmd_check_updates = "перевірити на наявність оновлень"
 cmd_update = "оновитися до наст. версії"
 cmd_sys = "інформація про навантаження на систему"
+cmd_handler_stats = "статистика часу виконання хендлерів"
+cmd_cancel_bulk = "скасувати фонові обходи FunPay (графіки, статистика)"
 cmd_create_backup = "створити бекап"
 cmd_get_backup = "отримати бекап"
 cmd_upload_backup = "вивантажити бекап"
@@ -594,6 +612,7 @@ log_click_attempt = "$MAGENTA@{} (ID: {})$RESET натискає кнопки П
 log_access_granted = "$MAGENTA@{} (ID: {})$RESET отримав доступ до ПУ."
 log_new_ad_key = "$MAGENTA@{} (ID: {})$RESET створив ключ для видачі $YELLOW{}$RESET: $CYAN{}$RESET."
 log_user_blacklisted = "$MAGENTA@{} (ID: {})$RESET додав $YELLOW{}$RESET до ЧС."
+log_bulk_cancelled = "$MAGENTA@{} (ID: {})$RESET скасував фонові обходи FunPay: $YELLOW{}$RESET."
 log_user_unbanned = "$MAGENTA@{} (ID: {})$RESET видалив $YELLOW{}$RESET з ЧС."
 log_watermark_changed = "$MAGENTA@{} (ID: {})$RESET змінив водяний знак повідомлень на $YELLOW{}$RESET."
 log_watermark_deleted = "$MAGENTA@{} (ID: {})$RESET видалив водяний знак повідомлень."
@@ -2,7 +2,15 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Callable
 
 from FunPayAPI import types
-from FunPayAPI.common.enums import SubCategoryTypes
+from FunPayAPI.common.enums import SubCategoryTypes, EndpointTypes, RequestPriorities
+from FunPayAPI.common.rate_limiter import RateLimiter
+from FunPayAPI.common import parser as html_parser
+from Utils.event_dispatcher import EventDispatcher
+from Utils.handler_stats import HandlerStats
+from Utils.executors import ManagedExecutor
+from Utils.order_cache import OrderCache
+from Utils.raise_scheduler import RaiseScheduler
+from Utils.send_pipeline import SendPipeline
 
 if TYPE_CHECKING:
     from configparser import ConfigParser
@@ -13,8 +21,10 @@ from types import ModuleType
 import Utils.exceptions
 from uuid import UUID
 import importlib.util
+import inspect
 import configparser
 import itertools
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError as FutureTimeoutError
 import requests
 import datetime
 import logging
@@ -33,6 +43,7 @@ from Utils import cardinal_tools
 import tg_bot.bot
 
 from threading import Thread
+from collections import deque
 
 import gc
 import sys
@@ -99,6 +110,66 @@ class PluginData:
         self.enabled = enabled
 
 
+class HandlerList(list):
+    """
+    Список хэндлеров, считающий свои изменения (version): по нему Cardinal.get_enabled_handlers узнает, что плагин
+    изменил список напрямую (append / insert / remove / присваивание по индексу и т.д.), не сравнивая списки целиком.
+    """
+    __slots__ = ("version",)
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.version = 0
+
+    def append(self, object_):
+        self.version += 1
+        return super().append(object_)
+
+    def extend(self, iterable):
+        self.version += 1
+        return super().extend(iterable)
+
+    def insert(self, index, object_):
+        self.version += 1
+        return super().insert(index, object_)
+
+    def remove(self, value):
+        self.version += 1
+        return super().remove(value)
+
+    def pop(self, index=-1):
+        self.version += 1
+        return super().pop(index)
+
+    def clear(self):
+        self.version += 1
+        return super().clear()
+
+    def sort(self, *, key=None, reverse=False):
+        self.version += 1
+        return super().sort(key=key, reverse=reverse)
+
+    def reverse(self):
+        self.version += 1
+        return super().reverse()
+
+    def __setitem__(self, key, value):
+        self.version += 1
+        return super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self.version += 1
+        return super().__delitem__(key)
+
+    def __iadd__(self, other):
+        self.version += 1
+        return super().__iadd__(other)
+
+    def __imul__(self, n):
+        self.version += 1
+        return super().__imul__(n)
+
+
 class Cardinal(object):
     def __new__(cls, *args, **kwargs):
         if not hasattr(cls, "instance"):
@@ -155,11 +226,19 @@ class Cardinal(object):
                 elif self.MAIN_CFG["Proxy"].getboolean("enable"):
                     logger.info(_("crd_proxy_success_init", proxy_str))
 
+        html_parser.set_backend(self.MAIN_CFG["Other"]["htmlParser"])
+        html_parser.set_keep_html(self.MAIN_CFG["Other"].getboolean("keepHTML"))
         # Ротация User-Agent для анонимности
         user_agent = cardinal_tools.get_random_user_agent() if not self.MAIN_CFG["FunPay"]["user_agent"] else self.MAIN_CFG["FunPay"]["user_agent"]
         self.account = FunPayAPI.Account(self.MAIN_CFG["FunPay"]["golden_key"],
                                           user_agent,
-                                          proxy=self.proxy)
+                                          proxy=self.proxy,
+                                          rate_limiter=self.create_rate_limiter())
+        raise_concurrency = self.MAIN_CFG["Other"].getint("raiseConcurrency", 1)
+        if raise_concurrency > (bulk_limit := self.account.scheduler.lane_limits[RequestPriorities.BULK]):
+            logger.warning(f"raiseConcurrency = {raise_concurrency}, но фоновых запросов (в т.ч. поднятий лотов) "
+                           f"одновременно выполняется не более {bulk_limit}: одновременно будут подниматься лоты "
+                           f"не более {bulk_limit} категорий.")  # locale
         self.runner: FunPayAPI.Runner | None = None
         self.telegram: tg_bot.bot.TGBot | None = None
 
@@ -168,8 +247,12 @@ class Cardinal(object):
         self.start_time = int(time.time())
 
         self.balance: FunPayAPI.types.Balance | None = None
-        self.raise_time = {}  # Временные метки поднятия категорий {id игры: след. время поднятия}
-        self.raised_time = {}  # Время последнего поднятия категории {id игры: время последнего поднятия}
+        # Расписание автоподнятия лотов (очередь категорий по времени следующего поднятия)
+        self.raise_scheduler = RaiseScheduler("storage/cache/raise_schedule.json",
+                                              jitter=self.MAIN_CFG["Other"].getfloat("raiseJitter", 10))
+        self.raise_scheduler.load()
+        self.raise_time = self.raise_scheduler.next_times  # {id игры: след. время поднятия}
+        self.raised_time = self.raise_scheduler.raised_times  # {id игры: время последнего поднятия}
         self.__exchange_rates = {}  # Курс валют {(валюта1, валюта2): (курс, время обновления)}
         self.profile: FunPayAPI.types.UserProfile | None = None  # FunPay профиль для всего кардинала (+ хэндлеров)
         self.tg_profile: FunPayAPI.types.UserProfile | None = None  # FunPay профиль (для Telegram-ПУ)
@@ -203,28 +286,39 @@ class Cardinal(object):
         self.pending_orders_file = "storage/pending_orders.json"
         self.pending_orders = self.load_pending_orders()
 
+        # Сохраненное состояние Runner'а (для продолжения опроса после перезапуска, если включено в [RunnerState])
+        self.runner_state_file = "storage/cache/runner_state.json"
+        self.last_runner_state_save = time.time()
+        self.runner_state_changed = False
+        # Состояния Runner'а после итераций, события которых еще могут обрабатываться:
+        # [(порядковый номер последнего события итерации в self.event_dispatcher, состояние), ...]
+        self.runner_checkpoints: deque[tuple[int, dict]] = deque(maxlen=20)
+
         # Хэндлеры
-        self.pre_init_handlers = []
-        self.post_init_handlers = []
-        self.pre_start_handlers = []
-        self.post_start_handlers = []
-        self.pre_stop_handlers = []
-        self.post_stop_handlers = []
-
-        self.init_message_handlers = []
-        self.messages_list_changed_handlers = []
-        self.last_chat_message_changed_handlers = []
-        self.new_message_handlers = []
-        self.init_order_handlers = []
-        self.orders_list_changed_handlers = []
-        self.new_order_handlers = []
-        self.order_status_changed_handlers = []
-
-        self.pre_delivery_handlers = []
-        self.post_delivery_handlers = []
-
-        self.pre_lots_raise_handlers = []
-        self.post_lots_raise_handlers = []
+        self.pre_init_handlers = HandlerList()
+        self.post_init_handlers = HandlerList()
+        self.pre_start_handlers = HandlerList()
+        self.post_start_handlers = HandlerList()
+        self.pre_stop_handlers = HandlerList()
+        self.post_stop_handlers = HandlerList()
+
+        self.init_message_handlers = HandlerList()
+        self.messages_list_changed_handlers = HandlerList()
+        self.last_chat_message_changed_handlers = HandlerList()
+        self.new_message_handlers = HandlerList()
+        self.init_order_handlers = HandlerList()
+        self.orders_list_changed_handlers = HandlerList()
+        self.new_order_handlers = HandlerList()
+        self.order_status_changed_handlers = HandlerList()
+        # Хэндлеры пачек событий: получают все события одной итерации Runner'а (с одним runner_tag) разом
+        self.new_messages_batch_handlers = HandlerList()
+        self.new_orders_batch_handlers = HandlerList()
+
+        self.pre_delivery_handlers = HandlerList()
+        self.post_delivery_handlers = HandlerList()
+
+        self.pre_lots_raise_handlers = HandlerList()
+        self.post_lots_raise_handlers = HandlerList()
 
         self.handler_bind_var_names = {
             "BIND_TO_PRE_INIT": self.pre_init_handlers,
@@ -239,6 +333,8 @@ class Cardinal(object):
             "BIND_TO_NEW_MESSAGE": self.new_message_handlers,
             "BIND_TO_INIT_ORDER": self.init_order_handlers,
             "BIND_TO_NEW_ORDER": self.new_order_handlers,
+            "BIND_TO_NEW_MESSAGES_BATCH": self.new_messages_batch_handlers,
+            "BIND_TO_NEW_ORDERS_BATCH": self.new_orders_batch_handlers,
             "BIND_TO_ORDERS_LIST_CHANGED": self.orders_list_changed_handlers,
             "BIND_TO_ORDER_STATUS_CHANGED": self.order_status_changed_handlers,
             "BIND_TO_PRE_DELIVERY": self.pre_delivery_handlers,
@@ -247,10 +343,110 @@ class Cardinal(object):
             "BIND_TO_POST_LOTS_RAISE": self.post_lots_raise_handlers,
         }
 
+        # Пул потоков для хэндлеров событий Runner'а (если включен в [EventDispatcher])
+        self.event_dispatcher: EventDispatcher | None = self.create_event_dispatcher()
+        # Статистика времени выполнения хэндлеров (если включена в [HandlerStats])
+        self.handler_stats: HandlerStats | None = HandlerStats() if self.MAIN_CFG.has_section("HandlerStats") and \
+            self.MAIN_CFG["HandlerStats"].getboolean("enabled") else None
+        # Общий кэш полной информации о заказах (время жизни зависит от статуса заказа, см. [OrderCache])
+        order_cache_cfg = self.MAIN_CFG["OrderCache"] if self.MAIN_CFG.has_section("OrderCache") else {}
+        self.order_cache: OrderCache = OrderCache(paid_ttl=float(order_cache_cfg.get("paidTTL", 30)),
+                                                  closed_ttl=float(order_cache_cfg.get("closedTTL", 3600)),
+                                                  maxsize=int(order_cache_cfg.get("maxSize", 500)))
+        # Пулы потоков для фоновых задач хэндлеров и конвейер отправки сообщений на FunPay (см. create_executors)
+        self.funpay_executor: ManagedExecutor | None = None
+        self.telegram_executor: ManagedExecutor | None = None
+        self.send_executor: ManagedExecutor | None = None
+        self.send_pipeline: SendPipeline | None = None
+        self.create_executors()
+
+        # Списки хэндлеров событий Runner'а
+        self.events_handlers = {
+            FunPayAPI.events.EventTypes.INITIAL_CHAT: self.init_message_handlers,
+            FunPayAPI.events.EventTypes.CHATS_LIST_CHANGED: self.messages_list_changed_handlers,
+            FunPayAPI.events.EventTypes.LAST_CHAT_MESSAGE_CHANGED: self.last_chat_message_changed_handlers,
+            FunPayAPI.events.EventTypes.NEW_MESSAGE: self.new_message_handlers,
+
+            FunPayAPI.events.EventTypes.INITIAL_ORDER: self.init_order_handlers,
+            FunPayAPI.events.EventTypes.ORDERS_LIST_CHANGED: self.orders_list_changed_handlers,
+            FunPayAPI.events.EventTypes.NEW_ORDER: self.new_order_handlers,
+            FunPayAPI.events.EventTypes.ORDER_STATUS_CHANGED: self.order_status_changed_handlers,
+        }
+        # Скомпилированные списки активных хэндлеров {id списка: (версия списка, активные хэндлеры)}
+        self.__dispatch_tables: dict[int, tuple[int | None, list[Callable]]] = {}
+
         self.plugins: dict[str, PluginData] = {}
         self.disabled_plugins = cardinal_tools.load_disabled_plugins()
         self.builtin_tg_commands = {}  # Команды от встроенных модулей {module_name: [(cmd, desc, is_admin)]}
 
+    def create_rate_limiter(self) -> RateLimiter:
+        """
+        Создает общий ограничитель частоты запросов к FunPay по настройкам из секции [RateLimits]
+        (кол-во запросов в минуту для каждой группы эндпоинтов).
+        """
+        section = self.MAIN_CFG["RateLimits"] if self.MAIN_CFG.has_section("RateLimits") else {}
+        burst = float(section.get("burst", 3))
+        limits = {}
+        for endpoint in EndpointTypes:
+            per_minute = section.get(endpoint.name.lower())
+            if per_minute is None:
+                continue
+            try:
+                limits[endpoint] = (float(per_minute) / 60, burst)
+            except ValueError:
+                logger.warning(f"Некорректное значение [RateLimits] {endpoint.name.lower()}: {per_minute}")  # locale
+        return RateLimiter(limits)
+
+    def create_event_dispatcher(self) -> EventDispatcher | None:
+        """
+        Создает пул потоков для хэндлеров событий по настройкам из секции [EventDispatcher].
+
+        :return: пул потоков или `None`, если пул выключен.
+        """
+        if not self.MAIN_CFG.has_section("EventDispatcher") or \
+                not self.MAIN_CFG["EventDispatcher"].getboolean("enabled"):
+            return None
+        section = self.MAIN_CFG["EventDispatcher"]
+        return EventDispatcher(self.__execute_handler, workers=section.getint("workers", 4),
+                               queue_size=section.getint("queueSize", 100),
+                               handler_timeout=section.getfloat("handlerTimeout", 60))
+
+    def create_executors(self):
+        """
+        Создает пулы потоков по настройкам из секции [Executors]: для фоновых задач хэндлеров (отправка сообщений на
+        FunPay и уведомлений в Telegram) и для конвейера отправки сообщений (очереди по чатам, паузы и повторы по
+        таймеру). Вызывается при создании кардинала и при запуске после остановки (:meth:`stop` останавливает пулы).
+        """
+        executors_cfg = self.MAIN_CFG["Executors"] if self.MAIN_CFG.has_section("Executors") else {}
+        self.funpay_executor = ManagedExecutor("FPS-funpay", int(executors_cfg.get("funpayWorkers", 4)))
+        self.telegram_executor = ManagedExecutor("FPS-telegram", int(executors_cfg.get("telegramWorkers", 4)))
+        self.send_executor = ManagedExecutor("FPS-send", int(executors_cfg.get("sendWorkers", 4)))
+        self.send_pipeline = SendPipeline(self.account, self.send_executor, compose=self.compose_message_entities,
+                                          coalesce_window=self.MAIN_CFG["Other"].getint("coalesceWindow", 0) / 1000)
+
+    def get_event_key(self, event: FunPayAPI.events.BaseEvent) -> tuple:
+        """
+        Возвращает ключ упорядочивания события: события одного чата обрабатываются последовательно.
+
+        События заказов относятся к чату покупателя, поэтому хэндлеры заказа выполняются до хэндлеров сообщений
+        того же чата, полученных позже (Runner возвращает события заказов раньше событий чатов). У заказа нет ID
+        чата-ноды, а чат нового покупателя может быть еще не сохранен, поэтому ключом служит собеседник
+        (никнейм на FunPay уникален), а для чатов без собеседника - ID чата.
+
+        :param event: событие Runner'а.
+
+        :return: ключ события.
+        """
+        if isinstance(event, FunPayAPI.events.NewMessageEvent):
+            chat = self.account.get_chat_by_id(event.message.chat_id)
+            return "chat", chat.name if chat and chat.name else event.message.chat_id
+        if isinstance(event, (FunPayAPI.events.InitialChatEvent, FunPayAPI.events.LastChatMessageChangedEvent)):
+            return "chat", event.chat.name or event.chat.id
+        if isinstance(event, (FunPayAPI.events.InitialOrderEvent, FunPayAPI.events.NewOrderEvent,
+                              FunPayAPI.events.OrderStatusChangedEvent)):
+            return "chat", event.order.buyer_username
+        return "list", event.type
+
     # ===== МЕТОДЫ ОПТИМИЗАЦИИ ПАМЯТИ =====
     
     def _cleanup_old_users_cache(self) -> None:
@@ -350,6 +546,71 @@ class Cardinal(object):
         except Exception as e:
             logger.error(f"Не удалось сохранить данные о заказах в {self.pending_orders_file}: {e}")
 
+    def load_runner_state(self) -> bool:
+        """
+        Восстанавливает состояние Runner'а из файла (если включено в [RunnerState] и состояние не устарело).
+
+        :return: `True`, если состояние восстановлено.
+        """
+        if not self.MAIN_CFG.has_section("RunnerState") or not self.MAIN_CFG["RunnerState"].getboolean("enabled") \
+                or not os.path.exists(self.runner_state_file):
+            return False
+        try:
+            with open(self.runner_state_file, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            age = time.time() - state.get("time", 0)
+            if age > self.MAIN_CFG["RunnerState"].getfloat("maxAge", 24) * 60 * 60:
+                logger.info(f"Сохраненное состояние Runner'а устарело ({int(age // 60)} мин.), "
+                            f"выполняю полную синхронизацию.")  # locale
+                return False
+            if not self.runner.load_state(state):
+                return False
+        except Exception as e:
+            logger.warning(f"Не удалось восстановить состояние Runner'а из {self.runner_state_file}: {e}")  # locale
+            logger.debug("TRACEBACK", exc_info=True)
+            return False
+        # Все чаты из сохраненного состояния уже существовали до перезапуска.
+        self.greeting_chat_id_threshold = max(self.greeting_chat_id_threshold, *self.runner.runner_last_messages, 0)
+        logger.info(f"Состояние Runner'а восстановлено ({int(age // 60)} мин. назад): "
+                    f"{len(self.runner.runner_last_messages)} чатов, {len(self.runner.saved_orders)} заказов.")  # locale
+        return True
+
+    def save_runner_state(self, force: bool = False) -> None:
+        """
+        Сохраняет состояние Runner'а в файл (атомарно: через временный файл).
+        Сохраняется последнее состояние, снятое после итерации Runner'а, все события которой уже обработаны
+        (см. self.runner_checkpoints): ID необработанных событий не попадут в файл и после перезапуска будут получены
+        снова. Без force сохраняет, только если состояние изменилось и с прошлого сохранения прошло не меньше
+        [RunnerState] saveInterval секунд.
+
+        :param force: сохранить в любом случае.
+        """
+        if not self.runner or not self.MAIN_CFG.has_section("RunnerState") or \
+                not self.MAIN_CFG["RunnerState"].getboolean("enabled"):
+            return
+        if not force and (not self.runner_state_changed or time.time() - self.last_runner_state_save <
+                          self.MAIN_CFG["RunnerState"].getfloat("saveInterval", 10)):
+            return
+        processed = self.event_dispatcher.processed if self.event_dispatcher is not None else 0
+        state = None
+        while self.runner_checkpoints and self.runner_checkpoints[0][0] <= processed:
+            state = self.runner_checkpoints.popleft()[1]
+        if state is None:
+            return
+        self.runner_state_changed = bool(self.runner_checkpoints)
+        tmp_file = f"{self.runner_state_file}.tmp"
+        try:
+            if state["first_request"]:
+                return
+            os.makedirs(os.path.dirname(self.runner_state_file), exist_ok=True)
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(state, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_file, self.runner_state_file)
+            self.last_runner_state_save = time.time()
+        except Exception as e:
+            logger.error(f"Не удалось сохранить состояние Runner'а в {self.runner_state_file}: {e}")  # locale
+            logger.debug("TRACEBACK", exc_info=True)
+
     def __init_account(self) -> None:
         """
         Инициализирует класс аккаунта (self.account)
@@ -412,6 +673,7 @@ class Cardinal(object):
             self.profile = profile
             self.curr_profile = profile
             self.lots_ids = [i.id for i in profile.get_lots()]
+            self.raise_scheduler.wake()
             logger.info(_("crd_profile_updated", len(profile.get_lots()), len(profile.get_sorted_lots(2))))
         if update_telegram_profile:
             self.tg_profile = profile
@@ -455,82 +717,158 @@ class Cardinal(object):
         return balance
 
     # Прочее
-    def raise_lots(self) -> int:
+    def raise_lots(self) -> float:
+        """
+        Поднимает лоты категорий, время поднятия которых настало (по расписанию self.raise_scheduler).
+
+        :return: время, когда нужно снова запустить данную функцию.
+        """
+        categories = {}
+        for subcat in self.profile.get_sorted_lots(2):
+            if subcat.type is not SubCategoryTypes.CURRENCY:
+                categories[subcat.category.id] = subcat.category
+        self.raise_scheduler.sync(list(categories))
+
+        due = sorted([categories[i] for i in self.raise_scheduler.pop_due() if i in categories],
+                     key=lambda x: x.position)
+        # Все поднятия выполняются в очереди BULK, поэтому одновременно идет не больше запросов, чем ее лимит
+        # (четверть пула соединений аккаунта): raiseConcurrency больше лимита не учитывается (см. предупреждение
+        # в __init__), иначе поднятия заняли бы слоты, нужные сообщениям и заказам.
+        # Кроме того, запросы поднятия проходят через общее "ведро" LOTS ограничителя частоты (1 запрос/сек по
+        # умолчанию), поэтому параллельность сокращает в первую очередь ожидание ответов, а не кол-во запросов в секунду.
+        workers = min(len(due), self.MAIN_CFG["Other"].getint("raiseConcurrency", 1),
+                      self.account.scheduler.lane_limits[RequestPriorities.BULK])
+        if workers > 1:
+            start = time.time()
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="FPS-raise") as executor:
+                results = list(executor.map(self.__raise_category, due))
+            logger.info(f"Поднятие лотов: поднято {sum(i is not None for i in results)} из {len(due)} категорий "
+                        f"за {time.time() - start:.1f} сек.")  # locale
+            # Хэндлеры выполняются в текущем потоке и по порядку, как и при последовательном поднятии
+            for category, error_text in zip(due, results):
+                if error_text is not None:
+                    self.__run_post_raise_handlers(category, error_text)
+        else:
+            for category in due:
+                self.raise_category(category)
+        self.raise_scheduler.save()
+        return self.raise_scheduler.next_time() or time.time() + 10
+
+    def raise_category(self, category: types.Category) -> bool:
         """
-        Пытается поднять лоты.
+        Поднимает лоты категории (игры) и планирует ее следующее поднятие.
+        Время запроса и результат добавляются в статистику категории (cardinal.raise_scheduler.stats[category.id]),
+        которая передается 4-м аргументом хэндлерам BIND_TO_POST_LOTS_RAISE, принимающим его.
 
-        :return: предположительное время, когда нужно снова запустить данную функцию.
+        :param category: категория.
+
+        :return: `True`, если лоты подняты.
         """
-        # Время следующего вызова функции (по умолчанию - бесконечность).
-        next_call = float("inf")
+        error_text = self.__raise_category(category)
+        if error_text is None:
+            return False
+        self.__run_post_raise_handlers(category, error_text)
+        return True
 
-        for subcat in sorted(list(self.profile.get_sorted_lots(2).keys()), key=lambda x: x.category.position):
-            if subcat.type is SubCategoryTypes.CURRENCY:
-                continue
-            # Если id категории текущей подкатегории уже находится в self.game_ids, но время поднятия подкатегорий
-            # данной категории еще не настало - пропускам эту подкатегорию.
-            if (saved_time := self.raise_time.get(subcat.category.id)) and saved_time > int(time.time()):
-                # Если записанное в self.game_ids время больше текущего времени
-                # обновляем время next_call'а на записанное время.
-                next_call = saved_time if saved_time < next_call else next_call
-                continue
+    def __run_post_raise_handlers(self, category: types.Category, error_text: str):
+        """
+        Выполняет хэндлеры BIND_TO_POST_LOTS_RAISE: (cardinal, category, error_text) или, если хэндлер принимает
+        4-й аргумент, (cardinal, category, error_text, stats), где stats - статистика поднятий категории
+        (:class:`Utils.raise_scheduler.RaiseStats`: last_latency, avg_latency, success_rate, кол-во попыток, поднятий,
+        ожиданий и ошибок, в т.ч. неудачных поднятий, для которых хэндлеры не вызываются).
 
-            # В любом другом случае пытаемся поднять лоты всех категорий, относящихся к игре
-            raise_ok = False
-            error_text = ""
-            time_delta = ""
-            try:
-                time.sleep(1)
-                self.account.raise_lots(subcat.category.id)
-                logger.info(_("crd_lots_raised", subcat.category.name))
-                raise_ok = True
-                last_time = self.raised_time.get(subcat.category.id)
-                self.raised_time[subcat.category.id] = new_time = int(time.time())  # locale
-                time_delta = "" if not last_time else f" Последнее поднятие: {cardinal_tools.time_to_str(new_time - last_time)} назад."
-                time.sleep(1)
-                self.account.raise_lots(subcat.category.id)
-            except FunPayAPI.exceptions.RaiseError as e:
-                if e.error_message is not None:
-                    error_text = e.error_message
-                if e.wait_time is not None:
+        :param category: категория, лоты которой подняты.
+        :param error_text: текст для хэндлеров (время с последнего поднятия).
+        """
+        stats = self.raise_scheduler.stats.get(category.id)
+        for func in self.get_enabled_handlers(self.post_lots_raise_handlers):
+            if self.__accepts_positional_args(func, 4):
+                self.__execute_handler(func, (self, category, error_text, stats))
+            else:
+                self.__execute_handler(func, (self, category, error_text))
 
-                    next_time = int(time.time()) + e.wait_time
-                else:
-                    logger.error(_("crd_raise_unexpected_err", subcat.category.name))
-                    time.sleep(10)
-                    next_time = int(time.time()) + 1
-                self.raise_time[subcat.category.id] = next_time
-                next_call = next_time if next_time < next_call else next_call
-                if not raise_ok:
-                    continue
-            except Exception as e:
-                t = 10
-                if isinstance(e, FunPayAPI.exceptions.RequestFailedError) and e.status_code in (503, 403, 429):
+    @staticmethod
+    def __accepts_positional_args(func: Callable, count: int) -> bool:
+        """
+        Проверяет, можно ли передать функции `count` позиционных аргументов.
+        """
+        try:
+            parameters = inspect.signature(func).parameters.values()
+        except (TypeError, ValueError):
+            return False
+        if any(i.kind is inspect.Parameter.VAR_POSITIONAL for i in parameters):
+            return True
+        return sum(i.kind in (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+                   for i in parameters) >= count
 
-                    t = 60
-                else:
-                    logger.error(_("crd_raise_unexpected_err", subcat.category.name))
-                logger.debug("TRACEBACK", exc_info=True)
-                time.sleep(t)
-                next_time = int(time.time()) + 1
-                next_call = next_time if next_time < next_call else next_call
-                if not raise_ok:
-                    continue
-            self.run_handlers(self.post_lots_raise_handlers, (self, subcat.category, error_text + time_delta))
-        return next_call if next_call < float("inf") else 10
+    def __raise_category(self, category: types.Category) -> str | None:
+        """
+        Поднимает лоты категории и планирует ее следующее поднятие (без вызова хэндлеров BIND_TO_POST_LOTS_RAISE).
+
+        :param category: категория.
+
+        :return: текст для хэндлеров BIND_TO_POST_LOTS_RAISE, если лоты подняты, иначе `None`.
+        """
+        error_text = ""
+        start = time.time()
+        try:
+            with self.account.scheduler.lane(RequestPriorities.BULK):
+                self.account.raise_lots(category.id)
+        except FunPayAPI.exceptions.RaiseError as e:
+            self.raise_scheduler.record(category.id, time.time() - start,
+                                        "wait" if e.wait_time is not None else "error")
+            if e.wait_time is not None:
+                self.raise_scheduler.set_wait_time(category.id, e.wait_time)
+            else:
+                logger.error(_("crd_raise_unexpected_err", category.name))
+                self.raise_scheduler.schedule(category.id, time.time() + 10, save=False)
+            return None
+        except Exception as e:
+            self.raise_scheduler.record(category.id, time.time() - start, "error")
+            if isinstance(e, FunPayAPI.exceptions.RequestFailedError) and e.status_code in (503, 403, 429):
+                logger.warning(_("crd_raise_status_code_err", e.status_code, category.name))
+                self.raise_scheduler.schedule(category.id, time.time() + 60, save=False)
+            else:
+                logger.error(_("crd_raise_unexpected_err", category.name))
+                self.raise_scheduler.schedule(category.id, time.time() + 10, save=False)
+            logger.debug("TRACEBACK", exc_info=True)
+            return None
+
+        self.raise_scheduler.record(category.id, time.time() - start, "raised")
+        logger.info(_("crd_lots_raised", category.name))
+        last_time = self.raise_scheduler.mark_raised(category.id)
+        if last_time:  # locale
+            error_text = f" Последнее поднятие: {cardinal_tools.time_to_str(int(time.time() - last_time))} назад."
+        self.raise_scheduler.schedule_after_raise(category.id)
+        return error_text
 
     def get_order_from_object(self, obj: types.OrderShortcut | types.Message | types.ChatShortcut,
                               order_id: str | None = None) -> None | types.Order:
+        """
+        Получает полную информацию о заказе, к которому относится объект (через общий кэш заказов).
+
+        Системные сообщения о заказе означают, что заказ изменился, поэтому для них заказ запрашивается заново;
+        для заказов из списка продаж кэш используется, если статус заказа в кэше совпадает со статусом в списке.
+
+        :param obj: заказ из списка продаж, сообщение или чат.
+        :param order_id: ID заказа (если не передан - определяется по объекту).
+
+        :return: заказ или `None`, если получить его не удалось.
+        """
         if obj._order_attempt_error:
             return
-        if obj._order_attempt_made:
-            while obj._order is None and not obj._order_attempt_error:
-                time.sleep(0.1)
+        if obj._order is not None:
             return obj._order
         obj._order_attempt_made = True
         if type(obj) not in (types.Message, types.ChatShortcut, types.OrderShortcut):
             obj._order_attempt_error = True
             raise Exception("Неправильный тип объекта")
+        expected_status, force = None, False
+        if isinstance(obj, types.OrderShortcut):
+            expected_status = obj.status
+        else:
+            msg_type = obj.type if isinstance(obj, types.Message) else obj.last_message_type
+            force = msg_type not in (None, types.MessageTypes.NON_SYSTEM)
         if not order_id:
             if isinstance(obj, types.OrderShortcut):
                 order_id = obj.id
@@ -543,16 +881,25 @@ class Cardinal(object):
                     obj._order_attempt_error = True
                     return
                 order_id = order_id[0][1:]
+        order = self.order_cache.get(order_id, self.__fetch_order, expected_status, force)
+        if order is None:
+            obj._order_attempt_error = True
+            return
+        obj._order = order
+        return order
+
+    def __fetch_order(self, order_id: str) -> types.Order | None:
         for i in range(2, -1, -1):
             try:
-                obj._order = self.account.get_order(order_id)
-                logger.info(f"Получил информацию о заказе {obj._order}")  # locale
-                return obj._order
+                order = self.account.get_order(order_id)
+                logger.info(f"Получил информацию о заказе {order}")  # locale
+                return order
             except:
                 logger.warning(f"Произошла ошибка при получении заказа #{order_id}. Осталось {i} попыток.")  # locale
                 logger.debug("TRACEBACK", exc_info=True)
-                time.sleep(1)
-        obj._order_attempt_error = True
+                if i:
+                    time.sleep(1)
+        return None
 
     @staticmethod
     def split_text(text: str) -> list[str]:
@@ -624,7 +971,7 @@ class Cardinal(object):
             return
 
         # Отправляем сообщение
-        result = self.send_message(chat.id, formatted_text, order.buyer_username)
+        result = self.send_message(chat.id, formatted_text, order.buyer_username, coalesce=True)
         if result:
             logger.info(f"Отправлено напоминание о подтверждении заказа {order.id} покупателю {order.buyer_username}")
         else:
@@ -677,11 +1024,38 @@ class Cardinal(object):
         for order_id in orders_to_remove:
             del self.pending_orders[order_id]
 
+    def send_message_async(self, chat_id: int | str, message_text: str, chat_name: str | None = None,
+                           interlocutor_id: int | None = None, attempts: int = 3,
+                           watermark: bool = True, coalesce: bool = False) -> Future | None:
+        """
+        Ставит сообщение в очередь отправки в чат FunPay (см. :class:`Utils.send_pipeline.SendPipeline`) и не ждет
+        отправки. Сообщения одного чата отправляются в порядке постановки в очередь.
+
+        :param chat_id: ID чата.
+        :param message_text: текст сообщения.
+        :param chat_name: название чата (необязательно).
+        :param interlocutor_id: ID собеседника (необязательно).
+        :param attempts: кол-во попыток на отправку каждой части сообщения.
+        :param watermark: добавлять ли водяной знак в начало сообщения?
+        :param coalesce: можно ли объединить сообщение с соседними текстовыми сообщениями этого чата, если они
+            встретятся в очереди (см. также coalesceWindow в [Other]).
+
+        :return: Future со списком отправленных сообщений (пустой список, если отправить не удалось) или None,
+            если отправлять нечего.
+        """
+        entities = self.compose_message_entities(message_text, watermark)
+        if not entities:
+            return
+        return self.send_pipeline.submit(chat_id, entities, chat_name, interlocutor_id, attempts,
+                                         not self.old_mode_enabled, self.old_mode_enabled,
+                                         self.keep_sent_messages_unread, coalesce, message_text, watermark)
+
     def send_message(self, chat_id: int | str, message_text: str, chat_name: str | None = None,
                      interlocutor_id: int | None = None, attempts: int = 3,
-                     watermark: bool = True) -> list[FunPayAPI.types.Message] | None:
+                     watermark: bool = True, coalesce: bool = False,
+                     timeout: float | None = None) -> list[FunPayAPI.types.Message] | None:
         """
-        Отправляет сообщение в чат FunPay.
+        Отправляет сообщение в чат FunPay и ждет окончания отправки.
 
         :param chat_id: ID чата.
         :param message_text: текст сообщения.
@@ -689,50 +1063,60 @@ class Cardinal(object):
         :param interlocutor_id: ID собеседника (необязательно).
         :param attempts: кол-во попыток на отправку сообщения.
         :param watermark: добавлять ли водяной знак в начало сообщения?
+        :param coalesce: можно ли объединить сообщение с соседними текстовыми сообщениями этого чата.
+
+        :param timeout: максимальное время ожидания отправки (сек). По умолчанию - оценка
+            :meth:`Utils.send_pipeline.SendPipeline.timeout_for`. Если за это время отправка не началась, сообщение
+            убирается из очереди; если уже началась - ожидание продолжается до ее окончания.
 
         :return: объект сообщения / последнего сообщения, если оно доставлено, иначе - None
         """
+        try:
+            entities = self.compose_message_entities(message_text, watermark)
+        except:
+            logger.error(_("crd_msg_send_err", chat_id))
+            logger.debug("TRACEBACK", exc_info=True)
+            return []
+        if not entities:
+            return
+        future = self.send_pipeline.submit(chat_id, entities, chat_name, interlocutor_id, attempts,
+                                           not self.old_mode_enabled, self.old_mode_enabled,
+                                           self.keep_sent_messages_unread, coalesce, message_text, watermark)
+        if timeout is None:
+            timeout = self.send_pipeline.timeout_for(entities, attempts)
+        try:
+            try:
+                return future.result(timeout)
+            except FutureTimeoutError:
+                if self.send_pipeline.cancel(chat_id, future):
+                    logger.error(f"Сообщение в чат {chat_id} не отправлено за {timeout:.0f} сек.")  # locale
+                    return []
+            # Отправка уже началась: пустой результат означал бы неудачу (например, возврат товаров в файл при
+            # выдаче), хотя часть сообщения может быть доставлена, поэтому ждем ее окончания.
+            logger.warning(f"Сообщение в чат {chat_id} отправляется дольше {timeout:.0f} сек., "
+                           f"ожидаю окончания отправки.")  # locale
+            return future.result()
+        except:
+            logger.error(_("crd_msg_send_err", chat_id))
+            logger.debug("TRACEBACK", exc_info=True)
+        return []
+
+    def compose_message_entities(self, message_text: str, watermark: bool = True) -> list[str | int | float]:
+        """
+        Добавляет водяной знак (если нужно) и разбивает текст на сущности (см. :meth:`parse_message_entities`).
+
+        :param message_text: текст сообщения.
+        :param watermark: добавлять ли водяной знак в начало сообщения?
+
+        :return: набор сущностей или пустой список, если отправлять нечего (нет текстов и изображений).
+        """
         if self.MAIN_CFG["Other"].get("watermark") and watermark and not message_text.strip().startswith("$photo="):
             message_text = f"{self.MAIN_CFG['Other']['watermark']}\n" + message_text
 
         entities = self.parse_message_entities(message_text)
-        if all(isinstance(i, float) for i in entities) or not entities:
-            return
-
-        result = []
-        for entity in entities:
-            current_attempts = attempts
-            while current_attempts:
-                try:
-                    if isinstance(entity, str):
-                        msg = self.account.send_message(chat_id, entity, chat_name,
-                                                        interlocutor_id,
-                                                        None, not self.old_mode_enabled,
-                                                        self.old_mode_enabled,
-                                                        self.keep_sent_messages_unread)
-                        result.append(msg)
-                        logger.info(_("crd_msg_sent", chat_id))
-                    elif isinstance(entity, int):
-                        msg = self.account.send_image(chat_id, entity, chat_name,
-                                                      interlocutor_id,
-                                                      not self.old_mode_enabled,
-                                                      self.old_mode_enabled,
-                                                      self.keep_sent_messages_unread)
-                        result.append(msg)
-                        logger.info(_("crd_msg_sent", chat_id))
-                    elif isinstance(entity, float):
-                        time.sleep(entity)
-                    break
-                except Exception as ex:
-                    logger.warning(_("crd_msg_send_err", chat_id))
-                    logger.debug("TRACEBACK", exc_info=True)
-                    logger.info(_("crd_msg_attempts_left", current_attempts))
-                    current_attempts -= 1
-                    time.sleep(1)
-            else:
-                logger.error(_("crd_msg_no_more_attempts_err", chat_id))
-                return []
-        return result
+        if all(isinstance(i, float) for i in entities):
+            return []
+        return entities
 
     def get_exchange_rate(self, base_currency: types.Currency, target_currency: types.Currency, min_interval: int = 60):
         """
@@ -817,25 +1201,61 @@ class Cardinal(object):
         Запускает хэндлеры, привязанные к тому или иному событию.
         """
         instance_id = self.run_id
-        events_handlers = {
-            FunPayAPI.events.EventTypes.INITIAL_CHAT: self.init_message_handlers,
-            FunPayAPI.events.EventTypes.CHATS_LIST_CHANGED: self.messages_list_changed_handlers,
-            FunPayAPI.events.EventTypes.LAST_CHAT_MESSAGE_CHANGED: self.last_chat_message_changed_handlers,
-            FunPayAPI.events.EventTypes.NEW_MESSAGE: self.new_message_handlers,
-
-            FunPayAPI.events.EventTypes.INITIAL_ORDER: self.init_order_handlers,
-            FunPayAPI.events.EventTypes.ORDERS_LIST_CHANGED: self.orders_list_changed_handlers,
-            FunPayAPI.events.EventTypes.NEW_ORDER: self.new_order_handlers,
-            FunPayAPI.events.EventTypes.ORDER_STATUS_CHANGED: self.order_status_changed_handlers,
-        }
-
-        for event in self.runner.listen(requests_delay=int(self.MAIN_CFG["Other"]["requestsDelay"])):
+        if self.event_dispatcher is not None:
+            self.event_dispatcher.start()
+
+        for event in self.runner.listen(requests_delay=int(self.MAIN_CFG["Other"]["requestsDelay"]),
+                                        adaptive=self.MAIN_CFG["Other"].getboolean("adaptivePolling"),
+                                        min_delay=int(self.MAIN_CFG["Other"]["minRequestsDelay"]),
+                                        max_delay=int(self.MAIN_CFG["Other"]["maxRequestsDelay"]),
+                                        on_iteration=self.on_runner_iteration):
             if instance_id != self.run_id:
                 break
-            self.run_handlers(events_handlers[event.type], (self, event))
+            handlers_list = self.get_enabled_handlers(self.events_handlers[event.type])
+            if self.event_dispatcher is not None:
+                self.event_dispatcher.submit(self.get_event_key(event), handlers_list, (self, event))
+            else:
+                for func in handlers_list:
+                    self.__execute_handler(func, (self, event))
             # Периодическая очистка памяти
             self.periodic_cleanup()
 
+    def on_runner_iteration(self, events: list[FunPayAPI.events.BaseEvent]):
+        """
+        Вызывается после каждой итерации Runner'а: запускает хэндлеры пачек событий и сохраняет состояние Runner'а.
+
+        :param events: все события итерации Runner'а.
+        """
+        self.process_event_batches(events)
+        if events and self.MAIN_CFG.has_section("RunnerState") and self.MAIN_CFG["RunnerState"].getboolean("enabled"):
+            # Без пула хэндлеры уже выполнены, с пулом состояние будет сохранено после обработки всех событий итерации
+            number = self.event_dispatcher.submitted if self.event_dispatcher is not None else 0
+            self.runner_checkpoints.append((number, self.runner.get_state()))
+            self.runner_state_changed = True
+        self.save_runner_state()
+
+    def process_event_batches(self, events: list[FunPayAPI.events.BaseEvent]):
+        """
+        Запускает хэндлеры пачек событий (BIND_TO_NEW_MESSAGES_BATCH, BIND_TO_NEW_ORDERS_BATCH) для всех событий
+        одной итерации Runner'а. События группируются по runner_tag, хэндлер получает (кардинал, список событий).
+
+        :param events: все события итерации Runner'а.
+        """
+        batch_handlers = {FunPayAPI.events.EventTypes.NEW_MESSAGE: self.new_messages_batch_handlers,
+                          FunPayAPI.events.EventTypes.NEW_ORDER: self.new_orders_batch_handlers}
+        batches: dict[tuple, list[FunPayAPI.events.BaseEvent]] = {}
+        for event in events:
+            if event.type in batch_handlers and batch_handlers[event.type]:
+                batches.setdefault((event.type, event.runner_tag), []).append(event)
+
+        for (event_type, tag), batch in batches.items():
+            handlers_list = self.get_enabled_handlers(batch_handlers[event_type])
+            if self.event_dispatcher is not None:
+                self.event_dispatcher.submit(("batch", event_type), handlers_list, (self, batch))
+            else:
+                for func in handlers_list:
+                    self.__execute_handler(func, (self, batch))
+
     def lots_raise_loop(self):
         """
         Запускает бесконечный цикл поднятия категорий (если autoRaise в _main.cfg == 1)
@@ -852,10 +1272,10 @@ class Cardinal(object):
                     self.periodic_cleanup()
                     continue
                 next_time = self.raise_lots()
-                delay = next_time - int(time.time())
+                delay = next_time - time.time()
                 if delay <= 0:
                     continue
-                time.sleep(delay)
+                self.raise_scheduler.wait(delay)
                 self.periodic_cleanup()
             except:
                 logger.debug("TRACEBACK", exc_info=True)
@@ -887,6 +1307,34 @@ class Cardinal(object):
                 logger.debug("TRACEBACK", exc_info=True)
             time.sleep(60)  # Проверяем каждую минуту
 
+    def handler_stats_loop(self):
+        """
+        Запускает бесконечный цикл вывода статистики хэндлеров в лог (если включена в [HandlerStats]).
+        """
+        if self.handler_stats is None:
+            return
+        interval = self.MAIN_CFG["HandlerStats"].getint("logInterval", 60)
+        if interval <= 0:
+            return
+        while True:
+            time.sleep(interval * 60)
+            try:
+                rows = self.handler_stats.format_rows(self.handler_stats.snapshot("event")) + \
+                    self.handler_stats.format_rows(self.handler_stats.snapshot("handler"), limit=10)
+                rows += [f"{e.name}: " + ", ".join(f"{k}={v}" for k, v in e.stats().items())
+                         for e in (self.funpay_executor, self.telegram_executor, self.send_executor)]
+                rows.append("send_pipeline: " + ", ".join(f"{k}={v}" for k, v in self.send_pipeline.stats().items()))
+                rows.append("order_cache: " + ", ".join(f"{k}={v}" for k, v in self.order_cache.stats().items()))
+                rows += [f"scheduler.{lane}: " + ", ".join(f"{k}={v}" for k, v in stats.items())
+                         for lane, stats in self.account.scheduler.stats().items()]
+                if self.runner:
+                    rows += [f"runner.{name}: " + ", ".join(f"{k}={v}" for k, v in stats.items())
+                             for name, stats in self.runner.memory_stats().items()]
+                if rows:
+                    logger.info("Статистика хэндлеров:\n" + "\n".join(rows))  # locale
+            except:
+                logger.debug("TRACEBACK", exc_info=True)
+
     # Управление процессом
     def init(self):
         """
@@ -897,6 +1345,7 @@ class Cardinal(object):
         self.add_handlers_from_plugin(announcements)
         self.load_plugins()
         self.add_handlers()
+        logger.debug(f"Разобрано шаблонов сообщений: {cardinal_tools.precompile_templates(self)}.")  # locale
 
         if self.MAIN_CFG["Telegram"].getboolean("enabled"):
             self.__init_telegram()
@@ -931,6 +1380,7 @@ class Cardinal(object):
 
         self.__init_account()
         self.runner = FunPayAPI.Runner(self.account, self.old_mode_enabled)
+        self.load_runner_state()
         self.__update_profile()
         self.run_handlers(self.post_init_handlers, (self,))
         
@@ -986,12 +1436,16 @@ class Cardinal(object):
         Thread(target=self.update_session_loop, daemon=True).start()
         Thread(target=self.order_reminders_loop, daemon=True).start()
         Thread(target=self.check_updates_loop, daemon=True).start()
+        Thread(target=self.handler_stats_loop, daemon=True).start()
         self.process_events()
 
     def start(self):
         """
         Запускает кардинал после остановки. Не используется.
         """
+        # stop() останавливает пулы потоков и конвейер отправки без возможности перезапуска - создаем новые
+        if any(i.closed for i in (self.funpay_executor, self.telegram_executor, self.send_executor)):
+            self.create_executors()
         self.run_id += 1
         self.run_handlers(self.pre_start_handlers, (self,))
         self.run_handlers(self.post_start_handlers, (self,))
@@ -1003,6 +1457,17 @@ class Cardinal(object):
         """
         self.run_id += 1
         self.run_handlers(self.pre_stop_handlers, (self,))
+        # Фоновые обходы (графики, статистика и т.п.) прерываются, чтобы не задерживать остановку пулов
+        cancelled = sum(self.account.scheduler.cancel(p) for p in (RequestPriorities.BULK, RequestPriorities.INTERACTIVE))
+        if cancelled:
+            logger.info(f"Отменено групп запросов к FunPay: {cancelled}.")  # locale
+        if self.event_dispatcher is not None and not self.event_dispatcher.stop(timeout=30):
+            logger.warning("Не все события были обработаны до остановки.")  # locale
+        self.save_runner_state(force=True)
+        for executor in (self.funpay_executor, self.telegram_executor, self.send_executor):
+            if not executor.shutdown(timeout=30):
+                logger.warning(f"Не все задачи пула {executor.name} были выполнены до остановки.")  # locale
+        self.send_pipeline.stop()
         self.run_handlers(self.post_stop_handlers, (self,))
 
     def update_lots_and_categories(self):
@@ -1019,11 +1484,11 @@ class Cardinal(object):
         if not self.runner:
             return
         if not self.old_mode_enabled:
-            self.runner.last_messages_ids = {k: v[0] for k, v in self.runner.runner_last_messages.items()}
+            self.runner.last_messages_ids.replace_with({k: v[0] for k, v in self.runner.runner_last_messages.items()})
         self.runner.make_msg_requests = False if self.old_mode_enabled else True
         if self.old_mode_enabled:
-            self.runner.last_messages_ids = {}
-            self.runner.by_bot_ids = {}
+            self.runner.last_messages_ids.clear()
+            self.runner.by_bot_ids.clear()
 
     @staticmethod
     def save_config(config: configparser.ConfigParser, file_path: str) -> None:
@@ -1169,6 +1634,7 @@ class Cardinal(object):
                                      False if data["UUID"] in self.disabled_plugins else True)
 
             self.plugins[data["UUID"]] = plugin_data
+        self.rebuild_dispatch_tables()
 
     def add_handlers_from_plugin(self, plugin, uuid: str | None = None):
         """
@@ -1185,6 +1651,7 @@ class Cardinal(object):
             for func in functions:
                 func.plugin_uuid = uuid
             self.handler_bind_var_names[name].extend(functions)
+        self.rebuild_dispatch_tables()
         logger.debug(_("crd_handlers_registered", plugin.__name__))
 
     def add_handlers(self):
@@ -1195,6 +1662,32 @@ class Cardinal(object):
             plugin = self.plugins[i].plugin
             self.add_handlers_from_plugin(plugin, i)
 
+    def rebuild_dispatch_tables(self):
+        """
+        Сбрасывает скомпилированные списки активных хэндлеров. Вызывается при изменении списков хэндлеров или
+        включении / выключении / удалении плагина. Списки пересобираются при следующем обращении.
+        """
+        self.__dispatch_tables.clear()
+
+    def get_enabled_handlers(self, handlers_list: list[Callable]) -> list[Callable]:
+        """
+        Возвращает скомпилированный список хэндлеров, которые не принадлежат выключенным плагинам.
+
+        :param handlers_list: список хэндлеров (например, self.new_message_handlers).
+
+        :return: список активных хэндлеров.
+        """
+        # Плагин может изменить список хэндлеров напрямую, не вызывая rebuild_dispatch_tables: такие изменения
+        # видны по HandlerList.version. Прочие списки пересобираются только после rebuild_dispatch_tables.
+        version = getattr(handlers_list, "version", None)
+        table = self.__dispatch_tables.get(id(handlers_list))
+        if table is None or table[0] != version:
+            enabled = [func for func in handlers_list
+                       if (uuid := getattr(func, "plugin_uuid", None)) is None
+                       or (uuid in self.plugins and self.plugins[uuid].enabled)]
+            table = self.__dispatch_tables[id(handlers_list)] = (version, enabled)
+        return table[1]
+
     def run_handlers(self, handlers_list: list[Callable], args) -> None:
         """
         Выполняет функции из списка handlers.
@@ -1202,20 +1695,43 @@ class Cardinal(object):
         :param handlers_list: Список хэндлеров.
         :param args: аргументы для хэндлеров.
         """
-        for func in handlers_list:
+        for func in self.get_enabled_handlers(handlers_list):
+            self.__execute_handler(func, args)
+
+    def run_handler(self, func: Callable, args) -> None:
+        """
+        Выполняет хэндлер (если он не принадлежит выключенному плагину).
+
+        :param func: хэндлер.
+        :param args: аргументы для хэндлера.
+        """
+        plugin_uuid = getattr(func, "plugin_uuid", None)
+        if plugin_uuid is not None and (plugin_uuid not in self.plugins or not self.plugins[plugin_uuid].enabled):
+            return
+        self.__execute_handler(func, args)
+
+    def __execute_handler(self, func: Callable, args) -> None:
+        stats = self.handler_stats
+        start = time.perf_counter() if stats is not None else 0
+        error = False
+        try:
+            func(*args)
+        except Exception as ex:
+            error = True
+            text = _("crd_handler_err")
             try:
-                plugin_uuid = getattr(func, "plugin_uuid", None)
-                if plugin_uuid is None or (plugin_uuid in self.plugins and self.plugins[plugin_uuid].enabled):
-                    func(*args)
-            except Exception as ex:
-                text = _("crd_handler_err")
-                try:
-                    text += f" {ex.short_str()}"
-                except:
-                    pass
-                logger.error(text)
-                logger.debug("TRACEBACK", exc_info=True)
-                continue
+                text += f" {ex.short_str()}"
+            except:
+                pass
+            logger.error(text)
+            logger.debug("TRACEBACK", exc_info=True)
+        if stats is not None:
+            target = args[1] if len(args) > 1 else None
+            batch = isinstance(target, list) and bool(target)
+            event_type = getattr(target[0] if batch else target, "type", None)
+            event_name = (event_type.name + ("_BATCH" if batch else "")) if event_type is not None else "OTHER"
+            stats.record(f"{getattr(func, '__module__', '?')}.{getattr(func, '__qualname__', repr(func))}",
+                         getattr(func, "plugin_uuid", None), event_name, time.perf_counter() - start, error)
 
     def add_telegram_commands(self, uuid: str, commands: list[tuple[str, str, bool]]):
         """
@@ -1242,6 +1758,7 @@ class Cardinal(object):
         :param uuid: UUID плагина.
         """
         self.plugins[uuid].enabled = not self.plugins[uuid].enabled
+        self.rebuild_dispatch_tables()
         if self.plugins[uuid].enabled and uuid in self.disabled_plugins:
             self.disabled_plugins.remove(uuid)
         elif not self.plugins[uuid].enabled and uuid not in self.disabled_plugins:
@@ -8,6 +8,7 @@ import re
 from typing import TYPE_CHECKING
 
 from FunPayAPI import Account
+from FunPayAPI.common.enums import RequestPriorities
 from tg_bot.utils import NotificationTypes
 
 if TYPE_CHECKING:
@@ -88,6 +89,8 @@ class TGBot:
             "logs": "cmd_logs",
             "about": "cmd_about",
             "sys": "cmd_sys",
+            "handler_stats": "cmd_handler_stats",
+            "cancel_bulk": "cmd_cancel_bulk",
             "get_backup": "cmd_get_backup",
             "create_backup": "cmd_create_backup",
             "upload_backup": "cmd_upload_backup",
@@ -228,7 +231,8 @@ class TGBot:
         @bot_instance.message_handler(**kwargs)
         def run_handler(message: Message):
             try:
-                handler(message)
+                with self.cardinal.account.scheduler.lane(RequestPriorities.INTERACTIVE):
+                    handler(message)
             except:
                 logger.error(_("log_tg_handler_error"))
                 logger.debug("TRACEBACK", exc_info=True)
@@ -246,7 +250,8 @@ class TGBot:
         @bot_instance.callback_query_handler(func, **kwargs)
         def run_handler(call: CallbackQuery):
             try:
-                handler(call)
+                with self.cardinal.account.scheduler.lane(RequestPriorities.INTERACTIVE):
+                    handler(call)
             except:
                 logger.error(_("log_tg_handler_error"))
                 logger.debug("TRACEBACK", exc_info=True)
@@ -688,6 +693,35 @@ class TGBot:
                                            psutil.Process().memory_info().rss // 1048576,
                                            cardinal_tools.time_to_str(uptime), m.chat.id))
 
+    def send_handler_stats(self, m: Message):
+        """
+        Отправляет статистику времени выполнения хэндлеров.
+        """
+        lanes = "\n".join(f"    <code>{lane}: " + ", ".join(f"{k}={v}" for k, v in lane_stats.items()) + "</code>"
+                          for lane, lane_stats in self.cardinal.account.scheduler.stats().items())
+        scheduler_text = _("scheduler_stats", lanes)
+        stats = self.cardinal.handler_stats
+        if stats is None:
+            self.bot.send_message(m.chat.id, f"{_('handler_stats_disabled')}\n\n{scheduler_text}")
+            return
+        plugin_names = {uuid: plugin.name for uuid, plugin in self.cardinal.plugins.items()}
+
+        def rows(group: str, limit: int | None = None, names: dict | None = None) -> str:
+            lines = stats.format_rows(stats.snapshot(group), limit, names)
+            return "\n".join(f"    <code>{utils.escape(i)}</code>" for i in lines) or _("handler_stats_empty")
+
+        self.bot.send_message(m.chat.id, _("handler_stats", rows("event"), rows("plugin", 10, plugin_names),
+                                           rows("handler", 10)) + f"\n\n{scheduler_text}")
+
+    def cancel_bulk_requests(self, m: Message):
+        """
+        Отменяет фоновые обходы FunPay (графики, расширенная статистика и т.п.), выполняемые в очереди BULK.
+        """
+        cancelled = self.cardinal.account.scheduler.cancel(RequestPriorities.BULK)
+        logger.info(_("log_bulk_cancelled", hashlib.sha256(m.from_user.username.encode()).hexdigest()[:8], m.from_user.id,
+                      cancelled))
+        self.bot.send_message(m.chat.id, _("bulk_cancelled", cancelled))
+
     def restart_cardinal(self, m: Message):
         """
         Перезапускает кардинал.
@@ -1036,6 +1070,7 @@ class TGBot:
         while attempts:
             try:
                 self.cardinal.account.refund(order_id)
+                self.cardinal.order_cache.invalidate(order_id)
                 break
             except:
                 if not new_msg:
@@ -1298,6 +1333,8 @@ class TGBot:
         self.msg_handler(self.get_backup, commands=["get_backup"])
         self.msg_handler(self.create_backup, commands=["create_backup"])
         self.msg_handler(self.send_system_info, commands=["sys"])
+        self.msg_handler(self.send_handler_stats, commands=["handler_stats"])
+        self.msg_handler(self.cancel_bulk_requests, commands=["cancel_bulk"])
         self.msg_handler(self.restart_cardinal, commands=["restart"])
         self.msg_handler(self.ask_power_off, commands=["power_off"])
         self.msg_handler(self.send_announcements_kb, commands=["announcements"])
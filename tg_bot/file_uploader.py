@@ -277,7 +277,7 @@ def init_uploader(cardinal: Cardinal):
         try:
             file_info = tg.bot.get_file(photo.file_id)
             file = tg.bot.download_file(file_info.file_path)
-            image_id = cardinal.account.upload_image(file, type_="chat")
+            image_id = cardinal.send_pipeline.image_id(file)
             result = cardinal.send_message(chat_id, f"$photo={image_id}", username, watermark=False)
             if not result:
                 raise Exception("Нету сообщений")
@@ -164,6 +164,7 @@ def init_plugins_cp(cardinal: Cardinal, *args):
         os.remove(cardinal.plugins[uuid].path)
         logger.info(_("log_pl_deleted", c.from_user.username, c.from_user.id, cardinal.plugins[uuid].name))
         cardinal.plugins.pop(uuid)
+        cardinal.rebuild_dispatch_tables()
 
         c.data = f"{CBT.PLUGINS_LIST}:{offset}"
         open_plugins_list(c)